@@ -29,7 +29,7 @@ st.markdown("""
 @st.cache_resource(show_spinner="Booting Engine...")
 def get_engine():
     # This runs ONLY ONCE. Subsequent reloads are instant.
-    return engine.CricketAnalyzer('data/FINAL_ODI_MASTER.csv')
+    return engine.CricketAnalyzer('data/FINAL_ODI_MASTER.csv', disk_cache=True) # Reports survive app restarts
 
 try:
     bot = get_engine()
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from core.venue_registry import VENUE_REGISTRY
+
+class BallIndex:
+    """
+    🗂️ The Ledger (v1.0 - Match Slice Index).
+    Positional index over the globally sorted raw_df (start_date -> match_id).
+    - Every match occupies ONE contiguous block of rows, so a match is just (start, stop).
+    - (match_id, player) -> row positions of that player's deliveries (as striker or bowler).
+    - All lookups return zero-copy iloc slices. No full-table scans per match.
+    - Venue filters run on the categorical 'venue_id' codes (integer equality, no regex).
+    - Date windows use binary search on the sorted 'start_date' (no boolean masks, no copies).
+    """
+    def __init__(self, raw_df):
+        self.raw_df = raw_df
+        n = len(raw_df)
+
+        # 1. MATCH RANGES (Boundaries where match_id changes)
+        # Keys are normalized to str so int/str match_ids both resolve.
+        ids = raw_df['match_id'].astype(str).to_numpy()
+        if n:
+            change = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+            starts = np.concatenate(([0], change))
+            stops = np.concatenate((change, [n]))
+        else:
+            starts = stops = np.array([], dtype=np.int64)
+
+        match_keys = ids[starts]
+        if len(set(match_keys)) != len(match_keys):
+            raise ValueError("BallIndex requires raw_df sorted by ['start_date', 'match_id'] (matches must be contiguous).")
+
+        self.match_ranges = {m: (int(s), int(e)) for m, s, e in zip(match_keys, starts, stops)}
+
+        # 2. VENUE DIMENSION (Standardized ID per delivery, stored as categorical codes)
+        if 'venue_id' not in raw_df.columns:
+            # Standalone fallback: the Facade normally tags this from match_df
+            raw_df['venue_id'] = pd.Categorical(raw_df['venue'].map(VENUE_REGISTRY.alias_to_id).fillna(raw_df['venue']))
+        self.venue_categories = raw_df['venue_id'].cat.categories
+        self._venue_code = {v: i for i, v in enumerate(self.venue_categories)}
+
+        # 3. MATCH META (One row per match, in date order -> cheap 'last N matches' queries)
+        self.match_meta = pd.DataFrame({
+            'match_id': match_keys,
+            'start': starts,
+            'stop': stops,
+            'team_a': raw_df['batting_team'].to_numpy()[starts] if n else [],
+            'team_b': raw_df['bowling_team'].to_numpy()[starts] if n else [],
+        })
+
+        # 4. PER-MATCH PER-PLAYER POSITIONS
+        key_df = pd.DataFrame({'match_id': ids, 'striker': raw_df['striker'].to_numpy(), 'bowler': raw_df['bowler'].to_numpy()})
+        self._striker_pos = key_df.groupby(['match_id', 'striker'], sort=False).indices
+        self._bowler_pos = key_df.groupby(['match_id', 'bowler'], sort=False).indices
+
+        # 5. DATE AXIS (raw_df is globally sorted, NaT dates sink to the end)
+        self._dates = raw_df['start_date'].to_numpy()
+        self._n_dated = int(n - np.isnat(self._dates).sum()) if n else 0
+
+        # 6. PER-PLAYER POSITIONS (Ascending = date order, so windows are a binary search too)
+        self._player_pos = {
+            'striker': key_df.groupby('striker', sort=False).indices,
+            'bowler': key_df.groupby('bowler', sort=False).indices,
+        }
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def match_rows(self, match_id):
+        """All deliveries of one match (contiguous view)."""
+        rng = self.match_ranges.get(str(match_id))
+        if rng is None: return self.raw_df.iloc[0:0]
+        return self.raw_df.iloc[rng[0]:rng[1]]
+
+    def player_match_rows(self, match_id, player, role='striker'):
+        """Deliveries a player faced ('striker') or bowled ('bowler') in one match."""
+        lookup = self._striker_pos if role == 'striker' else self._bowler_pos
+        pos = lookup.get((str(match_id), player))
+        if pos is None: return self.raw_df.iloc[0:0]
+        return self.raw_df.iloc[pos]
+
+    def team_match_ids(self, team_name, limit=None):
+        """Match IDs a team played in, newest first."""
+        meta = self.match_meta
+        ids = meta.loc[(meta['team_a'] == team_name) | (meta['team_b'] == team_name), 'match_id'].to_numpy()[::-1]
+        return ids[:limit].tolist() if limit else ids.tolist()
+
+    # =================================================================================
+    # 📅 DATE WINDOWS
+    # =================================================================================
+
+    def window_start(self, cutoff_date):
+        """First row position with start_date >= cutoff_date."""
+        if cutoff_date is None: return 0
+        return int(np.searchsorted(self._dates[:self._n_dated], pd.Timestamp(cutoff_date).to_datetime64(), side='left'))
+
+    def window(self, cutoff_date=None):
+        """All deliveries on/after cutoff_date as a zero-copy iloc slice."""
+        return self.raw_df.iloc[self.window_start(cutoff_date):self._n_dated]
+
+    def player_positions(self, player, role='striker', cutoff_date=None):
+        """Row positions of a player's deliveries ('striker' faced / 'bowler' bowled) inside the window."""
+        pos = self._player_pos[role].get(player)
+        if pos is None: return np.array([], dtype=np.int64)
+        lo = self.window_start(cutoff_date)
+        hi = self._n_dated
+        return pos[np.searchsorted(pos, lo, side='left'):np.searchsorted(pos, hi, side='left')]
+
+    def player_rows(self, player, role='striker', cutoff_date=None):
+        """A player's deliveries inside the window (date order preserved)."""
+        return self.raw_df.iloc[self.player_positions(player, role, cutoff_date)]
+
+    def player_activity(self, player, cutoff_date=None):
+        """Deliveries where the player was striker OR bowler inside the window."""
+        pos = np.union1d(self.player_positions(player, 'striker', cutoff_date), self.player_positions(player, 'bowler', cutoff_date))
+        return self.raw_df.iloc[pos]
+
+    # =================================================================================
+    # 🏟️ VENUE FILTERS
+    # =================================================================================
+
+    def venue_codes_for(self, venue_identifier):
+        """
+        Resolves a Venue ID / raw alias / partial name to the categorical codes of 'venue_id'.
+        Order: Exact ID -> VENUE_MAP alias -> Substring of standardized IDs -> Substring of aliases (VenueRegistry).
+        """
+        if not venue_identifier: return np.array([], dtype=np.int64)
+        for cand in (venue_identifier, VENUE_REGISTRY.alias_to_id.get(venue_identifier)):
+            if cand in self._venue_code: return np.array([self._venue_code[cand]])
+
+        needle = str(venue_identifier).lower()
+        codes = [i for v, i in self._venue_code.items() if needle in str(v).lower()]
+        if not codes:
+            codes = [self._venue_code[m] for m in VENUE_REGISTRY.search(needle) if m in self._venue_code]
+        return np.array(sorted(codes), dtype=np.int64)
+
+    def at_venue(self, df, venue_codes):
+        """Rows of df played at any of the given venue codes."""
+        return df[np.isin(df['venue_id'].cat.codes.to_numpy(), venue_codes)]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+# Dismissals credited to the bowler (Run outs, retired etc. are NOT bowler wickets)
+BOWLER_WICKET_TYPES = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+# Innings phases by over (0-based): Powerplay 0-9 | Middle 10-39 | Death 40+
+PHASES = ['pp', 'mid', 'dth']
+PHASE_BOUNDS = [10, 40]
+
+def add_delivery_columns(raw_df):
+    """
+    🧱 Derived Delivery Columns (Computed ONCE at load, shared by every engine).
+    - is_legal_ball    : 1 unless the ball is a wide or a no-ball
+    - is_bowler_wicket : 1 if the dismissal is credited to the bowler (BOWLER_WICKET_TYPES)
+    - bowler_runs      : runs conceded by the bowler (bat + wides + no-balls)
+    - over             : 0-based over number (from 'ball', e.g. 12.3 -> 12)
+    - phase_code       : index into PHASES (0 = pp, 1 = mid, 2 = dth)
+    """
+    n = len(raw_df)
+    w_col = 'wides' if 'wides' in raw_df.columns else 'wide'
+    n_col = 'noballs' if 'noballs' in raw_df.columns else 'no_ball'
+    wides = raw_df[w_col].fillna(0).to_numpy() if w_col in raw_df.columns else np.zeros(n)
+    noballs = raw_df[n_col].fillna(0).to_numpy() if n_col in raw_df.columns else np.zeros(n)
+
+    # 1. LEGAL BALL & BOWLER WICKET FLAGS
+    raw_df['is_legal_ball'] = ((wides == 0) & (noballs == 0)).astype(int)
+    raw_df['is_bowler_wicket'] = raw_df['wicket_type'].isin(BOWLER_WICKET_TYPES).to_numpy().astype(np.int8)
+
+    # 2. RUNS CONCEDED BY THE BOWLER (Byes / Leg-byes are not on the bowler)
+    raw_df['bowler_runs'] = raw_df['runs_off_bat'].to_numpy() + wides + noballs
+
+    # 3. OVER NUMBER & PHASE
+    ball = pd.to_numeric(raw_df['ball'], errors='coerce').to_numpy()
+    over = np.floor(np.nan_to_num(ball, nan=0.0)).astype(np.int16)
+    raw_df['over'] = over
+    # Unparseable 'ball' -> Middle overs (same fallback as the phase refinery)
+    raw_df['phase_code'] = np.where(np.isnan(ball), 1, np.searchsorted(PHASE_BOUNDS, over, side='right')).astype(np.int8)
+    return raw_df
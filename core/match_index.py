@@ -0,0 +1,156 @@
+import bisect
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+VIEW = 'view'    # Team-view rows (one per match x team, see core/team_view.py)
+MATCH = 'match'  # match_df rows
+
+@dataclass(frozen=True, slots=True)
+class MatchFilter:
+    """
+    Declarative match query. Every field is optional; set fields are ANDed.
+    venue / host_country / continent / season accept one value or a tuple (any of them).
+    - team       : team perspective (team-view rows of that team); opponent needs a team
+    - away_from  : host_country is NOT this country (away matches)
+    - venue_text : venue name contains the text (case-insensitive), e.g. a city
+    - since      : start_date >= since (matches without a date never pass); None = no date filter
+    """
+    team: str = None
+    opponent: str = None
+    venue: object = None
+    host_country: object = None
+    away_from: str = None
+    continent: object = None
+    venue_text: str = None
+    season: object = None
+    since: object = None
+
+def _many(value):
+    if value is None: return None
+    if isinstance(value, (list, tuple, set, frozenset, pd.Index, np.ndarray)): return tuple(value)
+    return (value,)
+
+class MatchIndex:
+    """
+    🧮 The Filter Index (v1.0 - Bitmap Indexes over match_df / Team View).
+    Built ONCE at load. Every team report query is bitmap intersections + ONE gather:
+    - Packed bitmaps (np.packbits) per team, opponent, venue, host country, continent and season
+    - Two universes: team-view rows (team perspective) and match_df rows (match level)
+    - Date windows: 'season >= year' bitmaps (precomputed suffix unions) + an exact date check
+      on the surviving rows only
+    - Positions come back in table order (= the order of the old boolean-mask filters)
+    """
+    VIEW_DIMS = {'team': None, 'opponent': 'opponent', 'venue': 'venue', 'host_country': 'host_country', 'continent': 'continent'}
+    MATCH_DIMS = {'venue': 'venue', 'host_country': 'host_country', 'continent': 'continent'}
+
+    def __init__(self, match_df, team_view):
+        self.match_df = match_df
+        self.team_view = team_view
+        self._rows = team_view['row'].to_numpy()
+        self._n = {VIEW: len(team_view), MATCH: len(match_df)}
+        self._dates = {VIEW: team_view['start_date'].to_numpy(), MATCH: match_df['start_date'].to_numpy()}
+        self._bits = {VIEW: {}, MATCH: {}}
+
+        # 1. VALUE BITMAPS (One per distinct value of every dimension)
+        for dim, col in self.VIEW_DIMS.items():
+            values = team_view.index if col is None else team_view[col]
+            self._bits[VIEW][dim] = self._value_bits(values, self._n[VIEW])
+        for dim, col in self.MATCH_DIMS.items():
+            self._bits[MATCH][dim] = self._value_bits(match_df[col], self._n[MATCH])
+
+        # 2. SEASONS (Calendar year of start_date) + 'from season Y onwards' unions
+        self._since = {}
+        for universe in (VIEW, MATCH):
+            years = pd.DatetimeIndex(self._dates[universe]).year
+            self._bits[universe]['season'] = self._value_bits(pd.Series(years), self._n[universe])
+            seasons = sorted(int(y) for y in self._bits[universe]['season'] if pd.notna(y))
+            acc = self._empty(universe)
+            suffix = {}
+            for y in reversed(seasons):
+                acc = acc | self._bits[universe]['season'][y]
+                suffix[y] = acc
+            self._since[universe] = (seasons, [suffix[y] for y in seasons])
+
+        self._all = {u: np.packbits(np.ones(self._n[u], dtype=bool)) for u in (VIEW, MATCH)}
+        self._text_bits = {}
+
+        # Venue names in first-appearance order (venue lookups by partial name)
+        self.venues = list(pd.unique(match_df['venue']))
+
+    @staticmethod
+    def _value_bits(values, n):
+        """{value: packed bitmap of the positions holding it} (NaN is a value of its own)."""
+        s = pd.Series(np.asarray(values))
+        out = {}
+        for value, pos in s.groupby(s, dropna=False, sort=False).indices.items():
+            mask = np.zeros(n, dtype=bool)
+            mask[pos] = True
+            out[value] = np.packbits(mask)
+        return out
+
+    def has_venue(self, venue):
+        return venue in self._bits[MATCH]['venue']
+
+    def _empty(self, universe):
+        return np.zeros((self._n[universe] + 7) // 8, dtype=np.uint8)
+
+    # =================================================================================
+    # 🔍 QUERIES
+    # =================================================================================
+
+    def _any_of(self, universe, dim, values):
+        """Union of the bitmaps of values (unknown values match nothing)."""
+        table = self._bits[universe][dim]
+        hits = [table[v] for v in values if v in table]
+        if not hits: return self._empty(universe)
+        out = hits[0]
+        for b in hits[1:]: out = out | b
+        return out
+
+    def _venue_text(self, universe, text):
+        """Venues whose name contains text (case-insensitive, as str.contains(case=False, regex=False))."""
+        key = (universe, str(text).upper())
+        if key not in self._text_bits:
+            names = [v for v in self._bits[universe]['venue'] if key[1] in str(v).upper()]
+            self._text_bits[key] = self._any_of(universe, 'venue', names)
+        return self._text_bits[key]
+
+    def select(self, spec):
+        """Positions matching spec: team-view rows if spec.team is set, else match_df rows (table order)."""
+        universe = VIEW if spec.team is not None else MATCH
+        if spec.opponent is not None and universe is MATCH: raise ValueError("MatchFilter: 'opponent' needs a 'team'.")
+
+        bits = self._all[universe]
+        if spec.team is not None: bits = bits & self._any_of(universe, 'team', (spec.team,))
+        if spec.opponent is not None: bits = bits & self._any_of(universe, 'opponent', (spec.opponent,))
+        for dim in ('venue', 'host_country', 'continent', 'season'):
+            values = _many(getattr(spec, dim))
+            if values is not None: bits = bits & self._any_of(universe, dim, values)
+        if spec.away_from is not None: bits = bits & ~self._any_of(universe, 'host_country', (spec.away_from,))
+        if spec.venue_text is not None: bits = bits & self._venue_text(universe, spec.venue_text)
+
+        if spec.since is not None:
+            cutoff = pd.Timestamp(spec.since)
+            seasons, suffix = self._since[universe]
+            i = bisect.bisect_left(seasons, cutoff.year)
+            bits = bits & (suffix[i] if i < len(seasons) else self._empty(universe))
+
+        pos = np.flatnonzero(np.unpackbits(bits, count=self._n[universe]))
+        if spec.since is not None:
+            pos = pos[self._dates[universe][pos] >= cutoff.to_datetime64()] # Exact day inside the first season (ns, as the column)
+        return pos
+
+    def match_positions(self, spec):
+        """match_df positions of the matches in spec (team queries: one per team-view row, same order)."""
+        pos = self.select(spec)
+        return self._rows[pos] if spec.team is not None else pos
+
+    def team_rows(self, spec):
+        """Team-view rows of spec (spec.team required)."""
+        if spec.team is None: raise ValueError("MatchFilter: team rows need a 'team'.")
+        return self.team_view.iloc[self.select(spec)]
+
+    def matches(self, spec):
+        """match_df records of spec (one gather)."""
+        return self.match_df.iloc[self.match_positions(spec)]
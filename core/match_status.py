@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# Match Status Codes (int8) -> Audit Labels
+STATUS_INCLUDED = 0
+STATUS_NO_RESULT = 1
+STATUS_SHORT_1ST = 2
+STATUS_SHORT_2ND = 3
+STATUS_BOTH_SHORT = 4
+STATUS_LABELS = {
+    STATUS_INCLUDED: '✅ Included',
+    STATUS_NO_RESULT: '☔ Excluded (No Result)',
+    STATUS_SHORT_1ST: '☔ Excluded (Short 1st)',
+    STATUS_SHORT_2ND: '☔ Excluded (Short 2nd)',
+    STATUS_BOTH_SHORT: '☔ Excluded',
+}
+# 1st Innings stats stay valid when only the chase was cut short
+VALID_1ST_STATUSES = [STATUS_INCLUDED, STATUS_SHORT_2ND]
+
+# Winner Codes: >= 0 is a team code (see team_codes), negatives are non-results
+WINNER_NO_RESULT = -1
+WINNER_TIE = -2
+WINNER_OTHER = -3
+NO_RESULT_TOKENS = ['no result', 'nan', 'none', '', '0'] # '0' = NaN winner after match_df.fillna(0)
+
+def _norm(s):
+    return s.astype(str).str.lower().str.strip()
+
+def add_match_status(match_df):
+    """
+    Smart Filter v3.0 🧠 (Precomputed, D/L Safe). Runs ONCE when match_df is built.
+    - bat1_code / bat2_code : int16 team codes (shared vocabulary over both batting columns)
+    - winner_code           : normalised winner (team code, WINNER_TIE, WINNER_NO_RESULT, WINNER_OTHER)
+    - status_code           : int8 (see STATUS_LABELS)
+        * 'No Result' unless overridden by a short-innings flag
+        * Short 1st: < 45 overs and not all out
+        * Short 2nd: < 45 overs, not all out and not a natural chase win
+        * Both short -> plain 'Excluded'
+    Returns the team vocabulary (pd.Index, position = team code).
+    """
+    teams = pd.Index(sorted(set(match_df['team_bat_1'].astype(str)) | set(match_df['team_bat_2'].astype(str))))
+    match_df['bat1_code'] = teams.get_indexer(match_df['team_bat_1'].astype(str)).astype(np.int16)
+    match_df['bat2_code'] = teams.get_indexer(match_df['team_bat_2'].astype(str)).astype(np.int16)
+
+    # 1. NORMALISED WINNER
+    lookup = {t.lower().strip(): i for i, t in enumerate(teams)}
+    w = _norm(match_df['winner'])
+    code = w.map(lookup)
+    code = code.where(code.notna(), np.where(w == 'tie', WINNER_TIE, np.where(w.isin(NO_RESULT_TOKENS), WINNER_NO_RESULT, WINNER_OTHER)))
+    match_df['winner_code'] = code.astype(np.int16)
+
+    # 2. STATUS (Same precedence as the original row-wise filter)
+    is_short_1 = (match_df['balls_inn1'] < 270) & (match_df['wickets_inn1'] < 10)
+    nat_win = (match_df['winner_code'] == match_df['bat2_code']) & (match_df['score_inn2'] > match_df['score_inn1'])
+    is_short_2 = (match_df['balls_inn2'] < 270) & (match_df['wickets_inn2'] < 10) & (~nat_win)
+
+    status = np.where(match_df['winner_code'] == WINNER_NO_RESULT, STATUS_NO_RESULT, STATUS_INCLUDED)
+    status = np.where(is_short_1, STATUS_SHORT_1ST, status)
+    status = np.where(is_short_2, STATUS_SHORT_2ND, status)
+    status = np.where(is_short_1 & is_short_2, STATUS_BOTH_SHORT, status)
+    match_df['status_code'] = status.astype(np.int8)
+    return teams
+
+def status_labels(df):
+    """Audit labels for a frame carrying 'status_code'."""
+    return df['status_code'].map(STATUS_LABELS)
@@ -0,0 +1,129 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from core.deliveries import PHASES
+from core.venue_registry import VENUE_REGISTRY
+
+PHASE_FILE = 'data/processed_phase_stats.csv'
+
+def normalize_match_ids(ids):
+    """'518.0' / ' 518' / 518 -> '518' (phase CSV and match_df disagree on the type)."""
+    return pd.Series(ids).astype(str).str.split('.').str[0].str.strip().to_numpy()
+
+class PhaseStore:
+    """
+    🕒 The Phase Store (v1.0 - processed_phase_stats.csv, in memory).
+    Read ONCE (re-read only if the file changes on disk) and indexed for the phase reports:
+    - match_ids normalised and dates attached once ('start_date' from match_df if the CSV has none)
+    - rows grouped by lower-cased raw venue name -> alias lookups are dict hits, not column scans
+    - 'venue_id' per row (VenueRegistry) + per-team slices for the Global Habits section
+    - Season cube: venue_id x innings x phase x season (runs / wkts sums, counts, means)
+    """
+    def __init__(self, match_df, path=PHASE_FILE):
+        self.match_df = match_df
+        self.path = path
+        self._mtime = None
+        self.df = None
+        self._match_keys = None
+
+    # =================================================================================
+    # 💾 LOAD
+    # =================================================================================
+
+    def available(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Phase table (None if the file is missing). Re-reads only when the file changed."""
+        if not self.available(): return None
+        mtime = os.path.getmtime(self.path)
+        if self.df is not None and mtime == self._mtime: return self.df
+
+        df = pd.read_csv(self.path)
+        if 'match_id' in df.columns: df['match_id'] = normalize_match_ids(df['match_id'])
+
+        # Dates: CSV column if present, else from match_df (same normalised ids)
+        if 'start_date' not in df.columns and 'match_id' in df.columns:
+            date_map = dict(zip(self.match_keys(), self.match_df['start_date']))
+            df['start_date'] = pd.to_datetime(df['match_id'].map(date_map))
+        elif 'start_date' in df.columns:
+            df['start_date'] = pd.to_datetime(df['start_date'])
+
+        if 'total_runs' not in df.columns:
+            df['total_runs'] = df['pp_runs'].fillna(0) + df['mid_runs'].fillna(0) + df['dth_runs'].fillna(0)
+
+        # Venue ID per row (raw names resolved once per unique name)
+        lower = df['venue'].str.lower()
+        alias_ids = {a.lower(): m for a, m in VENUE_REGISTRY.alias_to_id.items()}
+        df['venue_id'] = df['venue'].map({v: alias_ids.get(v.lower(), v) for v in df['venue'].dropna().unique()})
+
+        self.df = df
+        self._mtime = mtime
+        self._venue_rows = {v: np.asarray(rows) for v, rows in lower.groupby(lower, sort=False).indices.items()}
+        self._team_rows = {t: np.asarray(rows) for t, rows in df.groupby('team', sort=False).indices.items()}
+        self._team_means = {}
+        self._cube = None
+        return df
+
+    def match_keys(self):
+        """Normalised match_df match_ids (for audits / date maps)."""
+        if self._match_keys is None: self._match_keys = normalize_match_ids(self.match_df['match_id'])
+        return self._match_keys
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def venue_rows(self, stadium_id):
+        """
+        Phase rows of a venue: any alias of stadium_id (or the ID itself), case-insensitive.
+        Fallback: raw names containing the city part of the ID (e.g. 'kolkata').
+        """
+        if self.load() is None: return None
+        terms = dict.fromkeys(x.lower() for x in VENUE_REGISTRY.aliases_of.get(stadium_id, []) + [stadium_id])
+        hits = [self._venue_rows[t] for t in terms if t in self._venue_rows]
+        if not hits:
+            location_part = stadium_id.split('_')[-1].lower()
+            if len(location_part) > 3:
+                hits = [rows for v, rows in self._venue_rows.items() if re.search(location_part, v)] # regex, as str.contains
+        pos = np.sort(np.concatenate(hits)) if hits else np.array([], dtype=np.int64)
+        return self.df.iloc[pos]
+
+    def team_rows(self, team):
+        if self.load() is None: return None
+        return self.df.iloc[self._team_rows.get(team, np.array([], dtype=np.int64))]
+
+    def team_innings_means(self, team, innings):
+        """Column means of a team's phase rows for one innings (all venues, all dates). Memoised."""
+        key = (team, innings)
+        if key not in self._team_means:
+            rows = self.team_rows(team)
+            self._team_means[key] = rows[rows['innings'] == innings].mean(numeric_only=True)
+        return self._team_means[key]
+
+    def season_cube(self, venue_id=None):
+        """
+        Venue x Innings x Phase x Season aggregate (long format):
+        venue_id, innings, phase, season, runs_sum, runs_n, runs_avg, wkts_sum, wkts_n, wkts_avg.
+        """
+        if self.load() is None: return None
+        if self._cube is None:
+            df = self.df
+            season = df['start_date'].dt.year if 'start_date' in df.columns else pd.Series(np.nan, index=df.index)
+            parts = []
+            for p in PHASES:
+                part = pd.DataFrame({
+                    'venue_id': df['venue_id'], 'innings': df['innings'], 'phase': p, 'season': season,
+                    'runs': df[f'{p}_runs'], 'wkts': df[f'{p}_wkts'],
+                })
+                parts.append(part)
+            long = pd.concat(parts, ignore_index=True)
+            cube = long.groupby(['venue_id', 'innings', 'phase', 'season']).agg(
+                runs_sum=('runs', 'sum'), runs_n=('runs', 'count'), wkts_sum=('wkts', 'sum'), wkts_n=('wkts', 'count')
+            ).reset_index()
+            cube['runs_avg'] = (cube['runs_sum'] / cube['runs_n'].replace(0, np.nan)).round(1)
+            cube['wkts_avg'] = (cube['wkts_sum'] / cube['wkts_n'].replace(0, np.nan)).round(1)
+            self._cube = cube
+        if venue_id is None: return self._cube
+        return self._cube[self._cube['venue_id'] == venue_id]
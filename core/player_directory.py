@@ -0,0 +1,121 @@
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+import pandas as pd
+
+def normalize_name(name):
+    """'  Virat  Kohli ' / 'Virát Kohli' -> 'virat kohli' (accents, punctuation and extra spaces dropped)."""
+    s = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^\w\s]', ' ', s.lower()).split())
+
+class PlayerDirectory:
+    """
+    📇 The Player Directory (v1.0 - Built ONCE at load).
+    - all_players   : sorted names (player stats CSV, else everyone in the Scorecard)
+    - find()        : exact name, else first name containing the text (trigram-filtered, LRU-memoised)
+    - suggest()     : type-ahead on normalised full-name / word prefixes, most recently active first
+    - team_players(): per-team active list (Scorecard appearances), most recent first
+    - squad()       : player_metadata team list (same as the old get_active_squad)
+    """
+    FIND_CACHE = 1024
+
+    def __init__(self, player_df, meta_df=None, scorecard=None):
+        # 1. NAMES (player_df order is kept for find(): first containing match wins, as before)
+        if player_df is not None and not player_df.empty:
+            ordered = list(dict.fromkeys(player_df['player'].tolist()))
+        elif scorecard is not None:
+            ordered = list(dict.fromkeys(scorecard.batting['player'].tolist() + scorecard.bowling['player'].tolist()))
+        else:
+            ordered = []
+        self._ordered = ordered
+        self._known = set(ordered)
+        self.all_players = sorted(p for p in ordered if isinstance(p, str))
+        self._lower = [str(p).lower() for p in ordered]
+
+        # 2. TRIGRAM INDEX (Lower-cased raw names -> positions in player_df order)
+        self._grams = defaultdict(list)
+        for i, name in enumerate(self._lower):
+            for g in {name[j:j + 3] for j in range(len(name) - 2)}: self._grams[g].append(i)
+        self._found = lru_cache(maxsize=self.FIND_CACHE)(self._find) # Bounded: every typed string is a key
+
+        # 3. RECENT ACTIVITY (Last appearance + matches, batting or bowling)
+        self.last_seen, self.matches, self._team_rank = {}, {}, {}
+        if scorecard is not None:
+            apps = pd.concat([
+                scorecard.batting[['player', 'match_id', 'start_date', 'batting_team']].rename(columns={'batting_team': 'team'}),
+                scorecard.bowling[['player', 'match_id', 'start_date', 'bowling_team']].rename(columns={'bowling_team': 'team'}),
+            ], ignore_index=True).drop_duplicates(['player', 'match_id'])
+            per_player = apps.groupby('player').agg(last=('start_date', 'max'), matches=('match_id', 'size'))
+            self.last_seen = per_player['last'].to_dict()
+            self.matches = per_player['matches'].to_dict()
+            per_team = apps.groupby(['team', 'player'])['start_date'].max().reset_index()
+            per_team = per_team.sort_values(['team', 'start_date', 'player'], ascending=[True, False, True], kind='mergesort')
+            self._team_rank = {t: g['player'].tolist() for t, g in per_team.groupby('team', sort=False)}
+
+        # Activity rank: most recent appearance first, never-seen players last (then by name)
+        seen = sorted((p for p in self.all_players if pd.notna(self.last_seen.get(p, pd.NaT))), key=lambda p: (-self.last_seen[p].value, p))
+        self._recent = seen
+        seen_set = set(seen)
+        self._rank = {p: i for i, p in enumerate(seen + [p for p in self.all_players if p not in seen_set])}
+
+        # 4. PREFIX INDEX (Sorted (key, name) pairs: full normalised name + every word)
+        keys = set()
+        for name in self.all_players:
+            norm = normalize_name(name)
+            keys.add((norm, name))
+            for word in norm.split(): keys.add((word, name))
+        self._prefix = sorted(keys)
+        self._prefix_keys = [k for k, _ in self._prefix]
+
+        # 5. SQUAD LISTS (player_metadata, case-insensitive team)
+        self._squads = {}
+        if meta_df is not None and not meta_df.empty:
+            for team, g in meta_df.groupby(meta_df['team'].str.lower()):
+                self._squads[team] = sorted(g['player'].unique().tolist())
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def find(self, text):
+        """Exact name, else the first player (stats order) whose name contains text (case-insensitive). None if no match."""
+        if text in self._known: return text
+        return self._found(text)
+
+    def _find(self, text):
+        q = str(text).lower()
+        if len(q) >= 3:
+            postings = [self._grams.get(q[j:j + 3], []) for j in range(len(q) - 2)]
+            cand = set(min(postings, key=len)) if all(postings) else set()
+            for p in postings:
+                if len(cand) <= 1: break
+                cand &= set(p)
+            pool = sorted(cand)
+        else:
+            pool = range(len(self._lower))
+        return next((self._ordered[i] for i in pool if q in self._lower[i]), None)
+
+    def suggest(self, text, limit=20):
+        """Type-ahead: names whose normalised full name or any word starts with text, most recently active first."""
+        q = normalize_name(text)
+        if not q: return self.recent(limit)
+        lo = bisect.bisect_left(self._prefix_keys, q)
+        hi = bisect.bisect_left(self._prefix_keys, q + '\uffff')
+        names = {name for _, name in self._prefix[lo:hi]}
+        return heapq.nsmallest(limit, names, key=self._rank.__getitem__)
+
+    def recent(self, limit=20):
+        """Most recently active players overall."""
+        return self._recent[:limit]
+
+    def team_players(self, team, limit=None):
+        """Players who appeared for team (bat or ball), most recent appearance first."""
+        players = self._team_rank.get(team, [])
+        return players[:limit] if limit else list(players)
+
+    def squad(self, team):
+        """player_metadata squad for team (alphabetical)."""
+        return list(self._squads.get(str(team).lower(), []))
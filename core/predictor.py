@@ -1,13 +1,15 @@
 import pandas as pd
 import numpy as np
-import re
-from IPython.display import display, HTML
-from venues import get_venue_aliases
 from config.settings import (
     VENUE_BASELINE_DEFAULT, STANDARD_BATTING_POTENTIAL, 
     PREDICTION_MARGIN, MIN_BAT_AVG_CAP, MAX_BAT_AVG_CAP, MIN_BOWLS_FILTER
 )
-from config.teams import TEAM_COLORS
+from venues import get_venue_aliases
+from core.ball_index import BallIndex
+from core.window_cache import WindowCache
+from core.scorecard import Scorecard
+from core.results import ScorePrediction
+from core.render import HtmlRenderer
 
 # 🔧 INTERNAL CALIBRATION (Modern ODI Standards)
 MODERN_BOWLING_ECONOMY = 5.85
@@ -21,11 +23,42 @@ class PredictorEngine:
     - FIX: '1.00x' is now labeled 'AVERAGE ATTACK', not 'WEAK'.
     - LOGIC: Calculates player form on-the-fly from the specific time window.
     """
-    def __init__(self, raw_df, player_df):
+    def __init__(self, raw_df, player_df, ball_index=None, window_cache=None, scorecard=None, renderer=None, memo=None):
         self.raw_df = raw_df
         self.player_df = player_df
+        self.ball_index = ball_index if ball_index is not None else BallIndex(raw_df)
+        self.window_cache = window_cache if window_cache is not None else WindowCache(self.ball_index)
+        self.scorecard = scorecard if scorecard is not None else Scorecard(raw_df)
+        self.renderer = renderer if renderer is not None else HtmlRenderer()
+        self.memo = memo # Result cache for ScorePrediction records (facade), None -> compute every time
+
+    @staticmethod
+    def _first_innings_totals(window_df):
+        """Window-level precomputation: 1st-innings total + raw venue name per match."""
+        inn1 = window_df[window_df['innings'] == 1]
+        sums = inn1.groupby('match_id')[['runs_off_bat', 'extras']].sum()
+        return pd.DataFrame({
+            'venue': inn1.groupby('match_id')['venue'].first(),
+            'total': sums['runs_off_bat'] + sums['extras'],
+        })
+
+    @staticmethod
+    def _venue_terms(venue_id):
+        """Raw names of the venue + its city token ('ENG_LONDON_LORDS' -> 'LONDON'): the venue par sample."""
+        terms = get_venue_aliases(venue_id)
+        if "_" in venue_id:
+            parts = venue_id.split("_")
+            if len(parts) > 1: terms.append(parts[1])
+        return [t.lower() for t in terms if t]
+
+    @classmethod
+    def _at_venue_names(cls, names, venue_id):
+        """Mask of raw venue names containing any venue term (case-insensitive). Checked once per distinct name."""
+        terms = cls._venue_terms(venue_id)
+        hits = {v: isinstance(v, str) and (not terms or any(t in v.lower() for t in terms)) for v in pd.unique(names)}
+        return names.map(hits).astype(bool)
 
-    def calculate_smart_projection(self, player, role, venue_pattern):
+    def calculate_smart_projection(self, player, role, venue_id):
         # (Helper for simple tables - keeps static context for speed)
         bat = self.player_df[(self.player_df['player'] == player) & (self.player_df['role'] == role)]
         if bat.empty: return 0, "-"
@@ -37,46 +70,42 @@ class PredictorEngine:
 
         ven_val = car_val
         try:
-            mask = (self.raw_df['venue'].str.contains(venue_pattern, case=False, na=False))
+            venue_codes = self.ball_index.venue_codes_for(venue_id)
             if role == 'batting':
-                raw_ven = self.raw_df[(self.raw_df['striker'] == player) & mask]
-                if not raw_ven.empty:
-                    ven_val = raw_ven['runs_off_bat'].sum() / max(1, raw_ven['wicket_type'].notna().sum())
+                ven_inns = self.scorecard.at_venue(self.scorecard.batting_innings(player), venue_codes)
+                if not ven_inns.empty:
+                    ven_val = ven_inns['runs'].sum() / max(1, ven_inns['outs'].sum())
             else:
-                raw_ven = self.raw_df[(self.raw_df['bowler'] == player) & mask]
-                if not raw_ven.empty:
-                    wkts = raw_ven['wicket_type'].isin(['bowled','caught','lbw','stumped','caught and bowled','hit wicket']).sum()
-                    ven_val = wkts / max(1, len(raw_ven['match_id'].unique()))
+                ven_inns = self.scorecard.at_venue(self.scorecard.bowling_innings(player), venue_codes)
+                if not ven_inns.empty:
+                    ven_val = ven_inns['wickets'].sum() / max(1, len(ven_inns))
         except: pass
 
         proj = (0.3 * ven_val) + (0.7 * car_val)
         return round(proj, 1), "OK"
 
     def predict_score(self, batting_team, batting_players, bowling_team, bowling_players, venue_id, years=5):
+        """Projected score card (compute + render)."""
+        self.renderer.score_prediction(self._compute(self.score_prediction, batting_team, batting_players, bowling_team, bowling_players, venue_id, years))
+
+    def _compute(self, fn, *args):
+        """Compute API call through the facade's result cache when one is attached (memo=...)."""
+        return self.memo(fn, *args) if self.memo is not None else fn(*args)
+
+    def score_prediction(self, batting_team, batting_players, bowling_team, bowling_players, venue_id, years=5):
+        """Projected 1st-innings range as a ScorePrediction record (nothing displayed)."""
         # 1. SETUP DYNAMIC WINDOW
-        # We slice the Raw DB once to improve performance
-        cutoff_date = pd.Timestamp.now() - pd.DateOffset(years=years)
-        window_df = self.raw_df[self.raw_df['start_date'] >= cutoff_date].copy()
+        # Shared window cache (keyed by cutoff day, reused across engines & clicks)
+        cutoff_date = self.window_cache.cutoff_for(years)
         
-        # 2. VENUE INTELLIGENCE (From Window)
-        target_venues = get_venue_aliases(venue_id)
-        if "_" in venue_id: 
-            parts = venue_id.split("_")
-            if len(parts) > 1: target_venues.append(parts[1]) 
-            
-        venue_pattern = '|'.join([re.escape(v) for v in target_venues if v])
-        
-        venue_matches = window_df[
-            (window_df['venue'].str.contains(venue_pattern, case=False, na=False)) & 
-            (window_df['innings'] == 1)
-        ]
+        # 2. VENUE INTELLIGENCE (From Window, raw venue names matching the aliases or the city token)
+        inn1_totals = self.window_cache.get(cutoff_date, 'first_innings_totals', self._first_innings_totals)
+        match_totals = inn1_totals.loc[self._at_venue_names(inn1_totals['venue'], venue_id), 'total']
         
         venue_avg = VENUE_BASELINE_DEFAULT
         venue_msg = "Global Avg (Data Missing)"
         
-        if not venue_matches.empty:
-            match_sums = venue_matches.groupby('match_id')[['runs_off_bat', 'extras']].sum()
-            match_totals = match_sums['runs_off_bat'] + match_sums['extras']
+        if not match_totals.empty:
             clean_totals = match_totals[match_totals > 180] 
             
             if not clean_totals.empty:
@@ -92,11 +121,11 @@ class PredictorEngine:
         
         for p in batting_players:
             # Filter specifically for this player in the time window
-            p_data = window_df[window_df['striker'] == p]
+            p_data = self.scorecard.batting_innings(p, cutoff_date)
             
             if not p_data.empty:
-                runs = p_data['runs_off_bat'].sum()
-                outs = p_data['wicket_type'].isin(['bowled','caught','lbw','stumped','caught and bowled','hit wicket']).sum()
+                runs = p_data['runs'].sum()
+                outs = p_data['bowler_outs'].sum()
                 avg = (runs / outs) if outs > 0 else runs
                 
                 # Apply Caps (Standardizing form)
@@ -114,11 +143,11 @@ class PredictorEngine:
         active_bowlers = 0
         
         for p in bowling_players:
-            p_data = window_df[window_df['bowler'] == p]
+            p_data = self.scorecard.bowling_innings(p, cutoff_date)
             
             if not p_data.empty:
                 runs = p_data['runs_off_bat'].sum() + p_data['extras'].sum()
-                balls = len(p_data)
+                balls = p_data['balls'].sum()
                 
                 if balls > 60: # Minimum 10 overs in timeframe to count
                     econ = (runs / balls) * 6
@@ -149,50 +178,14 @@ class PredictorEngine:
             final_prediction -= base_penalty
 
         # B. Smart Labels
-        if bowl_factor < 0.95:
-            bf_color = 'green'; bf_text = "STRONG ATTACK"
-        elif bowl_factor > 1.05:
-            bf_color = 'red'; bf_text = "WEAK ATTACK"
-        else:
-            bf_color = '#d35400'; bf_text = "AVERAGE ATTACK"
+        if bowl_factor < 0.95: bf_text = "STRONG ATTACK"
+        elif bowl_factor > 1.05: bf_text = "WEAK ATTACK"
+        else: bf_text = "AVERAGE ATTACK"
 
-        # 7. RENDER
-        lower = int(final_prediction - PREDICTION_MARGIN)
-        upper = int(final_prediction + PREDICTION_MARGIN)
-        c1 = TEAM_COLORS.get(batting_team, "#333")
-        
-        display(HTML(f"""
-        <div style="background:#fff; border:1px solid #ddd; border-top: 4px solid {c1}; border-radius:6px; margin-bottom:20px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-            <div style="padding:10px; background:#f8f9fa; border-bottom:1px solid #eee; display:flex; justify-content:space-between; align-items:center;">
-                <div style="font-weight:bold; color:#333;">🔮 PROJECTED SCORE: {batting_team.upper()}</div>
-                <div style="font-size:11px; color:#777;">{venue_msg}</div>
-            </div>
-            
-            <div style="padding:15px; display:flex; justify-content:space-between; align-items:center;">
-                <div style="text-align:center;">
-                    <div style="font-size:12px; color:#555;">VENUE PAR</div>
-                    <div style="font-size:20px; font-weight:bold; color:#333;">{venue_avg}</div>
-                </div>
-                <div style="text-align:center; color:#ccc;">✖️</div>
-                <div style="text-align:center;">
-                    <div style="font-size:12px; color:#555;">BAT STRENGTH</div>
-                    <div style="font-size:18px; font-weight:bold; color:{'green' if bat_factor>=1 else 'red'}">{bat_factor:.2f}x</div>
-                </div>
-                <div style="text-align:center; color:#ccc;">✖️</div>
-                <div style="text-align:center;">
-                    <div style="font-size:12px; color:#555;">BOWL IMPACT</div>
-                    <div style="font-size:18px; font-weight:bold; color:{bf_color}">{bowl_factor:.2f}x</div>
-                    <div style="font-size:9px; color:{bf_color}">{bf_text}</div>
-                </div>
-                <div style="text-align:center; color:#ccc;">=</div>
-                <div style="text-align:center; background:{c1}; color:white; padding:10px 20px; border-radius:6px;">
-                    <div style="font-size:12px; opacity:0.9;">PREDICTED RANGE</div>
-                    <div style="font-size:24px; font-weight:bold;">{lower} - {upper}</div>
-                </div>
-            </div>
-            
-            <div style="padding:10px; background:#fffbe6; font-size:11px; color:#856404; border-top:1px solid #ffeeba;">
-                <b>🤖 Model Notes:</b> {', '.join(adjustment_msg) if adjustment_msg else 'Standard conditions detected.'}
-            </div>
-        </div>
-        """))
\ No newline at end of file
+        return ScorePrediction(
+            batting_team=batting_team, bowling_team=bowling_team, venue_id=venue_id, years=years,
+            venue_par=venue_avg, venue_note=venue_msg, bat_factor=bat_factor, bowl_factor=bowl_factor, attack=bf_text,
+            capable_batters=capable_batters, active_bowlers=active_bowlers, prediction=final_prediction,
+            lower=int(final_prediction - PREDICTION_MARGIN), upper=int(final_prediction + PREDICTION_MARGIN),
+            notes=adjustment_msg,
+        )
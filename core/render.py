@@ -0,0 +1,589 @@
+import pandas as pd
+try:
+    from IPython.display import display, HTML
+except ImportError:
+    # 🛡️ NO IPYTHON (Backend without Jupyter): output is dropped
+    def display(*args, **kwargs): pass
+    def HTML(*args, **kwargs): return ""
+try:
+    import ipywidgets as widgets
+    HAS_WIDGETS = True
+except ImportError:
+    # 🛡️ HEADLESS MODE FALLBACK (For Testing/Backend)
+    # Only the widgets are mocked: what is shown "inside" an Output is displayed in place
+    class MockWidget:
+        def __init__(self, *args, **kwargs): pass
+        def __enter__(self): return self
+        def __exit__(self, *args): pass
+        
+    class MockModule:
+        Output = MockWidget
+        HBox = MockWidget
+        Layout = MockWidget
+        
+    widgets = MockModule()
+    HAS_WIDGETS = False
+from config.teams import TEAM_COLORS
+
+class NullRenderer:
+    """
+    🔇 The Null Renderer (v1.0 - Compute Only).
+    Same interface as HtmlRenderer, draws nothing. For batch callers, caches and
+    regression runners that only want the result records (core/results.py).
+    Covers every analyze_* report: record-based ones render through the record hooks,
+    the inline ones (matrix, bias, form, phases) through text / table / html.
+    Facade loading messages and warnings are not report output and still print.
+    """
+    def team_report(self, report): pass
+    def audit(self, frame): pass
+    def score_prediction(self, prediction): pass
+    def squad_comparison(self, comparison): pass
+    def threat_matrix(self, threat): pass
+    def batter_matchup(self, batter, team, matchup): pass
+    def player_profile(self, profile): pass
+    # Inline reports (no result record): console lines, styled tables, HTML blocks
+    def text(self, line): pass
+    def table(self, styler): pass
+    def html(self, markup): pass
+
+class HtmlRenderer(NullRenderer):
+    """
+    🎨 The HTML Renderer (v1.0 - Notebook / Dashboard Output).
+    Turns the result records into the HTML cards, tables and widgets the engines used to
+    display inline. Swap it per engine (renderer=...) or on the facade (set_renderer).
+    """
+
+    # =================================================================================
+    # 🏰 TEAM REPORTS
+    # =================================================================================
+
+    def team_report(self, report):
+        """Grid card (Win %, Win Breakdown, Batting 1st / Chasing per team, Venue Averages) + audit."""
+        # Parse Data into a List of Values for direct indexing
+        d = [x['Value'] for x in report.rows()]
+        t1, t2, title = report.home_team, report.visitor, report.title
+
+        # Get Colors
+        c1 = TEAM_COLORS.get(t1, "#333")
+        c2 = TEAM_COLORS.get(t2, "#333")
+
+        html_fixed = f"""
+        <style>
+            .dashboard-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 15px; font-family: sans-serif; margin-bottom: 20px; }}
+            .card {{ background: #f8f9fa; border: 1px solid #ddd; border-radius: 8px; padding: 12px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }}
+            .stat-row {{ display: flex; justify-content: space-between; font-size: 13px; margin-bottom: 5px; border-bottom: 1px dashed #eee; }}
+            .stat-val {{ font-weight: bold; color: #333; }}
+            .section-title {{ font-size: 11px; font-weight: bold; color: #666; margin-top: 10px; margin-bottom: 5px; text-transform: uppercase; border-bottom: 1px solid #ccc; }}
+            .win-stats {{ display: flex; justify-content: space-between; background: #e9ecef; padding: 5px; border-radius: 4px; font-size: 12px; margin-bottom: 10px; }}
+        </style>
+
+        <h3 style="margin:0 0 10px 0;">📊 {title}</h3>
+
+        <div class="dashboard-grid">
+            <div class="card" style="grid-column: span 2; display:flex; justify-content:space-around; text-align:center;">
+                <div><div style="font-size:20px; font-weight:bold;">{d[0]}</div><div style="font-size:10px; color:#666;">MATCHES</div></div>
+                <div><div style="font-size:20px; font-weight:bold; color:{c1}">{d[2]}</div><div style="font-size:10px; color:#666;">{t1} WIN %</div></div>
+                <div><div style="font-size:20px; font-weight:bold;">{d[1]}</div><div style="font-size:10px; color:#666;">TIE/NR</div></div>
+            </div>
+
+            <div class="card" style="border-top: 3px solid {c1}">
+                <div style="font-weight:bold; color:{c1}; font-size:16px; margin-bottom:5px;">{t1.upper()}</div>
+                
+                <div class="win-stats">
+                    <span>🏆 <b>{d[4]}</b> Wins</span>
+                    <span>🛡️ <b>{d[5]}</b> Def</span>
+                    <span>🎯 <b>{d[6]}</b> Chs</span>
+                </div>
+
+                <div class="section-title">Batting 1st</div>
+                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[16]}</span></div>
+                <div class="stat-row"><span>High / Low:</span> <span class="stat-val">{d[17]} / {d[18]}</span></div>
+                <div class="stat-row"><span>Avg Win Score:</span> <span class="stat-val">{d[19]}</span></div>
+                <div class="stat-row"><span>Lowest Defended:</span> <span class="stat-val">{d[20]}</span></div>
+
+                <div class="section-title">Chasing</div>
+                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[28]}</span></div>
+                <div class="stat-row"><span>Highest Chased:</span> <span class="stat-val">{d[29]}</span></div>
+                <div class="stat-row"><span>Avg Succ. Chase:</span> <span class="stat-val">{d[30]}</span></div>
+                <div class="stat-row"><span>Avg Fail Chase:</span> <span class="stat-val">{d[31]}</span></div>
+            </div>
+
+            <div class="card" style="border-top: 3px solid {c2}">
+                <div style="font-weight:bold; color:{c2}; font-size:16px; margin-bottom:5px;">{t2.upper()}</div>
+                
+                <div class="win-stats">
+                    <span>🏆 <b>{d[8]}</b> Wins</span>
+                    <span>🛡️ <b>{d[9]}</b> Def</span>
+                    <span>🎯 <b>{d[10]}</b> Chs</span>
+                </div>
+
+                <div class="section-title">Batting 1st</div>
+                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[22]}</span></div>
+                <div class="stat-row"><span>High / Low:</span> <span class="stat-val">{d[23]} / {d[24]}</span></div>
+                <div class="stat-row"><span>Avg Win Score:</span> <span class="stat-val">{d[25]}</span></div>
+                <div class="stat-row"><span>Lowest Defended:</span> <span class="stat-val">{d[26]}</span></div>
+
+                <div class="section-title">Chasing</div>
+                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[33]}</span></div>
+                <div class="stat-row"><span>Highest Chased:</span> <span class="stat-val">{d[34]}</span></div>
+                <div class="stat-row"><span>Avg Succ. Chase:</span> <span class="stat-val">{d[35]}</span></div>
+                <div class="stat-row"><span>Avg Fail Chase:</span> <span class="stat-val">{d[36]}</span></div>
+            </div>
+            
+            <div class="card" style="grid-column: span 2; background:#eef2f5;">
+                <div style="font-weight:bold; color:#444; margin-bottom:8px; text-align:center;">🏟️ VENUE AVERAGES</div>
+                <div style="display:flex; justify-content:space-around;">
+                     <div><span>1st Inn Avg:</span> <b>{d[12]}</b></div>
+                     <div><span>2nd Inn Avg:</span> <b>{d[13]}</b></div>
+                     <div><span>Avg Winning Score:</span> <b>{d[14]}</b></div>
+                </div>
+            </div>
+        </div>
+        """
+        display(HTML(html_fixed))
+        self.audit(report.audit)
+
+    def audit(self, frame):
+        """Match audit table (already filtered, labelled and sorted by the engine)."""
+        if frame is None: return
+        print("\n🕵️‍♂️ MATCH AUDIT (Recent First)")
+        with pd.option_context('display.max_rows', None):
+            display(frame)
+
+    # =================================================================================
+    # 🧾 INLINE REPORTS (Matrix / Bias / Form / Phases build their own pieces)
+    # =================================================================================
+
+    def text(self, line):
+        print(line)
+
+    def table(self, styler):
+        display(styler)
+
+    def html(self, markup):
+        display(HTML(markup))
+
+    # =================================================================================
+    # 🔮 SCORE PREDICTION
+    # =================================================================================
+
+    ATTACK_COLORS = {"STRONG ATTACK": 'green', "WEAK ATTACK": 'red', "AVERAGE ATTACK": '#d35400'}
+
+    def score_prediction(self, p):
+        c1 = TEAM_COLORS.get(p.batting_team, "#333")
+        bf_color = self.ATTACK_COLORS.get(p.attack, '#d35400')
+        display(HTML(f"""
+        <div style="background:#fff; border:1px solid #ddd; border-top: 4px solid {c1}; border-radius:6px; margin-bottom:20px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
+            <div style="padding:10px; background:#f8f9fa; border-bottom:1px solid #eee; display:flex; justify-content:space-between; align-items:center;">
+                <div style="font-weight:bold; color:#333;">🔮 PROJECTED SCORE: {p.batting_team.upper()}</div>
+                <div style="font-size:11px; color:#777;">{p.venue_note}</div>
+            </div>
+            
+            <div style="padding:15px; display:flex; justify-content:space-between; align-items:center;">
+                <div style="text-align:center;">
+                    <div style="font-size:12px; color:#555;">VENUE PAR</div>
+                    <div style="font-size:20px; font-weight:bold; color:#333;">{p.venue_par}</div>
+                </div>
+                <div style="text-align:center; color:#ccc;">✖️</div>
+                <div style="text-align:center;">
+                    <div style="font-size:12px; color:#555;">BAT STRENGTH</div>
+                    <div style="font-size:18px; font-weight:bold; color:{'green' if p.bat_factor>=1 else 'red'}">{p.bat_factor:.2f}x</div>
+                </div>
+                <div style="text-align:center; color:#ccc;">✖️</div>
+                <div style="text-align:center;">
+                    <div style="font-size:12px; color:#555;">BOWL IMPACT</div>
+                    <div style="font-size:18px; font-weight:bold; color:{bf_color}">{p.bowl_factor:.2f}x</div>
+                    <div style="font-size:9px; color:{bf_color}">{p.attack}</div>
+                </div>
+                <div style="text-align:center; color:#ccc;">=</div>
+                <div style="text-align:center; background:{c1}; color:white; padding:10px 20px; border-radius:6px;">
+                    <div style="font-size:12px; opacity:0.9;">PREDICTED RANGE</div>
+                    <div style="font-size:24px; font-weight:bold;">{p.lower} - {p.upper}</div>
+                </div>
+            </div>
+            
+            <div style="padding:10px; background:#fffbe6; font-size:11px; color:#856404; border-top:1px solid #ffeeba;">
+                <b>🤖 Model Notes:</b> {', '.join(p.notes) if p.notes else 'Standard conditions detected.'}
+            </div>
+        </div>
+        """))
+
+    # =================================================================================
+    # ⚔️ SQUAD COMPARISON
+    # =================================================================================
+
+    @staticmethod
+    def _badge(text, tier):
+        if tier == 'GE': return f"<span style='color:#155724; background:#d4edda; border:1px solid #c3e6cb; font-weight:bold; font-size:9px; padding:1px 3px; border-radius:3px; margin-right:2px;'>{text}</span>"
+        if tier == 'GD': return f"<span style='color:#0f5132; background:#e2e3e5; border:1px solid #d6d8db; font-weight:bold; font-size:9px; padding:1px 3px; border-radius:3px; margin-right:2px;'>{text}</span>"
+        if tier == 'AV': return f"<span style='color:#856404; background:#fff3cd; border:1px solid #ffeeba; font-weight:bold; font-size:9px; padding:1px 3px; border-radius:3px; margin-right:2px;'>{text}</span>"
+        if tier == 'DP': return f"<span style='color:#721c24; background:#f8d7da; border:1px solid #f5c6cb; font-weight:bold; font-size:9px; padding:1px 3px; border-radius:3px; margin-right:2px;'>{text}</span>"
+        return ""
+
+    ROLE_ICONS = {'Batter': "🏏", 'Bowler': "⚾", 'Batting All-Rounder': "🏏⚾", 'Bowling All-Rounder': "⚾🏏"}
+
+    def _squad_table(self, team_name, players, opponent, color, rows_data, years):
+        """Per-player form / venue table with signal badges (one squad)."""
+        if not players: return f"<div>No players selected for {team_name}</div>"
+        if not rows_data: return f"<div>No data available for {team_name}</div>"
+
+        rows = ""
+        for i, row in enumerate(rows_data):
+            bg = "#ffffff" if i % 2 == 0 else "#f8f9fa"
+            player_name = row['Player']
+            role_icon = self.ROLE_ICONS.get(row['Role'], "")
+            badges = " ".join(self._badge(text, tier) for text, tier in row['Signals'])
+
+            # Name with Role Icon
+            p_name = f"<div style='font-weight:700; color:{color}; font-size:13px;'>{role_icon} {player_name}</div><div style='margin-top:3px;'>{badges}</div>"
+
+            bat_f = str(row.get('Bat Form', '-'))
+            v_runs_val = str(row.get('Ven Runs', '-'))
+            v_inns_val = str(row.get('Ven Inns', '-'))
+            v_runs_display = f"{v_runs_val} <span style='font-size:10px; color:#666;'>({v_inns_val})</span>" if v_runs_val not in ['-','0'] else v_runs_val
+            bowl_f = str(row.get('Bowl Form', '-'))
+
+            rows += f"""
+                <tr style="background:{bg}; border-bottom:1px solid #dee2e6; font-family:'Segoe UI', sans-serif; font-size:12px; height:45px;">
+                    <td style="padding:4px 8px; text-align:left; border-right:3px solid {color}; vertical-align:middle;">{p_name}</td>
+                    <td style="padding:6px; vertical-align:middle;">{row['Inns']}</td>
+                    <td style="padding:6px; font-size:11px; color:#555; vertical-align:middle;">{bat_f}</td>
+                    <td style="padding:6px; font-weight:600; background:#f1f3f5; vertical-align:middle;">{row['Bat Avg']}</td>
+                    <td style="padding:6px; vertical-align:middle;">{row['vs Opp']}</td>
+                    <td style="padding:6px; background:#fff3cd; font-weight:bold; border-left:2px solid #ffeeba; vertical-align:middle;">{row['Ven Avg']}</td>
+                    <td style="padding:6px; background:#fff3cd; vertical-align:middle;">{v_runs_display}</td>
+                    <td style="padding:6px; background:#fff3cd; border-right:2px solid #ffeeba; vertical-align:middle;">{row['Ven HS']}</td>
+                    <td style="padding:6px; font-size:11px; color:#0d6efd; text-align:left; vertical-align:middle;">{bowl_f}</td>
+                    <td style="padding:6px; vertical-align:middle;">{row['Bowl Econ']}</td>
+                    <td style="padding:6px; background:#e8f4f8; font-weight:bold; color:#0c5460; vertical-align:middle;">{row['Ven Econ']}</td>
+                    <td style="padding:6px; background:#e8f4f8; font-weight:bold; color:#0c5460; vertical-align:middle;">{row['Ven Wkts']}</td>
+                </tr>"""
+
+        # --- LEGEND ---
+        legend_html = f"""
+            <div style="margin-top:5px; padding:10px 15px; background:#e2e8f0; border-radius:0 0 8px 8px; font-size:10px; color:#475569;">
+                <div style="font-weight:bold; margin-bottom:5px;">LEGEND (Last 5 Inns):</div>
+                <div style="display:grid; grid-template-columns: 1fr 1fr; gap:10px;">
+                    <div>
+                        <div style="font-weight:bold; margin-bottom:2px;">🏏 Batting (Avg)</div>
+                        <span style="background:#d4edda; color:#155724; padding:1px 4px; border-radius:3px;">GE &gt; 45</span>
+                        <span style="background:#e2e3e5; color:#0f5132; padding:1px 4px; border-radius:3px;">GD 30-45</span>
+                        <span style="background:#fff3cd; color:#856404; padding:1px 4px; border-radius:3px;">AVG 20-30</span>
+                        <span style="background:#f8d7da; color:#721c24; padding:1px 4px; border-radius:3px;">DIP &lt; 20</span>
+                    </div>
+                    <div>
+                        <div style="font-weight:bold; margin-bottom:2px;">⚾ Bowling (Wkts)</div>
+                        <span style="background:#cfe2ff; color:#084298; padding:1px 4px; border-radius:3px;">GE &gt; 8</span>
+                        <span style="background:#e2e3e5; color:#052c65; padding:1px 4px; border-radius:3px;">GD 4-7</span>
+                        <span style="background:#fff3cd; color:#664d03; padding:1px 4px; border-radius:3px;">AVG 2-3</span>
+                        <span style="background:#f8d7da; color:#721c24; padding:1px 4px; border-radius:3px;">DIP 0-1</span>
+                    </div>
+                </div>
+            </div>
+            """
+
+        return f"""
+            <div style="margin-bottom:30px; border-radius:8px; overflow:hidden; box-shadow: 0 4px 12px rgba(0,0,0,0.08); border:1px solid #e0e0e0;">
+                <div style="background:{color}; color:white; padding:10px 15px; font-weight:bold; font-size:14px; letter-spacing:1px; text-transform:uppercase;">
+                    {team_name} <span style="font-size:11px; opacity:0.8; float:right;">(Last {years} Years)</span>
+                </div>
+                <div style="overflow-x:auto;">
+                    <table style="width:100%; min-width:1100px; border-collapse:collapse; text-align:center; color:#333;">
+                        <colgroup>
+                            <col style="width:200px;"> <col style="width:50px;">  <col style="width:160px;"> <col style="width:50px;">  <col style="width:50px;">  <col style="width:50px;">  <col style="width:50px;">  <col style="width:50px;">  <col style="width:220px;"> <col style="width:50px;">  <col style="width:50px;">  <col style="width:50px;">  
+                        </colgroup>
+                        <thead>
+                            <tr style="background:#343a40; color:white; font-size:11px; text-transform:uppercase; height:40px;">
+                                <th style="text-align:left; padding-left:10px;">Player & Signals</th>
+                                <th>Inns</th>
+                                <th>Form (Bat)</th>
+                                <th style="background:#495057;">Avg</th>
+                                <th>vs {opponent[:3].upper()}</th>
+                                <th style="background:#ffc107; color:#212529;">V.Avg</th>
+                                <th style="background:#ffc107; color:#212529;">V.Runs</th>
+                                <th style="background:#ffc107; color:#212529;">V.HS</th>
+                                <th style="text-align:left; padding-left:10px;">Form (Bowl)</th>
+                                <th>Econ</th>
+                                <th style="background:#17a2b8;">V.Econ</th>
+                                <th style="background:#17a2b8;">V.Wkts</th>
+                            </tr>
+                        </thead>
+                        <tbody>{rows}</tbody>
+                    </table>
+                </div>
+                {legend_html}
+            </div>"""
+
+    def squad_comparison(self, c):
+        team_a_name, team_b_name, years = c.team_a, c.team_b, c.years
+        c1 = TEAM_COLORS.get(team_a_name, "#333")
+        c2 = TEAM_COLORS.get(team_b_name, "#333")
+        metrics_a = c.metrics.iloc[0].to_dict()
+        metrics_b = c.metrics.iloc[-1].to_dict()
+        avg_caps_a, avg_caps_b = c.avg_caps
+
+        # 1. HEADER & SQUAD EXPERIENCE
+        display(HTML(f"""
+        <div style="font-family: 'Segoe UI', Roboto, sans-serif; margin-bottom:25px;">
+            <div style="background: linear-gradient(135deg, {c1} 0%, {c2} 100%); padding:12px; border-radius:8px 8px 0 0; color:white; text-align:center;">
+                <h3 style="margin:0; font-size:18px;">⚔️ SQUAD COMPARISON (Last {years} Years)</h3>
+                <div style="font-size:12px; opacity:0.9;">{team_a_name.upper()} vs {team_b_name.upper()}</div>
+            </div>
+            
+            <div style="background:white; border:1px solid #ddd; border-top:none;">
+                <table style="width:100%; text-align:center; border-collapse:separate; border-spacing:0; font-size:13px;">
+                    <thead>
+                        <tr style="background:#f8f9fa; color:#555; text-transform:uppercase; font-size:11px;">
+                            <th style="padding:10px; border-bottom:2px solid #eee;">TEAM</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">CAPS</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee; background:#e9ecef;">AVG CAPS</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">RUNS</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">100s</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">50s</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">WKTS</th>
+                            <th style="padding:10px; border-bottom:2px solid #eee;">5W</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr style="border-bottom:1px solid #eee;">
+                            <td style="padding:10px; font-weight:bold; color:{c1}; border-left: 4px solid {c1};">{team_a_name}</td>
+                            <td style="font-weight:bold;">{metrics_a['Caps (Combined)']:,}</td>
+                            <td style="background:#f8f9fa; color:#666;">{avg_caps_a}</td>
+                            <td>{metrics_a['Total Runs']:,}</td>
+                            <td>{metrics_a['100s']}</td>
+                            <td>{metrics_a['50s']}</td>
+                            <td>{metrics_a['Total Wickets']}</td>
+                            <td>{metrics_a['5-Wkt Hauls']}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding:10px; font-weight:bold; color:{c2}; border-left: 4px solid {c2};">{team_b_name}</td>
+                            <td style="font-weight:bold;">{metrics_b['Caps (Combined)']:,}</td>
+                            <td style="background:#f8f9fa; color:#666;">{avg_caps_b}</td>
+                            <td>{metrics_b['Total Runs']:,}</td>
+                            <td>{metrics_b['100s']}</td>
+                            <td>{metrics_b['50s']}</td>
+                            <td>{metrics_b['Total Wickets']}</td>
+                            <td>{metrics_b['5-Wkt Hauls']}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+        """))
+
+        # 2. PLAYER STATS
+        display(HTML(f"""
+        <div style="background:#334155; color:#e2e8f0; padding:10px 15px; border-radius:6px; margin:20px 0 10px 0; border-left:5px solid #34d399; font-family:'Segoe UI', sans-serif;">
+            <div style="font-weight:bold; font-size:14px;">📊 DETAILED PLAYER STATISTICS & VENUE METRICS</div>
+            <div style="font-size:11px; opacity:0.8; margin-top:2px;">
+                INCLUDES: Form, (vs Opponent), and Venue History ({c.venue_id})
+            </div>
+        </div>
+        """))
+        display(HTML(self._squad_table(team_a_name, c.players_a, team_b_name, c1, c.player_rows[0], years)))
+        display(HTML(self._squad_table(team_b_name, c.players_b, team_a_name, c2, c.player_rows[1], years)))
+
+        # 3. TACTICAL MATRIX
+        print("\n")
+        display(HTML(f"<div style='background:#444; color:white; padding:8px; border-radius:4px; font-weight:bold; margin-bottom:10px; font-family:sans-serif;'>📊 TACTICAL MATRIX: ARCHETYPES (Last {years} Years)</div>"))
+        self.threat_matrix(c.threats[0])
+        print("\n")
+        self.threat_matrix(c.threats[1])
+
+        # 4. MATCHUPS
+        display(HTML(f"""<div style="background:#343a40; color:white; padding:8px; border-radius:6px; font-weight:bold; margin-bottom:10px; font-family:'Segoe UI';">⚔️ HEAD-TO-HEAD MATCHUPS</div>"""))
+
+        left = widgets.Output(); right = widgets.Output()
+        
+        with left:
+            display(HTML(f"<div style='font-weight:bold; color:{c1}; margin-bottom:10px; border-bottom:3px solid {c1};'>🛡️ {team_a_name.upper()} BATTING</div>"))
+            for batter, matchup in c.matchups[0]: self.batter_matchup(batter, team_a_name, matchup)
+
+        with right:
+            display(HTML(f"<div style='font-weight:bold; color:{c2}; margin-bottom:10px; border-bottom:3px solid {c2};'>🛡️ {team_b_name.upper()} BATTING</div>"))
+            for batter, matchup in c.matchups[1]: self.batter_matchup(batter, team_b_name, matchup)
+
+        if HAS_WIDGETS: display(widgets.HBox([left, right], layout=widgets.Layout(width='100%', gap='30px'))) # Mock outputs already showed their content
+
+    def threat_matrix(self, t):
+        """Opposition attack breakdown (style badges) + batter x style averages."""
+        team_name = t.team
+        if t.missing:
+            print(f"⚠️ WARNING: The following ACTIVE BOWLERS in {team_name}'s opposition are missing from teams.py:")
+            print(f"   {', '.join(t.missing)}")
+            print("   Please add them to config/teams.py to see them in the Matrix.")
+
+        if not t.styles: return
+
+        c1 = TEAM_COLORS.get(team_name, "#333")
+        
+        style_badges = ""
+        for style, bowlers_list in t.styles.items():
+            count = len(bowlers_list)
+            names_str = ", ".join(bowlers_list)
+            
+            icon = style.split(' ')[0]
+            name = style.split(' ', 1)[1] if ' ' in style else style
+            
+            style_badges += f"""
+            <div style="background:#fff; border:1px solid #ddd; padding:6px 10px; border-radius:8px; font-size:11px; font-weight:bold; color:#555; display:flex; flex-direction:column; align-items:center; gap:2px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); min-width: 100px;">
+                <div style="display:flex; align-items:center; gap:5px; margin-bottom:2px;">
+                    <span style="font-size:14px;">{icon}</span>
+                    <span>{name}</span>
+                    <span style="background:{c1}; color:white; padding:1px 6px; border-radius:10px; font-size:10px;">{count}</span>
+                </div>
+                <div style="font-size:9px; color:#777; font-weight:normal; text-align:center; max-width:140px; line-height:1.1;">
+                    {names_str}
+                </div>
+            </div>
+            """
+
+        display(HTML(f"""
+        <div style="font-family:'Segoe UI', sans-serif; margin-bottom:10px; border:1px solid #eee; border-radius:6px; overflow:hidden;">
+            <div style="background:#f8f9fa; padding:6px 10px; font-weight:bold; color:#333; border-bottom:1px solid #eee; font-size:12px;">
+                🛡️ THREAT MATRIX: {team_name} Batters vs Opposition Team Bowler Types
+            </div>
+            <div style="padding:10px; display:flex; flex-wrap:wrap; gap:8px; background:white;">
+                {style_badges}
+            </div>
+        </div>
+        """))
+
+        if not t.cells: return
+        target_styles = list(t.styles.keys())
+        headers = "".join([f"<th style='padding:6px; background:#f4f4f4; color:#555; font-size:11px;'>{s.split(' ', 1)[1] if ' ' in s else s}</th>" for s in target_styles])
+
+        rows_html = ""
+        for batter, faced in t.cells:
+            cells = ""
+            for style in target_styles:
+                if style in faced:
+                    avg, sr = faced[style]
+                    color = "#2e7d32" if avg > 40 else "#c62828" if avg < 25 else "#333"
+                    cell = f"<span style='color:{color}; font-weight:bold;'>{avg}</span> <span style='font-size:10px; color:#999;'>({sr})</span>"
+                else:
+                    cell = "-"
+                cells += f"<td style='padding:6px; border-bottom:1px solid #eee; font-size:12px;'>{cell}</td>"
+            rows_html += f"<tr><td style='padding:6px; font-weight:bold; text-align:right; border-right:2px solid {c1}; color:{c1}; font-size:12px;'>{batter}</td>{cells}</tr>"
+
+        display(HTML(f"""
+            <div style="border:1px solid #ddd; border-radius:6px; overflow-x:auto; margin-bottom:20px;">
+                <table style="width:100%; border-collapse:collapse; text-align:center; font-family:sans-serif;">
+                    <thead><tr><th style="padding:6px; text-align:right; background:{c1}; color:white; font-size:11px;">BATTER</th>{headers}</tr></thead>
+                    <tbody>{rows_html}</tbody>
+                </table>
+                <div style="padding:4px; background:#fafafa; color:#777; font-size:9px; text-align:right;">
+                    <i>Stats vs All bowlers of this type in database</i>
+                </div>
+            </div>
+            """))
+
+    def batter_matchup(self, batter, team, matchup):
+        """One batter vs the opposition bowlers (most balls faced first)."""
+        hex = TEAM_COLORS.get(team, '#000')
+        display(HTML(f"<div style='font-weight:700; color:{hex}; font-size:12px; margin-top:8px;'>🏏 {batter}</div>"))
+
+        def color_rows(row):
+            val = row['Outs']
+            color = '#333'; weight = 'normal'
+            if val >= 3: color = '#d32f2f'; weight = 'bold'
+            elif val == 2: color = '#e67e22'; weight = 'bold'
+            elif val == 0: color = '#2e7d32'; weight = 'bold'
+            return [f'color: {color}; font-weight: {weight}' if col == 'Bowler' else '' for col in row.index]
+
+        # Filter columns for display (Hide RawName/RawStyle)
+        display_cols = ['Bowler', 'Runs', 'Balls', 'Outs', 'Avg', 'SR']
+        styler = matchup[display_cols].style.apply(color_rows, axis=1).format("{:.1f}", subset=['SR', 'Avg']).hide(axis='index')
+        styler.set_table_styles([{'selector': 'th', 'props': [('background-color', '#f8f9fa'), ('color', '#495057'), ('font-size', '10px'), ('border-bottom', '2px solid #dee2e6')]}])
+        display(styler)
+
+    # =================================================================================
+    # 👤 PLAYER PROFILE
+    # =================================================================================
+
+    @staticmethod
+    def _context_card(card):
+        if card is None: return ""
+        html = f"""
+                <div style="background:#f8f9fa; border:1px solid #e9ecef; border-radius:6px; padding:12px; margin-bottom:10px;">
+                    <div style="font-weight:bold; color:#333; font-size:13px; margin-bottom:8px; border-bottom:2px solid #ffc107; display:inline-block; padding-bottom:2px;">{card.title}</div>
+                    
+                    <!-- BATTING -->
+                    <div style="display:grid; grid-template-columns: 1fr 1fr 1fr 1fr 1fr; gap:5px; text-align:center; font-size:12px; margin-bottom:5px;">
+                        <div><div style="color:#777; font-size:10px;">Inns</div><b>{card.inns}</b></div>
+                        <div><div style="color:#777; font-size:10px;">Runs</div><b>{card.runs}</b></div>
+                        <div><div style="color:#777; font-size:10px;">Avg</div><b>{card.avg}</b></div>
+                        <div><div style="color:#777; font-size:10px;">SR</div><b>{card.sr}</b></div>
+                        <div><div style="color:#777; font-size:10px;">HS</div><b>{card.hs}</b></div>
+                    </div>
+                    <div style="text-align:center; font-size:10px; color:#666; background:#e9ecef; border-radius:3px; padding:2px;">
+                        {card.hundreds} Centuries &bull; {card.fifties} Fifties
+                    </div>
+                """
+
+        if card.has_bowling:
+            html += f"""
+                    <div style="margin-top:8px; padding-top:8px; border-top:1px dashed #ccc;">
+                        <div style="font-size:11px; font-weight:bold; color:#555; margin-bottom:4px;">⚾ Bowling</div>
+                        <div style="display:flex; justify-content:space-between; font-size:12px;">
+                            <span><b>{card.wkts}</b> Wkts</span>
+                            <span><b>{card.bowl_avg}</b> Avg</span>
+                            <span><b>{card.econ}</b> Econ</span>
+                        </div>
+                    </div>
+                    """
+        html += "</div>"
+        return html
+
+    def player_profile(self, profile):
+        c = profile.career
+        if c is not None:
+            bowl_html = ""
+            if c['has_bowling']:
+                bowl_html = f"""
+                <div style="border-top:1px solid #ddd; margin-top:10px; padding-top:10px;">
+                    <div style="font-size:11px; color:#555; font-weight:bold; letter-spacing:1px; margin-bottom:5px;">BOWLING</div>
+                    <div style="display:flex; gap:15px; font-size:13px;">
+                        <div><b>{c['wkts']}</b> Wkts</div>
+                        <div><b>{c['bowl_avg']}</b> Avg</div>
+                        <div><b>{c['econ']}</b> Econ</div>
+                        <div><b>{c['best']}</b> Best</div>
+                    </div>
+                </div>
+                """
+
+            display(HTML(f"""
+            <div style="background:#fff; border-left:4px solid #222; padding:15px; margin-bottom:20px; font-family:'Segoe UI', sans-serif; box-shadow:0 2px 5px rgba(0,0,0,0.05);">
+                <div style="font-size:14px; color:#222; font-weight:bold; letter-spacing:1px; margin-bottom:10px;">👤 CAREER SUMMARY <span style="font-weight:normal; color:#777; font-size:11px;">({profile.time_label})</span></div>
+                
+                <div style="display:flex; gap:30px; align-items:flex-start;">
+                    <!-- BATTING -->
+                    <div style="flex:1;">
+                         <div style="font-size:11px; color:#555; font-weight:bold; letter-spacing:1px; margin-bottom:5px;">BATTING</div>
+                         <div style="display:grid; grid-template-columns: repeat(4, 1fr); gap:10px; font-size:13px; margin-bottom:8px;">
+                            <div><b>{c['inns']}</b> Inns</div>
+                            <div><b>{c['runs']:,}</b> Runs</div>
+                            <div><b>{c['avg']}</b> Avg</div>
+                            <div><b>{c['sr']}</b> SR</div>
+                         </div>
+                         <div style="display:flex; gap:15px; font-size:12px; color:#444; background:#f4f4f4; padding:5px 8px; border-radius:4px;">
+                            <span><b>{c['hundreds']}</b> 100s</span>
+                            <span><b>{c['fifties']}</b> 50s</span>
+                            <span><b>{c['hs']}</b> HS</span>
+                         </div>
+                    </div>
+                    
+                    <!-- BOWLING (Conditional) -->
+                    {'<div style="width:1px; background:#eee;"></div><div style="flex:1;">' + bowl_html.replace('border-top:1px solid #ddd; margin-top:10px; padding-top:10px;', '') + '</div>' if c['has_bowling'] else ''}
+                </div>
+            </div>
+            """))
+
+        # --- VS OPPOSITION & VENUE (Dual Cards, side by side) ---
+        if profile.show_context:
+            display(HTML(f"""
+            <div style="display:flex; gap:20px; margin-bottom:20px;">
+                <div style="flex:1;">{self._context_card(profile.opposition)}</div>
+                <div style="flex:1;">{self._context_card(profile.venue)}</div>
+            </div>
+            """))
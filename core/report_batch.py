@@ -0,0 +1,200 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+import numpy as np
+from core.match_status import VALID_1ST_STATUSES, STATUS_INCLUDED, WINNER_TIE, WINNER_NO_RESULT
+from core.results import TeamReport
+
+FORTRESS = 'fortress'
+GLOBAL_H2H = 'global_h2h'
+COUNTRY_H2H = 'country_h2h'
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """
+    One team report request (same arguments as the single calls):
+    - fortress    : fortress_report(venue, home_team, opp_team, years_back)
+    - global_h2h  : global_h2h_report(home_team, opp_team, years_back)
+    - country_h2h : country_h2h_report(home_team, opp_team, country, years_back)
+    """
+    kind: str
+    home_team: str
+    opp_team: str = 'All'
+    venue: str = None
+    country: str = None
+    years_back: int = 10
+
+class ReportBatch:
+    """
+    🧮 The Report Batch (v1.0 - Grouped Scenario Executor).
+    Computes the TeamReport of many scenarios at once (regression fixtures, full sweeps):
+    - Scenario filters are MatchIndex queries (same specs as the single calls) -> one flat (scenario, match) table
+    - Every count / average / high / low of TeamReport is a bincount or grouped max/min over it
+    - Results are identical to the single fortress / global / country report calls
+    - audit=False skips the per-scenario audit tables (fixtures only store rows())
+    - workers > 1 splits the scenarios over a (fork) process pool; without fork, or when the pool
+      cannot start / loses a worker, the batch runs in-process (same results, one core)
+    """
+    COLUMNS = ['winner_code', 'bat1_code', 'bat2_code', 'status_code', 'score_inn1', 'score_inn2']
+
+    def __init__(self, team_engine):
+        self.engine = team_engine
+
+    def run(self, scenarios, workers=None, audit=True):
+        """TeamReport (or None when no matches) for every scenario, in order."""
+        scenarios = list(scenarios)
+        if workers and workers > 1 and len(scenarios) > 1:
+            return self._run_pool(scenarios, workers, audit)
+        return self._compute(scenarios, audit)
+
+    # =================================================================================
+    # 1. SCENARIO -> MATCH ROWS
+    # =================================================================================
+
+    def _scenario_rows(self, scenarios):
+        """(match_df positions, label, title, venue mode) per scenario (one MatchIndex query each)."""
+        eng = self.engine
+        out = []
+        for s in scenarios:
+            if s.kind == FORTRESS:
+                label = s.opp_team if s.opp_team != 'All' else "Visitors"
+                spec, title, venue_mode = eng._fortress_filter(s.venue, s.home_team, s.opp_team, s.years_back), f"FORTRESS REPORT (vs {label})", True
+            elif s.kind == GLOBAL_H2H:
+                label, spec, title, venue_mode = s.opp_team, eng._h2h_filter(s.home_team, s.opp_team, s.years_back), "GLOBAL RIVALRY REPORT", False
+            elif s.kind == COUNTRY_H2H:
+                label, spec, title, venue_mode = s.opp_team, eng._country_filter(s.home_team, s.opp_team, s.country, s.years_back), f"HOST COUNTRY REPORT ({s.country})", False
+            else:
+                raise ValueError(f"Unknown scenario kind: {s.kind}")
+            out.append((eng.match_index.match_positions(spec), label, title, venue_mode))
+        return out
+
+    # =================================================================================
+    # 2. GROUPED PASS (One flat table, scenario id = group key)
+    # =================================================================================
+
+    def _compute(self, scenarios, audit=True):
+        eng = self.engine
+        plan = self._scenario_rows(scenarios)
+        n = len(plan)
+        if n == 0: return []
+
+        sizes = np.array([len(rows) for rows, _, _, _ in plan])
+        sid = np.repeat(np.arange(n), sizes)
+        flat = np.concatenate([rows for rows, _, _, _ in plan]) if sizes.sum() else np.array([], dtype=np.int64)
+        col = {c: eng.match_df[c].to_numpy()[flat] for c in self.COLUMNS}
+        wc, b1, b2, st = col['winner_code'], col['bat1_code'], col['bat2_code'], col['status_code']
+        s1, s2 = col['score_inn1'].astype(float), col['score_inn2'].astype(float)
+
+        # Per-scenario codes / modes broadcast to the flat rows
+        h = np.array([eng._code(s.home_team) for s in scenarios])[sid]
+        label_vis = np.array([label == 'Visitors' for _, label, _, _ in plan])
+        stats_vis = label_vis & np.array([venue_mode for _, _, _, venue_mode in plan])
+        v = np.array([eng._code(label) for _, label, _, _ in plan])[sid]
+        lv, sv = label_vis[sid], stats_vis[sid]
+
+        count = lambda m: np.bincount(sid, weights=m, minlength=n).astype(int)
+
+        # Results (Visitors = anyone but the home team, ties / no results aside)
+        tie_nr_row = (wc == WINNER_TIE) | (wc == WINNER_NO_RESULT)
+        h_win = wc == h
+        v_win = np.where(lv, ~h_win & ~tie_nr_row, wc == v)
+        matches, tie_nr, h_wins = count(np.ones(len(sid))), count(tie_nr_row), count(h_win)
+        h_win_bat1, h_win_bat2 = count(h_win & (b1 == h)), count(h_win & (b2 == h))
+        v_wins = np.where(label_vis, matches - h_wins - tie_nr, count(wc == v))
+        v_win_bat1 = count(v_win & np.where(lv, b2 == h, b1 == v))
+        v_win_bat2 = count(v_win & np.where(lv, b1 == h, b2 == v))
+
+        # Validity (1st innings: Included + Short 2nd, 2nd innings: Included only)
+        valid1 = np.isin(st, VALID_1ST_STATUSES)
+        valid2 = st == STATUS_INCLUDED
+
+        def avg(m, vals):
+            """_get_avg_with_count per scenario: 'mean (rows)', '-' if no rows / no scores."""
+            rows = count(m)
+            ok = m & ~np.isnan(vals)
+            tot = np.bincount(sid, weights=np.where(ok, vals, 0.0), minlength=n)
+            num = np.bincount(sid, weights=ok, minlength=n)
+            return [f"{int(t / k)} ({r})" if r and k else "-" for r, t, k in zip(rows, tot, num)]
+
+        def extreme(m, vals, fn):
+            """int(max / min) of the scores per scenario, '-' if none."""
+            best = np.full(n, np.nan)
+            ok = m & ~np.isnan(vals)
+            fn.at(best, sid[ok], vals[ok]) # fmax / fmin ignore the NaN start value
+            return [int(x) if not np.isnan(x) else "-" for x in best]
+
+        def team_stats(bat1, bat2):
+            """_calculate_team_stats for every scenario at once (bat1 / bat2 = the side's innings rows)."""
+            bat1 = bat1 & valid1; bat2 = bat2 & valid2
+            w1 = bat1 & (wc == b1)
+            w2 = bat2 & (wc == b2)
+            l2 = bat2 & (wc != b2)
+            smart2 = bat2 & (~w2 | (s2 >= 200)) # Competitive chases only (easy wins < 200 dropped)
+            cols = {
+                'avg_1st': avg(bat1, s1), 'high_1st': extreme(bat1, s1, np.fmax), 'low_1st': extreme(bat1, s1, np.fmin),
+                'avg_1st_win': avg(w1, s1), 'low_defended': extreme(w1, s1, np.fmin),
+                'avg_2nd': avg(smart2, s2), 'high_chased': extreme(w2, s2, np.fmax),
+                'avg_succ': avg(w2, s2), 'avg_fail': avg(l2, s2),
+            }
+            return [{k: vals[i] for k, vals in cols.items()} for i in range(n)]
+
+        home = team_stats(b1 == h, b2 == h)
+        away = team_stats(np.where(sv, b1 != h, b1 == v), np.where(sv, b2 != h, b2 == v))
+        venue_1st, venue_2nd = avg(valid1, s1), avg(valid2, s2)
+        venue_win_1st = avg(valid1 & (wc == b1), s1)
+
+        # 3. ASSEMBLE (Audit tables need the full match records -> per scenario, optional)
+        out = []
+        for i, (s, (rows, label, title, _)) in enumerate(zip(scenarios, plan)):
+            if not matches[i]: out.append(None); continue
+            dec = matches[i] - tie_nr[i]
+            out.append(TeamReport(
+                home_team=s.home_team, visitor=label, title=title,
+                matches=int(matches[i]), tie_nr=int(tie_nr[i]), win_rate=int((h_wins[i] / dec) * 100) if dec > 0 else 0,
+                home_wins=int(h_wins[i]), home_defended=int(h_win_bat1[i]), home_chased=int(h_win_bat2[i]),
+                visitor_wins=int(v_wins[i]), visitor_defended=int(v_win_bat1[i]), visitor_chased=int(v_win_bat2[i]),
+                venue_avg_1st=venue_1st[i], venue_avg_2nd=venue_2nd[i], venue_avg_win_1st=venue_win_1st[i],
+                home_stats=home[i], visitor_stats=away[i],
+                audit=eng._audit_frame(eng.match_df.iloc[rows]) if audit else None,
+            ))
+        return out
+
+    # =================================================================================
+    # 4. PROCESS POOL (Forked workers share the loaded engine, nothing is pickled in)
+    # =================================================================================
+
+    def _run_pool(self, scenarios, workers, audit):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            print("⚠️ Process pool needs 'fork' (not available here) -> running in-process.")
+            return self._compute(scenarios, audit)
+
+        # Whole home teams per chunk, balanced by scenario count
+        by_team = {}
+        for i, s in enumerate(scenarios): by_team.setdefault(s.home_team, []).append(i)
+        chunks = [[] for _ in range(min(workers, len(by_team)))]
+        for idx in sorted(by_team.values(), key=len, reverse=True):
+            min(chunks, key=len).extend(idx)
+        chunks = [c for c in chunks if c]
+
+        global _POOL_BATCH
+        _POOL_BATCH = self
+        try:
+            with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context('fork')) as pool:
+                parts = list(pool.map(_pool_compute, [([scenarios[i] for i in c], audit) for c in chunks]))
+        except (OSError, BrokenProcessPool) as e: # Process limits / worker killed (OOM) -> still answer
+            print(f"⚠️ Process pool failed ({e}) -> running in-process.")
+            return self._compute(scenarios, audit)
+        finally:
+            _POOL_BATCH = None
+
+        out = [None] * len(scenarios)
+        for c, reports in zip(chunks, parts):
+            for i, r in zip(c, reports): out[i] = r
+        return out
+
+_POOL_BATCH = None # Set in the parent right before forking
+
+def _pool_compute(args):
+    scenarios, audit = args
+    return _POOL_BATCH._compute(scenarios, audit)
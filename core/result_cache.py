@@ -0,0 +1,263 @@
+import copy
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+def normalize_arg(value):
+    """Hashable, order-stable form of a report argument ([a, b] == (a, b), np.int64(5) == 5, dicts by key)."""
+    if isinstance(value, np.generic): return value.item()
+    if isinstance(value, (list, tuple)): return tuple(normalize_arg(v) for v in value)
+    if isinstance(value, (set, frozenset)): return tuple(sorted((normalize_arg(v) for v in value), key=repr))
+    if isinstance(value, dict): return tuple(sorted((k, normalize_arg(v)) for k, v in value.items()))
+    if isinstance(value, pd.Timestamp): return value.isoformat()
+    hash(value) # Unhashable -> TypeError -> call is not cached
+    return value
+
+# stdout and the display() hooks are process-wide -> one recording / replay at a time
+_OUTPUT_LOCK = threading.RLock()
+
+class _Tee:
+    """stdout stand-in: writes through and keeps the recording thread's text (in order with display() calls)."""
+    def __init__(self, stream, recorder):
+        self.stream, self.recorder = stream, recorder
+
+    def write(self, text):
+        if text: self.recorder.add(('out', text))
+        return self.stream.write(text)
+
+    def flush(self):
+        return self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class _Recorder:
+    """
+    Ordered print / display() events of one report run.
+    Anything shown inside an ipywidgets Output context belongs to that widget, which is
+    itself displayed (and replayed) later -> not recorded twice. Same for text a display()
+    call prints itself (plain-terminal IPython writes the repr to stdout): replaying the call prints it.
+    Only the recording thread's output is kept (other threads print through untouched).
+    """
+    def __init__(self):
+        self.events = []
+        self.depth = 0 # Inside a widget Output / a display() call
+        self.owner = threading.get_ident()
+        self.active = True
+
+    def mine(self):
+        return self.active and threading.get_ident() == self.owner
+
+    def add(self, event):
+        if not self.depth and self.mine(): self.events.append(event)
+
+class ResultCache:
+    """
+    🧠 The Result Cache (v1.0 - Memoised Reports, LRU).
+    Wraps the CricketAnalyzer report calls so a repeated click is a dict hit.
+    - Key: engine method + normalised bound arguments (defaults applied) + cutoff DAY + data version
+      + output variant (renderer name: replayed output must come from the active renderer)
+    - Compute records (record=False: *_report, score_prediction, ...) are cached as plain results;
+      the engines render them on every call, so nothing is captured
+    - Other reports: printed text and display() calls of the first run are recorded and replayed
+      on a hit. Recording / replay hold a process-wide lock and only capture the calling thread;
+      a run whose stdout was swapped by another thread mid-way is not stored
+    - LRU-bounded (maxsize entries, 0 = off); hits / misses / skipped counters
+    - Calls with a recorder (side effects) or unhashable arguments always run
+    - new_version() on every (re)load: old entries can never be served again
+    - Optional ResultStore (SQLite) below the LRU, keyed by the data digest instead of the
+      in-process version number -> reports survive restarts while the data files are unchanged
+    """
+    def __init__(self, maxsize=128, store=None):
+        self.maxsize = maxsize
+        self.store = store
+        self.data_version = 0
+        self.data_digest = None
+        self.variant = None
+        self._entries = OrderedDict()
+        self._signatures = {}
+        self._lock = threading.RLock() # Entries + counters (shared across Streamlit sessions)
+        self._local = threading.local() # Per-thread 'inside a recording' flag
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    @staticmethod
+    def cutoff_day():
+        """Every 'Last N Years' window moves once a day (see window_cutoff) -> part of the key."""
+        return pd.Timestamp.now().normalize()
+
+    def new_version(self, data_digest=None):
+        """Data (re)loaded: bump the version and drop everything computed on the old data (in memory)."""
+        self.data_version += 1
+        self.data_digest = data_digest
+        self.clear()
+
+    def clear(self):
+        with self._lock: self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.disk_hits + self.misses
+        stats = {
+            'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'skipped': self.skipped,
+            'hit_rate': round((self.hits + self.disk_hits) / total, 3) if total else 0.0,
+            'entries': len(self._entries), 'maxsize': self.maxsize, 'data_version': self.data_version,
+        }
+        if self._disk_enabled(): stats['disk'] = self.store.stats()
+        return stats
+
+    def _disk_enabled(self):
+        return self.store is not None and self.store.enabled and self.data_digest is not None
+
+    # =================================================================================
+    # 🔑 KEYS
+    # =================================================================================
+
+    def key(self, fn, args, kwargs, record=True):
+        """(method, bound args, cutoff day, data version, variant). None -> not cacheable. Records have no variant."""
+        func = getattr(fn, '__func__', fn)
+        name = func.__qualname__
+        sig = self._signatures.get(name)
+        if sig is None: sig = self._signatures[name] = inspect.signature(fn)
+        try:
+            bound = sig.bind(*args, **kwargs)
+        except TypeError:
+            return None # Let the call itself raise
+        bound.apply_defaults()
+        if bound.arguments.get('recorder') is not None: return None
+        try:
+            params = tuple((k, normalize_arg(v)) for k, v in bound.arguments.items())
+        except TypeError:
+            return None
+        return (name, params, self.cutoff_day(), self.data_version, self.variant if record else None)
+
+    # =================================================================================
+    # ⚡ CALL
+    # =================================================================================
+
+    def _recording(self):
+        return getattr(self._local, 'recording', False)
+
+    def call(self, fn, args, kwargs, record=True):
+        """
+        fn(*args, **kwargs), memoised. record=True: output of a cached call is replayed as it was
+        first shown. record=False: fn only returns a value (nothing printed / displayed).
+        """
+        cacheable = self.maxsize and not (record and self._recording()) # Nested reports run inside the outer recording
+        key = self.key(fn, args, kwargs, record) if cacheable else None
+        if key is None:
+            with self._lock: self.skipped += 1
+            return fn(*args, **kwargs)
+        if not record:
+            entry = self._lookup(key)
+            if entry is not None: return copy.deepcopy(entry[0])
+            with self._lock: self.misses += 1
+            result = fn(*args, **kwargs)
+            self._store(key, (copy.deepcopy(result), []))
+            return result
+
+        with _OUTPUT_LOCK:
+            entry = self._lookup(key)
+            if entry is not None:
+                result, events = entry
+                self._replay(events)
+                return copy.deepcopy(result)
+
+            with self._lock: self.misses += 1
+            result, events, complete = self._record(fn, args, kwargs)
+            if complete: self._store(key, (copy.deepcopy(result), events))
+            return result
+
+    def _lookup(self, key):
+        """(result, events) from memory, else from the disk store (None on a miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+        if not self._disk_enabled(): return None
+        entry = self.store.get(self._disk_key(key))
+        if entry is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._remember(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            if key[3] != self.data_version: return # Data reloaded while computing
+            self._remember(key, entry)
+        if self._disk_enabled(): self.store.put(self._disk_key(key), key[0], self.data_digest, entry)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        while len(self._entries) > self.maxsize: self._entries.popitem(last=False)
+
+    def _disk_key(self, key):
+        name, params, day, _, variant = key
+        return self.store.key(name, (params, variant), day.date().isoformat(), self.data_digest)
+
+    # =================================================================================
+    # 🎬 RECORD / REPLAY
+    # =================================================================================
+
+    @staticmethod
+    def _display_hosts():
+        """Modules whose 'display' the reports call (engines import it by name)."""
+        hosts = [m for n, m in list(sys.modules.items()) if m is not None and (n.startswith('core.') or n == 'IPython.display')]
+        return [m for m in hosts if callable(getattr(m, 'display', None))]
+
+    def _record(self, fn, args, kwargs):
+        """(result, events, complete). Caller holds _OUTPUT_LOCK. complete=False -> stdout was swapped by someone else."""
+        rec = _Recorder()
+        patched = []
+        for mod in self._display_hosts():
+            original = mod.display
+            def recording(*objs, _original=original, **kw):
+                rec.add(('display', _original, objs, kw))
+                mine = rec.mine()
+                if mine: rec.depth += 1
+                try:
+                    return _original(*objs, **kw)
+                finally:
+                    if mine: rec.depth -= 1
+            patched.append((mod, 'display', original))
+            mod.display = recording
+
+        widgets = sys.modules.get('ipywidgets')
+        if widgets is not None and hasattr(widgets, 'Output'):
+            enter, exit_ = widgets.Output.__enter__, widgets.Output.__exit__
+            def entering(out, _enter=enter):
+                if rec.mine(): rec.depth += 1
+                return _enter(out)
+            def exiting(out, *exc, _exit=exit_):
+                if rec.mine(): rec.depth -= 1
+                return _exit(out, *exc)
+            patched += [(widgets.Output, '__enter__', enter), (widgets.Output, '__exit__', exit_)]
+            widgets.Output.__enter__, widgets.Output.__exit__ = entering, exiting
+
+        stdout = sys.stdout
+        tee = sys.stdout = _Tee(stdout, rec)
+        self._local.recording = True
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            self._local.recording = False
+            rec.active = False # A Tee kept by someone else's redirect now only writes through
+            complete = sys.stdout is tee
+            if complete: sys.stdout = stdout # Never clobber a redirect another thread made meanwhile
+            for owner, attr, original in reversed(patched): setattr(owner, attr, original)
+        return result, rec.events, complete
+
+    @staticmethod
+    def _replay(events):
+        for event in events:
+            if event[0] == 'out': sys.stdout.write(event[1])
+            else:
+                _, show, objs, kw = event
+                show(*objs, **kw)
@@ -0,0 +1,147 @@
+import contextlib
+import hashlib
+import pickle
+import sqlite3
+import time
+
+class ResultStore:
+    """
+    💽 The Result Store (v1.0 - On-Disk Report Cache, SQLite).
+    Second level under ResultCache: computed reports survive kernel / Streamlit restarts.
+    - One row per (method, arguments, cutoff day, data digest) -> pickled (result, output events)
+    - WAL journal: any number of processes read while one writes; busy writers wait, never crash
+    - Size-bounded (max_mb): least recently used rows are evicted after each write
+    - SCHEMA is part of every key and stamped on the file (PRAGMA user_version): opening a store
+      written under another SCHEMA empties it (bump SCHEMA when a report's output changes shape)
+    - Rows that no longer unpickle (truncated blob, moved class) are misses and get deleted
+    - Displayed objects that cannot be pickled (Stylers) are stored as their rendered HTML
+    """
+    SCHEMA = 1
+    TIMEOUT = 5.0        # Writers wait this long for another process's write
+    STAMP_TIMEOUT = 0.05 # Readers never queue behind a writer just to refresh the LRU stamp
+
+    def __init__(self, path, max_mb=256):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = True
+        try:
+            with self._connect() as con:
+                con.execute("PRAGMA journal_mode=WAL")
+                con.execute("""CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY, method TEXT, data_digest TEXT,
+                    created REAL, accessed REAL, size INTEGER, payload BLOB)""")
+                con.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+                if con.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA: # Old layout -> unreachable rows
+                    con.execute("DELETE FROM results")
+                    con.execute(f"PRAGMA user_version = {int(self.SCHEMA)}")
+        except sqlite3.Error as e:
+            print(f"⚠️ Result store disabled ({path}): {e}")
+            self.enabled = False
+
+    @contextlib.contextmanager
+    def _connect(self, timeout=None):
+        """One short-lived connection per operation (safe across threads and processes); commits, then closes."""
+        con = sqlite3.connect(self.path, timeout=self.TIMEOUT if timeout is None else timeout)
+        try:
+            with con: yield con
+        finally:
+            con.close()
+
+    @classmethod
+    def key(cls, method, params, cutoff_day, data_digest):
+        payload = repr((cls.SCHEMA, method, params, str(cutoff_day), data_digest))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    # =================================================================================
+    # 💾 READ / WRITE
+    # =================================================================================
+
+    def get(self, key):
+        """(result, events) or None. Unreadable rows count as misses."""
+        if not self.enabled: return None
+        try:
+            with self._connect() as con:
+                row = con.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None: return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception: # Corrupt blob / class no longer importable -> drop the row, recompute
+            self._discard(key)
+            return None
+        try:
+            with self._connect(self.STAMP_TIMEOUT) as con:
+                con.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            pass # Another process is writing -> LRU stamp is best effort
+        return value
+
+    def put(self, key, method, data_digest, value):
+        """Store (result, events). Values that cannot be pickled (live widgets etc.) stay in memory only."""
+        if not self.enabled: return False
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            try:
+                blob = pickle.dumps(self._portable(value), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return False
+        if len(blob) > self.max_bytes: return False
+        now = time.time()
+        try:
+            with self._connect() as con:
+                con.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (key, method, data_digest, now, now, len(blob), sqlite3.Binary(blob)))
+                self._evict(con)
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, key):
+        try:
+            with self._connect(self.STAMP_TIMEOUT) as con: con.execute("DELETE FROM results WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _portable(value):
+        """(result, events) with unpicklable displayed objects swapped for HTML(obj.to_html())."""
+        from IPython.display import HTML
+        def freeze(obj):
+            try:
+                pickle.dumps(obj)
+                return obj
+            except Exception:
+                if hasattr(obj, 'to_html'): return HTML(obj.to_html())
+                raise
+        result, events = value
+        frozen = [ev if ev[0] != 'display' else (ev[0], ev[1], tuple(freeze(o) for o in ev[2]), ev[3]) for ev in events]
+        return result, frozen
+
+    def _evict(self, con):
+        total = con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes: return
+        freed = 0
+        stale = []
+        for key, size in con.execute("SELECT key, size FROM results ORDER BY accessed"):
+            stale.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes: break
+        con.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def clear(self):
+        if not self.enabled: return
+        try:
+            with self._connect() as con: con.execute("DELETE FROM results")
+        except sqlite3.Error:
+            pass
+
+    def stats(self):
+        if not self.enabled: return {'rows': 0, 'bytes': 0, 'max_bytes': self.max_bytes}
+        try:
+            with self._connect() as con:
+                rows, size = con.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except sqlite3.Error:
+            rows, size = 0, 0
+        return {'rows': rows, 'bytes': size, 'max_bytes': self.max_bytes}
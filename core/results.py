@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+import pandas as pd
+
+# =================================================================================
+# 📦 RESULT RECORDS (Compute API output - no HTML, no display)
+# Engines fill these; core/render.py turns them into output. Batch callers, caches
+# and regression runners can use them directly and skip rendering altogether.
+# =================================================================================
+
+@dataclass(slots=True)
+class TeamReport:
+    """Fortress / H2H / Host Country / Region (vs one opponent) report."""
+    home_team: str
+    visitor: str                 # Opponent name, or 'Visitors' (venue mode, all opponents)
+    title: str
+    matches: int
+    tie_nr: int
+    win_rate: int                # Home win % of decided matches
+    home_wins: int
+    home_defended: int
+    home_chased: int
+    visitor_wins: int
+    visitor_defended: int
+    visitor_chased: int
+    venue_avg_1st: object        # "265 (12)" style strings, "-" when empty
+    venue_avg_2nd: object
+    venue_avg_win_1st: object
+    home_stats: dict             # _calculate_team_stats keys (avg_1st, high_1st, ... avg_fail)
+    visitor_stats: dict
+    audit: pd.DataFrame = None   # Match audit table (recent first), None if no matches
+
+    def rows(self):
+        """Legacy Metric/Value list (the return value of the analyze_* report calls)."""
+        h, v = self.home_stats, self.visitor_stats
+        return [
+            {"Metric": "Matches Played", "Value": self.matches}, # 0
+            {"Metric": "Tied / No Result", "Value": self.tie_nr}, # 1
+            {"Metric": f"{self.home_team} Win %", "Value": f"{self.win_rate}%"}, # 2
+
+            {"Metric": "--- HOME PERFORMANCE ---", "Value": ""}, # 3
+            {"Metric": "Total Wins", "Value": self.home_wins}, # 4
+            {"Metric": "Won Batting 1st (Defended)", "Value": self.home_defended}, # 5
+            {"Metric": "Won Batting 2nd (Chased)", "Value": self.home_chased}, # 6
+
+            {"Metric": "--- VISITOR PERFORMANCE ---", "Value": ""}, # 7
+            {"Metric": "Total Wins", "Value": self.visitor_wins}, # 8
+            {"Metric": "Won Batting 1st (Defended)", "Value": self.visitor_defended}, # 9
+            {"Metric": "Won Batting 2nd (Chased)", "Value": self.visitor_chased}, # 10
+
+            {"Metric": "--- VENUE AVERAGES ---", "Value": ""}, # 11
+            {"Metric": "Overall Avg 1st Innings", "Value": self.venue_avg_1st}, # 12
+            {"Metric": "Overall Avg 2nd Innings", "Value": self.venue_avg_2nd}, # 13
+            {"Metric": "Avg 1st Innings Winning Score", "Value": self.venue_avg_win_1st}, # 14
+
+            {"Metric": f"--- BATTING 1ST ({self.home_team.upper()}) ---", "Value": ""}, # 15
+            {"Metric": "Average 1st Innings", "Value": h['avg_1st']}, # 16
+            {"Metric": "Highest 1st Innings", "Value": h['high_1st']}, # 17
+            {"Metric": "Lowest 1st Innings", "Value": h['low_1st']}, # 18
+            {"Metric": "Avg Winning Score", "Value": h['avg_1st_win']}, # 19
+            {"Metric": "Lowest Defended Score", "Value": h['low_defended']}, # 20
+
+            {"Metric": f"--- BATTING 1ST ({self.visitor.upper()}) ---", "Value": ""}, # 21
+            {"Metric": "Average 1st Innings", "Value": v['avg_1st']}, # 22
+            {"Metric": "Highest 1st Innings", "Value": v['high_1st']}, # 23
+            {"Metric": "Lowest 1st Innings", "Value": v['low_1st']}, # 24
+            {"Metric": "Avg Winning Score", "Value": v['avg_1st_win']}, # 25
+            {"Metric": "Lowest Defended Score", "Value": v['low_defended']}, # 26
+
+            {"Metric": f"--- CHASING ({self.home_team.upper()}) ---", "Value": ""}, # 27
+            {"Metric": "Average 2nd Innings", "Value": h['avg_2nd']}, # 28
+            {"Metric": "Highest Chased", "Value": h['high_chased']}, # 29
+            {"Metric": "Avg Successful Chase", "Value": h['avg_succ']}, # 30
+            {"Metric": "Avg Failed Chase", "Value": h['avg_fail']}, # 31
+
+            {"Metric": f"--- CHASING ({self.visitor.upper()}) ---", "Value": ""}, # 32
+            {"Metric": "Average 2nd Innings", "Value": v['avg_2nd']}, # 33
+            {"Metric": "Highest Chased", "Value": v['high_chased']}, # 34
+            {"Metric": "Avg Successful Chase", "Value": v['avg_succ']}, # 35
+            {"Metric": "Avg Failed Chase", "Value": v['avg_fail']}, # 36
+        ]
+
+@dataclass(slots=True)
+class ScorePrediction:
+    """Projected 1st-innings range: venue par x batting strength x bowling impact, minus risk penalties."""
+    batting_team: str
+    bowling_team: str
+    venue_id: str
+    years: object
+    venue_par: int
+    venue_note: str
+    bat_factor: float
+    bowl_factor: float
+    attack: str                  # 'STRONG ATTACK' / 'AVERAGE ATTACK' / 'WEAK ATTACK'
+    capable_batters: int
+    active_bowlers: int
+    prediction: float
+    lower: int
+    upper: int
+    notes: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class ThreatMatrix:
+    """One XI's batters vs the bowling styles in the opposition squad."""
+    team: str
+    styles: dict                 # style -> [bowlers] (opposition, known styles only)
+    missing: list                # Active opposition bowlers with no style in config/teams.py
+    cells: list                  # [(batter, {style: (avg, sr)})] in XI order (styles the batter has faced)
+
+@dataclass(slots=True)
+class SquadComparison:
+    """Squad vs squad: experience, per-player form/venue rows, style threats, head-to-heads. Per-side fields are (A, B)."""
+    team_a: str
+    team_b: str
+    players_a: list
+    players_b: list
+    venue_id: str
+    years: object
+    metrics: pd.DataFrame        # squad_metrics (one row per team)
+    avg_caps: tuple              # Average caps per player
+    player_rows: tuple           # [squad_stats row + 'Role' + 'Signals' [(code, tier)]]
+    threats: tuple               # ThreatMatrix (each XI vs the other's bowlers)
+    matchups: tuple              # [(batter, DataFrame vs the other XI's bowlers)], batters with data only
+
+@dataclass(slots=True)
+class ContextCard:
+    """Player stats in one context (vs an opponent / at a venue)."""
+    title: str
+    inns: int
+    runs: int
+    avg: object
+    sr: object
+    hs: int
+    hundreds: int
+    fifties: int
+    has_bowling: bool
+    wkts: int
+    bowl_avg: object
+    econ: object
+
+@dataclass(slots=True)
+class PlayerProfile:
+    """Career summary (+ optional opponent / venue context cards) of one player."""
+    player: str
+    time_label: str
+    career: dict = None          # None if the player has no batting career rows
+    show_context: bool = False   # Opponent or venue requested -> dual card row
+    opposition: ContextCard = None
+    venue: ContextCard = None
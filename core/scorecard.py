@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from core.deliveries import add_delivery_columns
+
+class Scorecard:
+    """
+    📋 The Scorebook (v1.0 - Per-Innings Player Scorecards).
+    Built ONCE at load from the sorted raw_df. One row per (player, match):
+    - batting: runs, balls, outs (any wicket on their ball), bowler_outs, not-out flag.
+    - bowling: legal balls, runs conceded (bat + wides + no-balls), bowler wickets.
+    - Rows are grouped by player and ordered by date -> time windows are a binary search.
+    Form strings, milestones, caps, best figures and windowed averages read straight from here.
+    """
+    def __init__(self, raw_df):
+        if 'is_bowler_wicket' not in raw_df.columns:
+            # Standalone fallback: the Facade normally derives these at load
+            add_delivery_columns(raw_df)
+        n = len(raw_df)
+
+        balls = pd.DataFrame({
+            'match_id': raw_df['match_id'].astype(str).to_numpy(),
+            'pos': np.arange(n),
+            'start_date': raw_df['start_date'].to_numpy(),
+            'venue_code': raw_df['venue_id'].cat.codes.to_numpy(),
+            'batting_team': raw_df['batting_team'].to_numpy(),
+            'bowling_team': raw_df['bowling_team'].to_numpy(),
+            'striker': raw_df['striker'].to_numpy(),
+            'bowler': raw_df['bowler'].to_numpy(),
+            'runs_off_bat': raw_df['runs_off_bat'].to_numpy(),
+            'extras': raw_df['extras'].fillna(0).to_numpy(),
+            'bowler_runs': raw_df['bowler_runs'].to_numpy(),
+            'legal': raw_df['is_legal_ball'].to_numpy().astype(np.int64),
+            'is_wkt': raw_df['wicket_type'].notna().to_numpy().astype(np.int64),
+            'bowler_wkt': raw_df['is_bowler_wicket'].to_numpy().astype(np.int64),
+        })
+        context = dict(pos=('pos', 'first'), start_date=('start_date', 'first'), venue_code=('venue_code', 'first'),
+                       batting_team=('batting_team', 'first'), bowling_team=('bowling_team', 'first'))
+
+        # 1. BATTING INNINGS
+        bat = balls.groupby(['striker', 'match_id'], sort=False).agg(
+            **context, runs=('runs_off_bat', 'sum'), balls=('pos', 'size'),
+            outs=('is_wkt', 'sum'), bowler_outs=('bowler_wkt', 'sum'),
+        ).reset_index().rename(columns={'striker': 'player'})
+        bat['not_out'] = bat['outs'] == 0
+
+        # 2. BOWLING FIGURES
+        bowl = balls.groupby(['bowler', 'match_id'], sort=False).agg(
+            **context, balls=('pos', 'size'), legal_balls=('legal', 'sum'),
+            runs_off_bat=('runs_off_bat', 'sum'), extras=('extras', 'sum'),
+            runs_conceded=('bowler_runs', 'sum'), wickets=('bowler_wkt', 'sum'),
+        ).reset_index().rename(columns={'bowler': 'player'})
+
+        self.batting, self._bat_blocks, self._bat_key = self._index(bat)
+        self.bowling, self._bowl_blocks, self._bowl_key = self._index(bowl)
+
+    @staticmethod
+    def _index(df):
+        """Sort by (player, date order) and build player -> (start, stop) + (match, player) -> row."""
+        df = df.sort_values(['player', 'pos'], kind='mergesort').reset_index(drop=True)
+        players = df['player'].to_numpy()
+        if len(df):
+            change = np.flatnonzero(players[1:] != players[:-1]) + 1
+            starts = np.concatenate(([0], change)); stops = np.concatenate((change, [len(df)]))
+        else:
+            starts = stops = np.array([], dtype=np.int64)
+        blocks = {players[s]: (int(s), int(e)) for s, e in zip(starts, stops)}
+        keys = dict(zip(zip(df['match_id'].to_numpy(), players), range(len(df))))
+        return df, blocks, keys
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def _bounds(self, df, blocks, player, cutoff_date):
+        """Row range (lo, hi) of a player's innings on/after cutoff_date (NaT dates excluded)."""
+        rng = blocks.get(player)
+        if rng is None: return 0, 0
+        s, e = rng
+        dates = df['start_date'].to_numpy()[s:e]
+        lo = 0 if cutoff_date is None else np.searchsorted(dates, pd.Timestamp(cutoff_date).to_datetime64(), side='left')
+        hi = np.searchsorted(dates, np.datetime64('NaT'), side='left')
+        return s + int(lo), s + int(hi)
+
+    def _window(self, df, blocks, players, cutoff_date):
+        if isinstance(players, str):
+            lo, hi = self._bounds(df, blocks, players, cutoff_date)
+            return df.iloc[lo:hi]
+        # Many players -> one positional take (each player's block stays in date order)
+        ranges = [self._bounds(df, blocks, p, cutoff_date) for p in dict.fromkeys(players)]
+        pos = np.concatenate([np.arange(lo, hi) for lo, hi in ranges]) if ranges else np.array([], dtype=np.int64)
+        return df.iloc[pos]
+
+    def batting_innings(self, players, cutoff_date=None):
+        """Batting innings on/after cutoff_date (oldest -> newest) for one player or a list of players."""
+        return self._window(self.batting, self._bat_blocks, players, cutoff_date)
+
+    def bowling_innings(self, players, cutoff_date=None):
+        """Bowling figures on/after cutoff_date (oldest -> newest) for one player or a list of players."""
+        return self._window(self.bowling, self._bowl_blocks, players, cutoff_date)
+
+    def card_position(self, match_id, player, role='batting'):
+        """Row position of one innings in self.batting / self.bowling, or None."""
+        keys = self._bat_key if role == 'batting' else self._bowl_key
+        return keys.get((str(match_id), player))
+
+    def batting_card(self, match_id, player):
+        """One batting innings as a row (Series), or None if the player did not bat."""
+        row = self._bat_key.get((str(match_id), player))
+        return None if row is None else self.batting.iloc[row]
+
+    def bowling_card(self, match_id, player):
+        """One bowling spell as a row (Series), or None if the player did not bowl."""
+        row = self._bowl_key.get((str(match_id), player))
+        return None if row is None else self.bowling.iloc[row]
+
+    @staticmethod
+    def at_venue(innings, venue_codes):
+        """Innings rows played at any of the given venue codes (see BallIndex.venue_codes_for)."""
+        return innings[np.isin(innings['venue_code'].to_numpy(), venue_codes)]
+
+    # =================================================================================
+    # 🧮 DERIVED FIGURES
+    # =================================================================================
+
+    @staticmethod
+    def milestones(innings):
+        """(100s, 50s, HS) from batting innings rows."""
+        if innings.empty: return 0, 0, 0
+        runs = innings['runs']
+        return (runs >= 100).sum(), ((runs >= 50) & (runs < 100)).sum(), runs.max()
+
+    @staticmethod
+    def best_figures(figures):
+        """Best bowling (most wickets, then fewest runs) as 'W/R', or None without a wicket."""
+        if figures.empty or figures['wickets'].max() <= 0: return None
+        best = figures.sort_values(['wickets', 'runs_conceded'], ascending=[False, True], kind='mergesort').iloc[0]
+        return f"{int(best['wickets'])}/{int(best['runs_conceded'])}"
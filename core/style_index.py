@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import config.teams as teams_config
+from core.deliveries import add_delivery_columns
+
+class StyleIndex:
+    """
+    🎯 The Radar (v1.0 - Bowler-Style Dimension).
+    Tags every delivery with a bowler-style code from config/teams.py (BOWLER_STYLES).
+    - 'bowler_style' on raw_df: int16 code into self.styles (-1 = Unknown bowler).
+    - Batter x Style x Date aggregate (runs, balls, bowler-credited outs) -> a whole XI is one lookup.
+    - Season roll-up available via season_table().
+    - Only THIS dimension is rebuilt when BOWLER_STYLES changes (digest check on every query).
+    """
+    def __init__(self, raw_df):
+        if 'is_bowler_wicket' not in raw_df.columns: add_delivery_columns(raw_df)
+        self.raw_df = raw_df
+        self._digest = None
+        self.refresh()
+
+    @staticmethod
+    def _styles_digest(bowler_styles):
+        return hash(tuple(sorted(bowler_styles.items())))
+
+    def refresh(self, force=False):
+        """(Re)builds the style codes + aggregate if BOWLER_STYLES changed since the last build."""
+        bowler_styles = teams_config.BOWLER_STYLES
+        digest = self._styles_digest(bowler_styles)
+        if digest == self._digest and not force: return False
+
+        # 1. STYLE CODES PER DELIVERY
+        self.bowler_styles = dict(bowler_styles)
+        self.styles = sorted(set(self.bowler_styles.values()))
+        style_code = {s: i for i, s in enumerate(self.styles)}
+        bowler_code = {b: style_code[s] for b, s in self.bowler_styles.items()}
+        codes = self.raw_df['bowler'].map(bowler_code).fillna(-1).astype(np.int16)
+        self.raw_df['bowler_style'] = codes
+
+        # 2. BATTER x STYLE x DATE AGGREGATE (Known styles only, sorted by date)
+        known = self.raw_df[codes.to_numpy() >= 0]
+        self.table = pd.DataFrame({
+            'batter': known['striker'].to_numpy(),
+            'style': known['bowler_style'].to_numpy(),
+            'start_date': known['start_date'].to_numpy(),
+            'season': known['season'].to_numpy(),
+            'runs': known['runs_off_bat'].to_numpy(),
+            'outs': known['is_bowler_wicket'].to_numpy().astype(np.int64),
+        }).groupby(['start_date', 'batter', 'style'], sort=True).agg(
+            season=('season', 'first'), runs=('runs', 'sum'), balls=('runs', 'size'), outs=('outs', 'sum')
+        ).reset_index()
+        self._dates = self.table['start_date'].to_numpy()
+        self._digest = digest
+        return True
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def style_of(self, bowler):
+        self.refresh()
+        return self.bowler_styles.get(bowler, 'Unknown')
+
+    def batters_vs_styles(self, batters, cutoff_date=None):
+        """
+        Runs / Balls / Outs of each batter vs each bowling style on/after cutoff_date.
+        Returns a DataFrame indexed by (batter, style name).
+        """
+        self.refresh()
+        lo = 0 if cutoff_date is None else int(np.searchsorted(self._dates, pd.Timestamp(cutoff_date).to_datetime64(), side='left'))
+        rows = self.table.iloc[lo:]
+        rows = rows[rows['batter'].isin(batters)]
+        out = rows.groupby(['batter', 'style'])[['runs', 'balls', 'outs']].sum().reset_index()
+        out['style'] = [self.styles[c] for c in out['style']]
+        return out.set_index(['batter', 'style'])
+
+    def season_table(self):
+        """Batter x Style x Season roll-up (style names)."""
+        self.refresh()
+        out = self.table.groupby(['batter', 'style', 'season'])[['runs', 'balls', 'outs']].sum().reset_index()
+        out['style'] = [self.styles[c] for c in out['style']]
+        return out
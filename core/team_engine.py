@@ -1,56 +1,106 @@
 import pandas as pd
 import numpy as np
-import os
-from IPython.display import display, HTML
-from venues import VENUE_MAP
+from functools import lru_cache
+from venues import CONTINENTS, COUNTRY_CONTINENT
+from core.venue_registry import VENUE_REGISTRY
 from config.teams import TEAM_COLORS
+from core.window_cache import window_cutoff
+from core.match_status import (
+    add_match_status, status_labels, STATUS_INCLUDED, STATUS_NO_RESULT, VALID_1ST_STATUSES,
+    WINNER_TIE, WINNER_NO_RESULT
+)
+from core.phase_store import PhaseStore
+from core.team_view import build_team_view, RESULT_WIN, RESULT_TIE, RESULT_NO_RESULT
+from core.match_index import MatchFilter, MatchIndex
+from core.results import TeamReport
+from core.report_batch import ReportBatch
+from core.render import HtmlRenderer
 
 class TeamEngine:
     """
     🦁 The War Room.
     Handles Team-Level Analysis: Fortress Checks, H2H, Dominance, and Form.
     """
-    def __init__(self, match_df):
+    VENUE_CACHE = 1024
+
+    def __init__(self, match_df, team_view=None, renderer=None, match_index=None, memo=None):
         self.match_df = match_df
+        # Output layer (core/render.py): HtmlRenderer inline, NullRenderer for compute-only callers
+        self.renderer = renderer if renderer is not None else HtmlRenderer()
+        # Result cache for compute records (facade): analyze_* render a cached TeamReport, nothing is captured
+        self.memo = memo
+        # Status / Winner codes are normally computed when match_df is built
+        if 'status_code' not in match_df.columns: add_match_status(match_df)
+        # One row per (match, team), indexed by team -> team reports are index slices
+        self.team_view = team_view if team_view is not None else build_team_view(match_df)
+        # Bitmap indexes (team / opponent / venue / country / continent / season) -> a filter is one query
+        self.match_index = match_index if match_index is not None else MatchIndex(match_df, self.team_view)
+        self._venue_lookups = lru_cache(maxsize=self.VENUE_CACHE)(self._lookup_venue) # Bounded: every typed venue is a key
+        # processed_phase_stats.csv, loaded on first use and kept in memory
+        self.phase_store = PhaseStore(match_df)
+        
+        # Team Vocabulary (Normalised name -> code, shared by bat1/bat2/winner codes)
+        pairs = zip(pd.concat([match_df['team_bat_1'], match_df['team_bat_2']]).astype(str),
+                    pd.concat([match_df['bat1_code'], match_df['bat2_code']]))
+        self._team_codes = {t.lower().strip(): int(c) for t, c in pairs}
 
     # =================================================================================
     # 🔧 CORE HELPERS
     # =================================================================================
 
-    def _apply_smart_filters(self, df):
+    def _compute(self, fn, *args):
+        """Compute API call through the facade's result cache when one is attached (memo=...)."""
+        return self.memo(fn, *args) if self.memo is not None else fn(*args)
+
+    def _code(self, team):
+        """Team name -> team code (-9 if the team never played)."""
+        return self._team_codes.get(str(team).lower().strip(), -9)
+
+    def query(self, spec):
+        """match_df records of a MatchFilter (core/match_index.py): bitmap intersections + one gather."""
+        return self.match_index.matches(spec)
+
+    def _team_rows(self, team, cutoff_date=None, opp_team='All', **filters):
+        """Team-view rows of one team, optionally on/after cutoff_date, vs one opponent and any other MatchFilter field."""
+        spec = MatchFilter(team=team, opponent=None if opp_team == 'All' else opp_team, since=cutoff_date, **filters)
+        return self.match_index.team_rows(spec)
+
+    def _matches(self, rows):
+        """Full match_df records for team-view rows (same order as the rows)."""
+        return self.match_df.iloc[rows['row'].to_numpy()]
+
+    def _fortress_filter(self, stadium_name, home_team, opp_team='All', years_back=10):
+        # 1-tuple: an unresolvable venue (None) matches nothing instead of dropping the venue filter
+        return MatchFilter(team=home_team, opponent=None if opp_team == 'All' else opp_team,
+                           venue=(VENUE_REGISTRY.resolve_contained(stadium_name),), since=window_cutoff(years_back))
+
+    def _h2h_filter(self, home_team, opp_team, years_back=5):
+        return MatchFilter(team=home_team, opponent=None if opp_team == 'All' else opp_team, since=window_cutoff(years_back))
+
+    def _country_filter(self, home_team, opp_team, country_name, years_back=10):
+        """Registry country -> host_country, anything else -> venues whose name contains the text."""
+        where = {'host_country': country_name} if country_name in COUNTRY_CONTINENT else {'venue_text': country_name}
+        return MatchFilter(team=home_team, opponent=None if opp_team == 'All' else opp_team, since=window_cutoff(years_back), **where)
+
+    def _resolve_venue(self, stadium_name):
         """
-        Smart Filter v2.1 🧠 (D/L Safe)
-        - Excludes 'No Result'
-        - Excludes Short Innings (< 45 Overs) unless Team is All Out.
-        - UPDATED: Detects matches where BOTH innings are short.
+        User venue string -> venue name as stored on match_df (None if unknown).
+        Exact -> Registry alias (e.g. 'Eden Gardens' -> 'IND_KOLKATA') -> first venue containing the text.
         """
-        # 1. Default Status
-        df['status'] = '✅ Included'
-        
-        # 2. Check for explicit No Result / Abandoned
-        if 'winner' in df.columns:
-            winners = df['winner'].astype(str).str.lower().str.strip()
-            mask_nr = winners.isin(['no result', 'nan', 'none', ''])
-            df.loc[mask_nr, 'status'] = '☔ Excluded (No Result)'
-        
-        # --- DEFINE CONDITIONS ---
-        # Condition A: Short 1st Innings (< 45 ov & not all out)
-        is_short_1 = (df['balls_inn1'] < 270) & (df['wickets_inn1'] < 10)
-        
-        # Condition B: Short 2nd Innings (< 45 ov & not all out & not natural win)
-        nat_win = (df['winner'] == df['team_bat_2']) & (df['score_inn2'] > df['score_inn1'])
-        is_short_2 = (df['balls_inn2'] < 270) & (df['wickets_inn2'] < 10) & (~nat_win)
-        
-        # --- APPLY STATUS ---
-        
-        # 3. Apply individual flags first
-        df.loc[is_short_1, 'status'] = '☔ Excluded (Short 1st)'
-        df.loc[is_short_2, 'status'] = '☔ Excluded (Short 2nd)'
-        
-        # 4. Apply "Both Short" flag (Overwrites the specific ones)
-        df.loc[is_short_1 & is_short_2, 'status'] = '☔ Excluded'
-        
-        return df
+        if self.match_index.has_venue(stadium_name): return stadium_name
+        return self._venue_lookups(stadium_name)
+
+    def _lookup_venue(self, stadium_name):
+        hit = VENUE_REGISTRY.master_id(stadium_name)
+        if self.match_index.has_venue(hit): return hit
+        needle = str(stadium_name).lower()
+        return next((v for v in self.match_index.venues if needle in str(v).lower()), None)
+
+    def _venue_matches(self, venue, cutoff_date=None):
+        """match_df rows at a venue on/after cutoff_date (oldest -> newest, undated matches left out)."""
+        rows = self.match_index.select(MatchFilter(venue=venue, since=pd.Timestamp.min if cutoff_date is None else cutoff_date))
+        rows = rows[np.argsort(self.match_df['start_date'].to_numpy()[rows], kind='stable')]
+        return self.match_df.iloc[rows]
 
     def _get_avg_with_count(self, df, col):
         if df.empty or col not in df.columns: return "-"
@@ -61,11 +111,11 @@ class TeamEngine:
     def _get_form_guide(self, df, team):
         if df.empty: return "-"
         res = []
-        for _, r in df.sort_values('start_date', ascending=False).head(5).iterrows():
-            w = str(r['winner']).lower(); t = team.lower()
+        t = self._code(team)
+        for w in df.sort_values('start_date', ascending=False).head(5)['winner_code']:
             if w == t: res.append("✅")
-            elif w == 'tie': res.append("🤝")
-            elif w in ['nan', 'no result']: res.append("🌧️")
+            elif w == WINNER_TIE: res.append("🤝")
+            elif w == WINNER_NO_RESULT: res.append("🌧️")
             else: res.append("❌")
         return " ".join(res)
 
@@ -79,27 +129,22 @@ class TeamEngine:
         def get_val(s, func): return int(func(s)) if not s.empty and not pd.isna(func(s)) else "-"
         
         # 1. Define Valid Subsets (PRESERVED)
-        valid_1st_mask = df['status'].isin(['✅ Included', '☔ Excluded (Short 2nd)'])
-        valid_2nd_mask = df['status'] == '✅ Included'
+        valid_1st_mask = df['status_code'].isin(VALID_1ST_STATUSES)
+        valid_2nd_mask = df['status_code'] == STATUS_INCLUDED
 
-        # 2. Filter for Team (PRESERVED)
+        # 2. Filter for Team (Team codes, 'home_team_ref' holds the home team's code)
         if is_home_analysis and team == 'Visitors':
-            bat1 = df[(df['team_bat_1'] != df['home_team_ref']) & valid_1st_mask]
-            bat2 = df[(df['team_bat_2'] != df['home_team_ref']) & valid_2nd_mask]
-        else:
-            bat1 = df[(df['team_bat_1'] == team) & valid_1st_mask]
-            bat2 = df[(df['team_bat_2'] == team) & valid_2nd_mask]
-            
-        # 3. Winning Stats (PRESERVED)
-        if 'is_defended' in df.columns:
-            w1 = bat1[bat1['is_defended'] == True]
-            w2 = bat2[bat2['is_chased'] == True]
+            bat1 = df[(df['bat1_code'] != df['home_team_ref']) & valid_1st_mask]
+            bat2 = df[(df['bat2_code'] != df['home_team_ref']) & valid_2nd_mask]
         else:
-            w1 = bat1[bat1['winner'] == bat1['team_bat_1']]
-            w2 = bat2[bat2['winner'] == bat2['team_bat_2']]
+            t = self._code(team)
+            bat1 = df[(df['bat1_code'] == t) & valid_1st_mask]
+            bat2 = df[(df['bat2_code'] == t) & valid_2nd_mask]
             
-        if 'is_chased' in df.columns: l2 = bat2[bat2['is_chased'] == False]
-        else: l2 = bat2[bat2['winner'] != bat2['team_bat_2']]
+        # 3. Winning Stats (Normalised winner code)
+        w1 = bat1[bat1['winner_code'] == bat1['bat1_code']]
+        w2 = bat2[bat2['winner_code'] == bat2['bat2_code']]
+        l2 = bat2[bat2['winner_code'] != bat2['bat2_code']]
 
         # 🚀 4. SMART FILTER: Competitive 2nd Innings (NEW ADDITION)
         # We assume if the row is in 'w2', it was a win.
@@ -126,145 +171,59 @@ class TeamEngine:
             'avg_fail': self._get_avg_with_count(l2, 'score_inn2')
         }
 
-    # =================================================================================
-    # 🎨 NEW GRID-BASED DISPLAY ENGINE (UPDATED WITH ALL METRICS)
-    # =================================================================================
-
-    # =================================================================================
-    # 🎨 NEW GRID-BASED DISPLAY ENGINE (FULL METRICS RESTORED)
-    # =================================================================================
-
-    def _display_report(self, data, t1, t2, title):
-        """
-        Displays the report in a Modern Grid Layout.
-        RESTORED: Win %, Win Breakdown (Defended/Chased) for each team.
-        """
-        # Parse Data into a List of Values for direct indexing
-        d = [x['Value'] for x in data] 
-        
-        # Get Colors
-        c1 = TEAM_COLORS.get(t1, "#333")
-        c2 = TEAM_COLORS.get(t2, "#333")
-
-        html_fixed = f"""
-        <style>
-            .dashboard-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 15px; font-family: sans-serif; margin-bottom: 20px; }}
-            .card {{ background: #f8f9fa; border: 1px solid #ddd; border-radius: 8px; padding: 12px; box-shadow: 0 2px 4px rgba(0,0,0,0.05); }}
-            .stat-row {{ display: flex; justify-content: space-between; font-size: 13px; margin-bottom: 5px; border-bottom: 1px dashed #eee; }}
-            .stat-val {{ font-weight: bold; color: #333; }}
-            .section-title {{ font-size: 11px; font-weight: bold; color: #666; margin-top: 10px; margin-bottom: 5px; text-transform: uppercase; border-bottom: 1px solid #ccc; }}
-            .win-stats {{ display: flex; justify-content: space-between; background: #e9ecef; padding: 5px; border-radius: 4px; font-size: 12px; margin-bottom: 10px; }}
-        </style>
-
-        <h3 style="margin:0 0 10px 0;">📊 {title}</h3>
-
-        <div class="dashboard-grid">
-            <div class="card" style="grid-column: span 2; display:flex; justify-content:space-around; text-align:center;">
-                <div><div style="font-size:20px; font-weight:bold;">{d[0]}</div><div style="font-size:10px; color:#666;">MATCHES</div></div>
-                <div><div style="font-size:20px; font-weight:bold; color:{c1}">{d[2]}</div><div style="font-size:10px; color:#666;">{t1} WIN %</div></div>
-                <div><div style="font-size:20px; font-weight:bold;">{d[1]}</div><div style="font-size:10px; color:#666;">TIE/NR</div></div>
-            </div>
-
-            <div class="card" style="border-top: 3px solid {c1}">
-                <div style="font-weight:bold; color:{c1}; font-size:16px; margin-bottom:5px;">{t1.upper()}</div>
-                
-                <div class="win-stats">
-                    <span>🏆 <b>{d[4]}</b> Wins</span>
-                    <span>🛡️ <b>{d[5]}</b> Def</span>
-                    <span>🎯 <b>{d[6]}</b> Chs</span>
-                </div>
-
-                <div class="section-title">Batting 1st</div>
-                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[16]}</span></div>
-                <div class="stat-row"><span>High / Low:</span> <span class="stat-val">{d[17]} / {d[18]}</span></div>
-                <div class="stat-row"><span>Avg Win Score:</span> <span class="stat-val">{d[19]}</span></div>
-                <div class="stat-row"><span>Lowest Defended:</span> <span class="stat-val">{d[20]}</span></div>
-
-                <div class="section-title">Chasing</div>
-                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[28]}</span></div>
-                <div class="stat-row"><span>Highest Chased:</span> <span class="stat-val">{d[29]}</span></div>
-                <div class="stat-row"><span>Avg Succ. Chase:</span> <span class="stat-val">{d[30]}</span></div>
-                <div class="stat-row"><span>Avg Fail Chase:</span> <span class="stat-val">{d[31]}</span></div>
-            </div>
-
-            <div class="card" style="border-top: 3px solid {c2}">
-                <div style="font-weight:bold; color:{c2}; font-size:16px; margin-bottom:5px;">{t2.upper()}</div>
-                
-                <div class="win-stats">
-                    <span>🏆 <b>{d[8]}</b> Wins</span>
-                    <span>🛡️ <b>{d[9]}</b> Def</span>
-                    <span>🎯 <b>{d[10]}</b> Chs</span>
-                </div>
-
-                <div class="section-title">Batting 1st</div>
-                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[22]}</span></div>
-                <div class="stat-row"><span>High / Low:</span> <span class="stat-val">{d[23]} / {d[24]}</span></div>
-                <div class="stat-row"><span>Avg Win Score:</span> <span class="stat-val">{d[25]}</span></div>
-                <div class="stat-row"><span>Lowest Defended:</span> <span class="stat-val">{d[26]}</span></div>
-
-                <div class="section-title">Chasing</div>
-                <div class="stat-row"><span>Avg Score:</span> <span class="stat-val">{d[33]}</span></div>
-                <div class="stat-row"><span>Highest Chased:</span> <span class="stat-val">{d[34]}</span></div>
-                <div class="stat-row"><span>Avg Succ. Chase:</span> <span class="stat-val">{d[35]}</span></div>
-                <div class="stat-row"><span>Avg Fail Chase:</span> <span class="stat-val">{d[36]}</span></div>
-            </div>
-            
-            <div class="card" style="grid-column: span 2; background:#eef2f5;">
-                <div style="font-weight:bold; color:#444; margin-bottom:8px; text-align:center;">🏟️ VENUE AVERAGES</div>
-                <div style="display:flex; justify-content:space-around;">
-                     <div><span>1st Inn Avg:</span> <b>{d[12]}</b></div>
-                     <div><span>2nd Inn Avg:</span> <b>{d[13]}</b></div>
-                     <div><span>Avg Winning Score:</span> <b>{d[14]}</b></div>
-                </div>
-            </div>
-        </div>
-        """
-        display(HTML(html_fixed))
-
-    def _display_audit(self, df, team):
-        if df.empty: return
-        print("\n🕵️‍♂️ MATCH AUDIT (Recent First)")
+    def _audit_frame(self, df, show_status=True):
+        """Match audit table (recent first). None if there are no matches."""
+        if df.empty: return None
+        # Status labels come from the precomputed codes
+        if show_status and 'status_code' in df.columns: df = df.assign(status=status_labels(df))
         # Robust column check
         c1 = 'display_inn1' if 'display_inn1' in df.columns else 'score_inn1'
         c2 = 'display_inn2' if 'display_inn2' in df.columns else 'score_inn2'
         cols = [c for c in ['start_date', 'venue', 'winner', 'team_bat_1', c1, 'team_bat_2', c2, 'status'] if c in df.columns]
-        
-        with pd.option_context('display.max_rows', None):
-            display(df[cols].sort_values('start_date', ascending=False).rename(columns={c1: '1st Inn', c2: '2nd Inn'}))
+        return df[cols].sort_values('start_date', ascending=False).rename(columns={c1: '1st Inn', c2: '2nd Inn'})
+
+    def _display_audit(self, df, show_status=True):
+        self.renderer.audit(self._audit_frame(df, show_status))
 
     def _build_and_display_report(self, df, home_team, visitor_label, title, is_venue_mode):
+        report = self.team_report(df, home_team, visitor_label, title, is_venue_mode)
+        self.renderer.team_report(report)
+        return report.rows()  # <--- RETURN DATA FOR TESTING
+
+    def team_report(self, df, home_team, visitor_label, title, is_venue_mode):
+        """Win split, Batting 1st / Chasing stats per side and venue averages of the matches in df (TeamReport)."""
         matches = len(df)
-        w = df['winner'].astype(str).str.lower().str.strip()
-        h_clean = home_team.lower().strip()
-        h_wins = len(df[w == h_clean])
-        tie_nr = len(df[w.isin(['tie','no result','nan','none'])])
+        wc = df['winner_code']
+        h = self._code(home_team)
+        is_tie_nr = wc.isin([WINNER_TIE, WINNER_NO_RESULT])
+        h_wins = int((wc == h).sum())
+        tie_nr = int(is_tie_nr.sum())
         
         if visitor_label == 'Visitors':
             v_wins = matches - h_wins - tie_nr
-            vis_wins_df = df[(w != h_clean) & (~w.isin(['tie','no result','nan','none']))]
+            vis_wins_df = df[(wc != h) & (~is_tie_nr)]
         else:
-            v_clean = visitor_label.lower().strip()
-            v_wins = len(df[w == v_clean])
-            vis_wins_df = df[w == v_clean]
+            v = self._code(visitor_label)
+            v_wins = int((wc == v).sum())
+            vis_wins_df = df[wc == v]
         
-        home_wins_df = df[w == h_clean]
-        h_win_bat1 = len(home_wins_df[home_wins_df['team_bat_1'] == home_team])
-        h_win_bat2 = len(home_wins_df[home_wins_df['team_bat_2'] == home_team])
+        home_wins_df = df[wc == h]
+        h_win_bat1 = int((home_wins_df['bat1_code'] == h).sum())
+        h_win_bat2 = int((home_wins_df['bat2_code'] == h).sum())
         
         if visitor_label == 'Visitors':
-            v_win_bat1 = len(vis_wins_df[vis_wins_df['team_bat_2'] == home_team]) 
-            v_win_bat2 = len(vis_wins_df[vis_wins_df['team_bat_1'] == home_team])
+            v_win_bat1 = int((vis_wins_df['bat2_code'] == h).sum()) 
+            v_win_bat2 = int((vis_wins_df['bat1_code'] == h).sum())
         else:
-            v_win_bat1 = len(vis_wins_df[vis_wins_df['team_bat_1'] == visitor_label])
-            v_win_bat2 = len(vis_wins_df[vis_wins_df['team_bat_2'] == visitor_label])
+            v_win_bat1 = int((vis_wins_df['bat1_code'] == v).sum())
+            v_win_bat2 = int((vis_wins_df['bat2_code'] == v).sum())
 
         dec = matches - tie_nr
         rate = int((h_wins/dec)*100) if dec > 0 else 0
         
         # 🚨 KEY CHANGE: Pass FULL dataframe with statuses to `_calculate_team_stats`
         # Also need `home_team_ref` for visitor logic
-        df_for_stats = df.copy()
-        if is_venue_mode: df_for_stats['home_team_ref'] = home_team
+        df_for_stats = df.assign(home_team_ref=h) if is_venue_mode else df
         
         h_stats = self._calculate_team_stats(df_for_stats, home_team)
         v_stats = self._calculate_team_stats(df_for_stats, visitor_label, is_home_analysis=is_venue_mode)
@@ -272,142 +231,145 @@ class TeamEngine:
         # For Overall Venue Stats:
         # Valid 1st: Included + Short 2nd
         # Valid 2nd: Included only
-        valid_1st = df[df['status'].isin(['✅ Included', '☔ Excluded (Short 2nd)'])]
-        valid_2nd = df[df['status'] == '✅ Included']
+        valid_1st = df[df['status_code'].isin(VALID_1ST_STATUSES)]
+        valid_2nd = df[df['status_code'] == STATUS_INCLUDED]
+        
+        return TeamReport(
+            home_team=home_team, visitor=visitor_label, title=title,
+            matches=matches, tie_nr=tie_nr, win_rate=rate,
+            home_wins=h_wins, home_defended=h_win_bat1, home_chased=h_win_bat2,
+            visitor_wins=v_wins, visitor_defended=v_win_bat1, visitor_chased=v_win_bat2,
+            venue_avg_1st=self._get_avg_with_count(valid_1st, 'score_inn1'),
+            venue_avg_2nd=self._get_avg_with_count(valid_2nd, 'score_inn2'),
+            venue_avg_win_1st=self._get_avg_with_count(valid_1st[valid_1st['winner_code']==valid_1st['bat1_code']], 'score_inn1'),
+            home_stats=h_stats, visitor_stats=v_stats, audit=self._audit_frame(df),
+        )
+
+    MATRIX_TEAMS = ['India', 'Australia', 'England', 'South Africa', 'New Zealand', 'Pakistan', 'Sri Lanka', 'West Indies', 'Bangladesh', 'Afghanistan']
+
+    def _matrix_records(self, matches, team_name):
+        """
+        Opponent Matrix as ONE grouped aggregation (no per-opponent filtering).
+        Returns a DataFrame: OVERALL row + one row per top-10 opponent (sorted by matches).
+        """
+        t = self._code(team_name)
+        wc = matches['winner_code'].to_numpy()
+        bat1 = matches['bat1_code'].to_numpy() == t
+        opp_code = np.where(bat1, matches['bat2_code'].to_numpy(), matches['bat1_code'].to_numpy())
+        
+        f = pd.DataFrame({
+            'opponent': np.where(bat1, matches['team_bat_2'].to_numpy(), matches['team_bat_1'].to_numpy()),
+            'start_date': matches['start_date'].to_numpy(),
+            'won': wc == t,
+            'lost': wc == opp_code,
+            'lost_any': (wc != t) & ~np.isin(wc, [WINNER_TIE, WINNER_NO_RESULT]),
+            'form': np.select([wc == t, wc == WINNER_TIE, wc == WINNER_NO_RESULT], ["✅", "🤝", "🌧️"], "❌"),
+            # 1st-innings scores of VALID matches only, split by who batted first (NaN = not counted)
+            'own_1st': np.where((matches['status_code'].to_numpy() == STATUS_INCLUDED) & bat1, matches['score_inn1'].to_numpy(), np.nan),
+            'opp_1st': np.where((matches['status_code'].to_numpy() == STATUS_INCLUDED) & ~bat1, matches['score_inn1'].to_numpy(), np.nan),
+        })
+        f = f[f['opponent'].isin(self.MATRIX_TEAMS)]
+        
+        def avg_with_count(total, n):
+            return [f"{int(s / c)} ({int(c)})" if c > 0 else "-" for s, c in zip(total, n)]
+        
+        # 1. PER OPPONENT (Single group-by)
+        recent = f.sort_values('start_date', ascending=False, kind='stable')
+        form = recent.groupby('opponent', sort=False).head(5).groupby('opponent', sort=False)['form'].agg(" ".join)
+        agg = f.groupby('opponent', sort=False).agg(
+            Mat=('won', 'size'), Won=('won', 'sum'), Lost=('lost', 'sum'),
+            own_sum=('own_1st', 'sum'), own_n=('own_1st', 'count'), opp_sum=('opp_1st', 'sum'), opp_n=('opp_1st', 'count'),
+        )
+        # Keep the fixed Top-10 order before the (stable) sort by matches
+        agg = agg.reindex([o for o in self.MATRIX_TEAMS if o in agg.index and o != team_name])
+        
+        def frame(label, mat, won, lost, form_str, own_sum, own_n, opp_sum, opp_n):
+            tie_nr = mat - won - lost
+            dec = mat - tie_nr
+            pct = np.where(dec > 0, (won / np.where(dec > 0, dec, 1) * 100).astype(int), 0)
+            return pd.DataFrame({
+                'Opponent': label, 'Mat': mat, 'Won': won, 'Lost': lost, 'Tie/NR': tie_nr, 'Win %': [f"{p}%" for p in pct],
+                'Last 5': form_str,
+                f'{team_name} Avg (1st)': avg_with_count(own_sum, own_n),
+                'Opp Avg (1st)': avg_with_count(opp_sum, opp_n),
+            })
         
-        data = [
-            {"Metric": "Matches Played", "Value": matches}, # 0
-            {"Metric": "Tied / No Result", "Value": tie_nr}, # 1
-            {"Metric": f"{home_team} Win %", "Value": f"{rate}%"}, # 2
-            
-            {"Metric": "--- HOME PERFORMANCE ---", "Value": ""}, # 3
-            {"Metric": "Total Wins", "Value": h_wins}, # 4
-            {"Metric": "Won Batting 1st (Defended)", "Value": h_win_bat1}, # 5
-            {"Metric": "Won Batting 2nd (Chased)", "Value": h_win_bat2}, # 6
-            
-            {"Metric": "--- VISITOR PERFORMANCE ---", "Value": ""}, # 7
-            {"Metric": "Total Wins", "Value": v_wins}, # 8
-            {"Metric": "Won Batting 1st (Defended)", "Value": v_win_bat1}, # 9
-            {"Metric": "Won Batting 2nd (Chased)", "Value": v_win_bat2}, # 10
-
-            {"Metric": "--- VENUE AVERAGES ---", "Value": ""}, # 11
-            {"Metric": "Overall Avg 1st Innings", "Value": self._get_avg_with_count(valid_1st, 'score_inn1')}, # 12
-            {"Metric": "Overall Avg 2nd Innings", "Value": self._get_avg_with_count(valid_2nd, 'score_inn2')}, # 13
-            {"Metric": "Avg 1st Innings Winning Score", "Value": self._get_avg_with_count(valid_1st[valid_1st['winner']==valid_1st['team_bat_1']], 'score_inn1')}, # 14
-
-            {"Metric": f"--- BATTING 1ST ({home_team.upper()}) ---", "Value": ""}, # 15
-            {"Metric": "Average 1st Innings", "Value": h_stats['avg_1st']}, # 16
-            {"Metric": "Highest 1st Innings", "Value": h_stats['high_1st']}, # 17
-            {"Metric": "Lowest 1st Innings", "Value": h_stats['low_1st']}, # 18
-            {"Metric": "Avg Winning Score", "Value": h_stats['avg_1st_win']}, # 19
-            {"Metric": "Lowest Defended Score", "Value": h_stats['low_defended']}, # 20
-            
-            {"Metric": f"--- BATTING 1ST ({visitor_label.upper()}) ---", "Value": ""}, # 21
-            {"Metric": "Average 1st Innings", "Value": v_stats['avg_1st']}, # 22
-            {"Metric": "Highest 1st Innings", "Value": v_stats['high_1st']}, # 23
-            {"Metric": "Lowest 1st Innings", "Value": v_stats['low_1st']}, # 24
-            {"Metric": "Avg Winning Score", "Value": v_stats['avg_1st_win']}, # 25
-            {"Metric": "Lowest Defended Score", "Value": v_stats['low_defended']}, # 26
-            
-            {"Metric": f"--- CHASING ({home_team.upper()}) ---", "Value": ""}, # 27
-            {"Metric": "Average 2nd Innings", "Value": h_stats['avg_2nd']}, # 28
-            {"Metric": "Highest Chased", "Value": h_stats['high_chased']}, # 29
-            {"Metric": "Avg Successful Chase", "Value": h_stats['avg_succ']}, # 30
-            {"Metric": "Avg Failed Chase", "Value": h_stats['avg_fail']}, # 31
-            
-            {"Metric": f"--- CHASING ({visitor_label.upper()}) ---", "Value": ""}, # 32
-            {"Metric": "Average 2nd Innings", "Value": v_stats['avg_2nd']}, # 33
-            {"Metric": "Highest Chased", "Value": v_stats['high_chased']}, # 34
-            {"Metric": "Avg Successful Chase", "Value": v_stats['avg_succ']}, # 35
-            {"Metric": "Avg Failed Chase", "Value": v_stats['avg_fail']}, # 36
-        ]
-        self._display_report(data, home_team, visitor_label, title)
-        self._display_audit(df, home_team)
-        return data  # <--- RETURN DATA FOR TESTING
+        df = frame(list(agg.index), agg['Mat'].to_numpy(), agg['Won'].to_numpy().astype(int), agg['Lost'].to_numpy().astype(int),
+                   list(form.reindex(agg.index)), agg['own_sum'].to_numpy(), agg['own_n'].to_numpy(), agg['opp_sum'].to_numpy(), agg['opp_n'].to_numpy())
+        df = df.sort_values('Mat', ascending=False)
+        
+        # 2. OVERALL (vs Top 10)
+        ov = frame(['⚡ OVERALL'], np.array([len(f)]), np.array([int(f['won'].sum())]), np.array([int(f['lost_any'].sum())]),
+                   [" ".join(recent['form'].head(5)) if len(f) else "-"],
+                   [f['own_1st'].sum()], [f['own_1st'].count()], [f['opp_1st'].sum()], [f['opp_1st'].count()])
+        return pd.concat([ov, df], ignore_index=True) if not df.empty else ov
 
-    def _generate_matrix_report(self, matches, team_name, title, is_away=False):
+    def _generate_matrix_report(self, matches, team_name, title):
         """Helper for Matrix Reports (Global, Dominance, Away)"""
-        clean = self._apply_smart_filters(matches)
-        valid = clean[clean['status'] == '✅ Included'].copy()
-        
-        def get_opp(row): return row['team_bat_2'] if row['team_bat_1'] == team_name else row['team_bat_1']
-        clean['opponent'] = clean.apply(get_opp, axis=1)
-        valid['opponent'] = valid.apply(get_opp, axis=1)
-        
-        top_teams = ['India', 'Australia', 'England', 'South Africa', 'New Zealand', 'Pakistan', 'Sri Lanka', 'West Indies', 'Bangladesh', 'Afghanistan']
-        opponents = [t for t in top_teams if t != team_name]
-        
-        stats = []
-        for opp in opponents:
-            full = clean[clean['opponent'] == opp]; val = valid[valid['opponent'] == opp]
-            if full.empty: continue
-            
-            wins = len(full[full['winner'] == team_name])
-            loss = len(full[full['winner'] == opp])
-            tie_nr = len(full) - wins - loss
-            dec = len(full) - tie_nr
-            pct = int((wins/dec)*100) if dec > 0 else 0
-            
-            stats.append({
-                'Opponent': opp, 'Mat': len(full), 'Won': wins, 'Lost': loss, 'Tie/NR': tie_nr, 'Win %': f"{pct}%",
-                'Last 5': self._get_form_guide(full, team_name),
-                f'{team_name} Avg (1st)': self._get_avg_with_count(val[val['team_bat_1'] == team_name], 'score_inn1'),
-                'Opp Avg (1st)': self._get_avg_with_count(val[val['team_bat_1'] != team_name], 'score_inn1')
-            })
-            
-        df = pd.DataFrame(stats).sort_values('Mat', ascending=False)
-        
-        top_full = clean[clean['opponent'].isin(top_teams)]
-        top_val = valid[valid['opponent'].isin(top_teams)]
-        t_w = len(top_full[top_full['winner'] == team_name])
-        
-        w_low = top_full['winner'].astype(str).str.lower().str.strip()
-        t_low = team_name.lower().strip()
-        is_loss = (w_low != t_low) & (~w_low.isin(['tie','no result','nan','none']))
-        t_l = len(top_full[is_loss])
-        
-        t_nr = len(top_full) - t_w - t_l
-        t_dec = len(top_full) - t_nr
-        t_pct = int((t_w/t_dec)*100) if t_dec > 0 else 0
-        
-        ov = pd.DataFrame([{
-            'Opponent': '⚡ OVERALL', 'Mat': len(top_full), 'Won': t_w, 'Lost': t_l, 'Tie/NR': t_nr, 'Win %': f"{t_pct}%",
-            'Last 5': self._get_form_guide(top_full, team_name),
-            f'{team_name} Avg (1st)': self._get_avg_with_count(top_val[top_val['team_bat_1'] == team_name], 'score_inn1'),
-            'Opp Avg (1st)': self._get_avg_with_count(top_val[top_val['team_bat_1'] != team_name], 'score_inn1')
-        }])
-        
-        final_df = pd.concat([ov, df], ignore_index=True)
-        print(f"\n📊 {title}")
-        display(final_df.style.hide(axis='index'))
-        self._display_audit(matches, team_name)
+        final_df = self._matrix_records(matches, team_name)
+        self.renderer.text(f"\n📊 {title}")
+        self.renderer.table(final_df.style.hide(axis='index'))
+        self._display_audit(matches)
         return final_df.to_dict(orient='records')
 
+    def team_matrices(self, teams=None, years_back=5):
+        """
+        Global Performance Matrices for many teams at once (No display).
+        Returns {team: records} with the same records as analyze_global_performance.
+        """
+        teams = teams or self.MATRIX_TEAMS
+        cutoff = window_cutoff(years_back)
+        out = {}
+        for team in teams:
+            matches = self.query(MatchFilter(team=team, since=cutoff))
+            if not matches.empty: out[team] = self._matrix_records(matches, team).to_dict(orient='records')
+        return out
+
     # =================================================================================
     # 🔍 ANALYSIS FUNCTIONS (Public API)
     # =================================================================================
 
-    def analyze_home_fortress(self, stadium_name, home_team, opp_team='All', years_back=10, recorder=None):
-        stadium_id = stadium_name
-        if stadium_name not in VENUE_MAP.values():
-            for k, v in VENUE_MAP.items():
-                if k.lower() in stadium_name.lower(): stadium_id = v; break
-        
-        cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
+    # =================================================================================
+    # 📦 COMPUTE API (TeamReport records, nothing printed or displayed)
+    # =================================================================================
+
+    def fortress_report(self, stadium_name, home_team, opp_team='All', years_back=10):
+        """Home team at a venue, vs one opponent or all visitors. None if no matches."""
         vis_label = opp_team if opp_team != 'All' else "Visitors"
-        vs_txt = f"vs {vis_label}"
-        
-        print(f"\n🏰 FORTRESS CHECK: {home_team} {vs_txt} at {stadium_id}")
-        
-        v_matches = self.match_df[(self.match_df['venue'] == stadium_id) & (self.match_df['start_date'] >= cutoff)].copy()
-        df = v_matches[(v_matches['team_bat_1'] == home_team) | (v_matches['team_bat_2'] == home_team)].copy()
-        if opp_team != 'All': df = df[(df['team_bat_1'] == opp_team) | (df['team_bat_2'] == opp_team)].copy()
+        df = self.query(self._fortress_filter(stadium_name, home_team, opp_team, years_back))
+        if df.empty: return None
+        return self.team_report(df, home_team, vis_label, f"FORTRESS REPORT (vs {vis_label})", is_venue_mode=True)
+
+    def global_h2h_report(self, home_team, opp_team, years_back=5):
+        """All matches between two teams, anywhere. None if no matches."""
+        df = self.query(self._h2h_filter(home_team, opp_team, years_back))
+        if df.empty: return None
+        return self.team_report(df, home_team, opp_team, "GLOBAL RIVALRY REPORT", False)
+
+    def country_h2h_report(self, home_team, opp_team, country_name, years_back=10):
+        """Two teams in one host country (or venues whose name contains country_name). None if no matches."""
+        df = self.query(self._country_filter(home_team, opp_team, country_name, years_back))
+        if df.empty: return None
+        return self.team_report(df, home_team, opp_team, f"HOST COUNTRY REPORT ({country_name})", False)
+
+    def team_reports(self, scenarios, workers=None, audit=True):
+        """Many fortress / global / country reports in one grouped pass (core/report_batch.py), in order."""
+        return ReportBatch(self).run(scenarios, workers=workers, audit=audit)
+
+    # =================================================================================
+    # 🖥️ REPORTS (Compute + Render)
+    # =================================================================================
+
+    def analyze_home_fortress(self, stadium_name, home_team, opp_team='All', years_back=10, recorder=None):
+        stadium_id = VENUE_REGISTRY.resolve_contained(stadium_name)
+        vs_txt = f"vs {opp_team if opp_team != 'All' else 'Visitors'}"
+        self.renderer.text(f"\n🏰 FORTRESS CHECK: {home_team} {vs_txt} at {stadium_id}")
         
-        if df.empty: print(f"❌ No matches found."); return
+        report = self._compute(self.fortress_report, stadium_name, home_team, opp_team, years_back)
+        if report is None: self.renderer.text("❌ No matches found."); return
         
-        df = self._apply_smart_filters(df)
-        df = self._apply_smart_filters(df)
-        return self._build_and_display_report(df, home_team, vis_label, f"FORTRESS REPORT ({vs_txt})", is_venue_mode=True)
+        self.renderer.team_report(report)
+        return report.rows()
 
     # 🔗 BRIDGE FUNCTION (Connects Interface Button to Fortress Logic)
     def analyze_venue_matchup(self, stadium_name, home_team, opp_team, years_back=5, recorder=None):
@@ -418,86 +380,43 @@ class TeamEngine:
         return self.analyze_home_fortress(stadium_name, home_team, opp_team, years_back, recorder)
 
     def analyze_venue_phases(self, stadium_id, home_team=None, away_team=None, years=5, recorder=None):
-        import os
-        from IPython.display import display, HTML
-        from config.teams import TEAM_COLORS 
-
-        file_path = 'data/processed_phase_stats.csv'
-        if not os.path.exists(file_path): print("❌ Error: 'processed_phase_stats.csv' not found."); return
-        
-        phase_df = pd.read_csv(file_path)
-        
-        # ---------------------------------------------------------
-        # 🚨 NUCLEAR FIX: ID NORMALIZATION (Handles "518" vs "518.0")
-        # ---------------------------------------------------------
-        if 'match_id' in phase_df.columns:
-            # remove decimals (.0), spaces, and force to string
-            phase_df['match_id'] = phase_df['match_id'].astype(str).str.split('.').str[0].str.strip()
-
-        # 2. Smart Date Merge
-        if 'start_date' not in phase_df.columns and 'match_id' in phase_df.columns:
-            # Prepare Master Map (Apply same normalization)
-            temp_map_df = self.match_df.copy()
-            temp_map_df['match_id'] = temp_map_df['match_id'].astype(str).str.split('.').str[0].str.strip()
-            
-            date_map = temp_map_df.set_index('match_id')['start_date'].to_dict()
-            phase_df['start_date'] = phase_df['match_id'].map(date_map)
-            phase_df['start_date'] = pd.to_datetime(phase_df['start_date'])
-
-        elif 'start_date' in phase_df.columns:
-            phase_df['start_date'] = pd.to_datetime(phase_df['start_date'])
-
-        # 3. Filter by Venue (BEFORE Date Filter to debug availability)
-        # Check standard alias OR fuzzy match location
-        valid_aliases = [k for k, v in VENUE_MAP.items() if v == stadium_id]
-        valid_aliases.append(stadium_id)
-        search_terms = [x.lower() for x in valid_aliases]
-        
-        venue_stats = phase_df[phase_df['venue'].str.lower().isin(search_terms)].copy()
-        
-        # Fallback: Search by city name if ID match fails
-        if venue_stats.empty:
-            location_part = stadium_id.split('_')[-1].lower()
-            if len(location_part) > 3: 
-                venue_stats = phase_df[phase_df['venue'].str.lower().str.contains(location_part)]
+        # Phase table lives in memory (read once, indexed by venue name / team)
+        if not self.phase_store.available(): self.renderer.text("❌ Error: 'processed_phase_stats.csv' not found."); return
+        venue_stats = self.phase_store.venue_rows(stadium_id)
 
         if venue_stats.empty: 
-            print(f"❌ No phase data found for venue ID: '{stadium_id}' (Check 'processed_phase_stats.csv')")
+            self.renderer.text(f"❌ No phase data found for venue ID: '{stadium_id}' (Check 'processed_phase_stats.csv')")
             return
 
         # 4. Apply Date Filter & DEBUGGER
         if 'start_date' in venue_stats.columns:
-            cutoff = pd.Timestamp.now() - pd.DateOffset(years=years)
+            cutoff = window_cutoff(years)
             filtered_stats = venue_stats[venue_stats['start_date'] >= cutoff].copy()
             
             # 🔍 DEBUG: If filter kills all data, explain why
             if filtered_stats.empty and not venue_stats.empty:
                 latest = venue_stats['start_date'].max()
-                print(f"⚠️ Venue found, but NO matches in last {years} years.")
-                print(f"   📅 Latest data available: {latest.date()} (Cutoff: {cutoff.date()})")
+                self.renderer.text(f"⚠️ Venue found, but NO matches in last {years} years.")
+                self.renderer.text(f"   📅 Latest data available: {latest.date()} (Cutoff: {cutoff.date()})")
                 return
             
             venue_stats = filtered_stats
             start_year = cutoff.year
         else:
-            print("⚠️ Warning: Could not map dates. Using all data.")
+            self.renderer.text("⚠️ Warning: Could not map dates. Using all data.")
             start_year = "2015"
 
-        # Helper for Total Runs
-        if 'total_runs' not in venue_stats.columns:
-            venue_stats['total_runs'] = venue_stats['pp_runs'].fillna(0) + venue_stats['mid_runs'].fillna(0) + venue_stats['dth_runs'].fillna(0)
-
         # -----------------------------------------------------------
         # SECTION 1: OVERALL VENUE BASELINE (HTML STYLED)
         # -----------------------------------------------------------
         target_venue = venue_stats['venue'].iloc[0].upper()
         
-        display(HTML(f"""
+        self.renderer.html(f"""
         <div style="background:#f4f4f4; padding:10px; border-radius:5px; margin-bottom:10px; border-left: 5px solid #666;">
             <h3 style="margin:0; color:#333;">🕒 PHASE ANALYSIS: {target_venue}</h3>
             <div style="font-size:12px; color:#666;">📅 Sample Size: {len(venue_stats)} Innings (Last {years} Years)</div>
         </div>
-        """))
+        """)
         
         agg_rules = {
             'pp_runs': ['mean', 'count'], 'pp_wkts': 'mean',
@@ -521,7 +440,7 @@ class TeamEngine:
                 str2 = f"<b>{r2}</b> ({c2}) / <span style='color:#d9534f'>{w2} w</span>"
                 rows += f"<tr><td style='padding:5px;'>{name}</td><td style='padding:5px;'>{str1}</td><td style='padding:5px;'>{str2}</td></tr>"
 
-            display(HTML(f"""
+            self.renderer.html(f"""
             <div style="margin-bottom:15px; border:1px solid #ddd; border-radius:5px; background:{bg_color};">
                 <div style="background:{header_color}; color:#fff; padding:5px 10px; font-weight:bold; font-size:13px;">{title}</div>
                 <table style="width:100%; font-size:13px; border-collapse:collapse;">
@@ -533,9 +452,9 @@ class TeamEngine:
                     {rows}
                 </table>
             </div>
-            """))
+            """)
 
-        display_phase_html(venue_stats, f"🏟️ OVERALL VENUE BASELINE (All Teams)", header_color="#555")
+        display_phase_html(venue_stats, "🏟️ OVERALL VENUE BASELINE (All Teams)", header_color="#555")
 
         # -----------------------------------------------------------
         # SECTION 2: SPECIFIC TEAM HISTORY AT THIS VENUE (PRESERVED)
@@ -556,14 +475,14 @@ class TeamEngine:
         # SECTION 3: GLOBAL HABITS COMPARISON (HTML STYLED)
         # -----------------------------------------------------------
         if home_team and away_team and away_team != 'All':
-            h_stats = phase_df[phase_df['team'] == home_team]
-            a_stats = phase_df[phase_df['team'] == away_team]
+            h_stats = self.phase_store.team_rows(home_team)
+            a_stats = self.phase_store.team_rows(away_team)
             
             if not h_stats.empty and not a_stats.empty:
                 c1 = TEAM_COLORS.get(home_team, "#333")
                 c2 = TEAM_COLORS.get(away_team, "#333")
                 
-                display(HTML(f"<h4 style='border-bottom:2px solid #ccc; padding-bottom:5px; margin-top:20px;'>⚔️ GLOBAL HABITS (Any Venue, Since {start_year})</h4>"))
+                self.renderer.html(f"<h4 style='border-bottom:2px solid #ccc; padding-bottom:5px; margin-top:20px;'>⚔️ GLOBAL HABITS (Any Venue, Since {start_year})</h4>")
 
                 def get_row_html(label, val_h, val_a, is_high_good):
                     diff = round(val_h - val_a, 1)
@@ -573,8 +492,8 @@ class TeamEngine:
                     return f"<tr style='border-bottom:1px dashed #eee;'><td style='padding:5px; color:#555;'>{label}</td><td style='padding:5px; font-weight:bold; color:{c1}'>{val_h:.1f}</td><td style='padding:5px; font-weight:bold; color:{c2}'>{val_a:.1f}</td><td style='padding:5px; color:{color}; font-weight:bold;'>{arrow} {abs(diff)}</td></tr>"
 
                 # Scenario 1: Bat First
-                h_avg_1 = h_stats[h_stats['innings'] == 1].mean(numeric_only=True)
-                a_avg_1 = a_stats[a_stats['innings'] == 1].mean(numeric_only=True)
+                h_avg_1 = self.phase_store.team_innings_means(home_team, 1)
+                a_avg_1 = self.phase_store.team_innings_means(away_team, 1)
                 
                 metrics = [('pp_runs', 'Avg PP Runs', True), ('pp_wkts', 'Avg PP Wkts', False),
                            ('mid_runs', 'Avg Mid Runs', True), ('mid_wkts', 'Avg Mid Wkts', False),
@@ -585,14 +504,14 @@ class TeamEngine:
                     rows_1 += get_row_html(lbl, h_avg_1.get(col,0), a_avg_1.get(col,0), flg)
 
                 # Scenario 2: Chasing
-                h_avg_2 = h_stats[h_stats['innings'] == 2].mean(numeric_only=True)
-                a_avg_2 = a_stats[a_stats['innings'] == 2].mean(numeric_only=True)
+                h_avg_2 = self.phase_store.team_innings_means(home_team, 2)
+                a_avg_2 = self.phase_store.team_innings_means(away_team, 2)
                 
                 rows_2 = get_row_html("Avg PP Score", h_avg_2.get('pp_runs',0), a_avg_2.get('pp_runs',0), True)
                 rows_2 += get_row_html("Avg Mid Wkts", h_avg_2.get('mid_wkts',0), a_avg_2.get('mid_wkts',0), False)
                 rows_2 += get_row_html("Avg Death Wkts", h_avg_2.get('dth_wkts',0), a_avg_2.get('dth_wkts',0), False)
 
-                display(HTML(f"""
+                self.renderer.html(f"""
                 <div style="display:flex; gap:20px;">
                     <div style="flex:1;">
                         <div style="background:#e9ecef; padding:5px; font-weight:bold; text-align:center; color:#495057;">📉 SCENARIO 1: BAT FIRST</div>
@@ -609,25 +528,24 @@ class TeamEngine:
                         </table>
                     </div>
                 </div>
-                """))
+                """)
                 
                 # Strategic Alerts (PRESERVED)
                 venue_pp_1 = venue_stats[venue_stats['innings']==1]['pp_runs'].mean() if not venue_stats.empty else 0
                 h_pp_1 = h_avg_1.get('pp_runs', 0)
                 if h_pp_1 > venue_pp_1 + 5: 
-                    display(HTML(f"<div style='margin-top:10px; padding:8px; background:#d4edda; color:#155724; border-left:4px solid #28a745;'><b>🚀 EDGE:</b> {home_team} (1st Inn) outscores this venue avg ({venue_pp_1:.1f}). BACK Powerplay.</div>"))
+                    self.renderer.html(f"<div style='margin-top:10px; padding:8px; background:#d4edda; color:#155724; border-left:4px solid #28a745;'><b>🚀 EDGE:</b> {home_team} (1st Inn) outscores this venue avg ({venue_pp_1:.1f}). BACK Powerplay.</div>")
                 
                 h_wkts_chase = h_avg_2.get('mid_wkts', 0)
                 if h_wkts_chase > 3.0: 
-                    display(HTML(f"<div style='margin-top:5px; padding:8px; background:#f8d7da; color:#721c24; border-left:4px solid #dc3545;'><b>⚠️ RISK:</b> {home_team} collapses chasing (Avg {h_wkts_chase:.1f} wkts lost in Middle Overs). LAY Stability.</div>"))
+                    self.renderer.html(f"<div style='margin-top:5px; padding:8px; background:#f8d7da; color:#721c24; border-left:4px solid #dc3545;'><b>⚠️ RISK:</b> {home_team} collapses chasing (Avg {h_wkts_chase:.1f} wkts lost in Middle Overs). LAY Stability.</div>")
 
         # 5. Audit (PRESERVED)
         if 'match_id' in venue_stats.columns:
             used_match_ids = venue_stats['match_id'].unique()
-            # 🚨 FIX: Ensure main df IDs are normalized for audit lookup
-            audit_mask = self.match_df['match_id'].astype(str).str.split('.').str[0].str.strip().isin(used_match_ids)
-            audit_df = self.match_df[audit_mask]
-            self._display_audit(audit_df, stadium_id)
+            # Main df IDs normalised once by the store
+            audit_df = self.match_df[np.isin(self.phase_store.match_keys(), used_match_ids)]
+            self._display_audit(audit_df, show_status=False)
             
         # 🚨 AI LOGGING: PHASE ANALYSIS (PRESERVED)
         if recorder:
@@ -647,56 +565,77 @@ class TeamEngine:
                 }, years, len(venue_stats))
             except: pass
 
+    def venue_phase_seasons(self, stadium_id):
+        """Season-by-season phase averages at a venue (Innings x Phase x Season rows, no display)."""
+        return self.phase_store.season_cube(VENUE_REGISTRY.resolve_contained(stadium_id))
+
+    BIAS_THRESHOLD = 55 # Win % batting 1st / chasing that makes a venue biased
+    BIAS_VERDICTS = ["NEUTRAL ⚖️", "BAT FIRST 🏏", "BOWL FIRST 🥎"]
+
+    def venue_bias_table(self, years_back=10, venues=None):
+        """
+        Batting-order bias for every venue (or the given venues) in ONE pass (No display).
+        Same rules as analyze_venue_bias: wins exclude No Results, averages use Included matches only.
+        Returns a DataFrame indexed by venue, busiest venues first.
+        """
+        picked = None if venues is None else tuple(v for v in (self._resolve_venue(v) for v in venues) if v is not None)
+        df = self.query(MatchFilter(venue=picked, since=window_cutoff(years_back)))
+        res = df[df['status_code'] != STATUS_NO_RESULT]
+        out = pd.DataFrame({
+            'venue': res['venue'],
+            'bat1': (res['winner_code'] == res['bat1_code']).astype(int),
+            'chase': (res['winner_code'] == res['bat2_code']).astype(int),
+        }).groupby('venue').agg(matches=('bat1', 'size'), bat1_wins=('bat1', 'sum'), chase_wins=('chase', 'sum'))
+        out['bat1_pct'] = (out['bat1_wins'] / out['matches'] * 100).astype(int)
+        out['chase_pct'] = (out['chase_wins'] / out['matches'] * 100).astype(int)
+        out['verdict'] = np.select([out['bat1_pct'] >= self.BIAS_THRESHOLD, out['chase_pct'] >= self.BIAS_THRESHOLD],
+                                   self.BIAS_VERDICTS[1:], default=self.BIAS_VERDICTS[0])
+        strict = df[df['status_code'] == STATUS_INCLUDED].groupby('venue')[['score_inn1', 'score_inn2']].agg(['mean', 'count'])
+        strict.columns = ['avg_1st', 'n_1st', 'avg_2nd', 'n_2nd']
+        out = out.join(strict, how='left')
+        out[['n_1st', 'n_2nd']] = out[['n_1st', 'n_2nd']].fillna(0).astype(int)
+        return out.sort_values('matches', ascending=False, kind='stable')
+
     def analyze_venue_bias(self, stadium_name, years_back=10, recorder=None):
-        print(f"\n🪙 TOSS BIAS REPORT: {stadium_name}")
-        venue_id = stadium_name
-        
-        # 1. Resolve Venue Name
-        if stadium_name not in self.match_df['venue'].values:
-            matches = [v for v in self.match_df['venue'].unique() if stadium_name.lower() in str(v).lower()]
-            if matches: 
-                venue_id = matches[0]
-                print(f"🔎 Mapped '{stadium_name}' to -> '{venue_id}'")
-            else: 
-                print("❌ Venue not found."); return
-
-        # 2. Filter by Date & Venue
-        cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        venue_matches = self.match_df[
-            (self.match_df['venue'] == venue_id) & 
-            (self.match_df['start_date'] >= cutoff)
-        ].copy()
-        
-        # 3. Apply Filters
-        clean_df = self._apply_smart_filters(venue_matches)
+        self.renderer.text(f"\n🪙 TOSS BIAS REPORT: {stadium_name}")
+        # 1. Resolve Venue Name (match_df venue / registry alias / partial name)
+        venue_id = self._resolve_venue(stadium_name)
+        if venue_id is None: self.renderer.text("❌ Venue not found."); return
+        if venue_id != stadium_name: self.renderer.text(f"🔎 Mapped '{stadium_name}' to -> '{venue_id}'")
+
+        # 2. Date Window = slice of the venue's date-sorted rows
+        venue_matches = self._venue_matches(venue_id, window_cutoff(years_back))
+        
+        # 3. Precomputed Status Codes
+        clean_df = venue_matches
         
         # 🚨 SPLIT LOGIC HERE 🚨
         # Dataset A: For Win Calculation (Include Rain/DL Results)
-        valid_results = clean_df[clean_df['status'] != '☔ Excluded (No Result)']
+        valid_results = clean_df[clean_df['status_code'] != STATUS_NO_RESULT]
         
         # Dataset B: For Score Calculation (Keep Strict to protect Averages)
-        valid_stats = clean_df[clean_df['status'] == '✅ Included']
+        valid_stats = clean_df[clean_df['status_code'] == STATUS_INCLUDED]
         
         if valid_results.empty: 
-            print("❌ Not enough valid matches to analyze toss bias.")
+            self.renderer.text("❌ Not enough valid matches to analyze toss bias.")
             return
 
         # 4. Calculate Stats (Using Result Dataset)
         total = len(valid_results)
-        bat1_wins = len(valid_results[valid_results['winner'] == valid_results['team_bat_1']])
-        chase_wins = len(valid_results[valid_results['winner'] == valid_results['team_bat_2']])
+        bat1_wins = int((valid_results['winner_code'] == valid_results['bat1_code']).sum())
+        chase_wins = int((valid_results['winner_code'] == valid_results['bat2_code']).sum())
         
         bat1_pct = int((bat1_wins / total) * 100)
         chase_pct = int((chase_wins / total) * 100)
         
-        bias = "NEUTRAL ⚖️"
-        if bat1_pct >= 55: bias = "BAT FIRST 🏏"
-        elif chase_pct >= 55: bias = "BOWL FIRST 🥎"
+        bias = self.BIAS_VERDICTS[0]
+        if bat1_pct >= self.BIAS_THRESHOLD: bias = self.BIAS_VERDICTS[1]
+        elif chase_pct >= self.BIAS_THRESHOLD: bias = self.BIAS_VERDICTS[2]
         
         # 5. Display Summary
-        print(f"📅 Period: Last {years_back} Years")
-        print(f"🏟️ Matches Analyzed: {total} | 📊 Bias Verdict: {bias}")
-        print("-" * 40)
+        self.renderer.text(f"📅 Period: Last {years_back} Years")
+        self.renderer.text(f"🏟️ Matches Analyzed: {total} | 📊 Bias Verdict: {bias}")
+        self.renderer.text("-" * 40)
         
         data = [
             {"Metric": "Win % Batting 1st", "Value": f"{bat1_pct}% ({bat1_wins})"},
@@ -705,119 +644,77 @@ class TeamEngine:
             {"Metric": "Avg 1st Innings Score", "Value": self._get_avg_with_count(valid_stats, 'score_inn1')},
             {"Metric": "Avg 2nd Innings Score", "Value": self._get_avg_with_count(valid_stats, 'score_inn2')},
         ]
-        display(pd.DataFrame(data).style.hide(axis='index'))
+        self.renderer.table(pd.DataFrame(data).style.hide(axis='index'))
         
         # 6. Show Match Audit
-        self._display_audit(valid_results, venue_id)
+        self._display_audit(valid_results)
         
     def analyze_global_h2h(self, home_team, opp_team, years_back=5):
-        cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        print(f"\n🌍 GLOBAL H2H CHECK: {home_team} vs {opp_team}")
-        mask = (((self.match_df['team_bat_1'] == home_team) & (self.match_df['team_bat_2'] == opp_team)) | ((self.match_df['team_bat_1'] == opp_team) & (self.match_df['team_bat_2'] == home_team))) & (self.match_df['start_date'] >= cutoff)
-        df = self.match_df[mask].copy()
-        if df.empty: print("❌ No global matches found."); return
-        df = self._apply_smart_filters(df)
-        return self._build_and_display_report(df, home_team, opp_team, f"GLOBAL RIVALRY REPORT", False)
+        self.renderer.text(f"\n🌍 GLOBAL H2H CHECK: {home_team} vs {opp_team}")
+        report = self._compute(self.global_h2h_report, home_team, opp_team, years_back)
+        if report is None: self.renderer.text("❌ No global matches found."); return
+        self.renderer.team_report(report)
+        return report.rows()
 
     def analyze_country_h2h(self, home_team, opp_team, country_name, years_back=10, recorder=None):
-        cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        print(f"\n🗺️ COUNTRY CHECK: {home_team} vs {opp_team} in {country_name.upper()}")
-        country_map = {
-            'India': ['India', 'IND_'], 'Australia': ['Australia', 'AUS_'], 'England': ['England', 'ENG_'], 'South Africa': ['South Africa', 'SA_'], 'New Zealand': ['New Zealand', 'NZ_'], 'Sri Lanka': ['Sri Lanka', 'SL_'], 'West Indies': ['West Indies', 'WI_'], 'Pakistan': ['Pakistan', 'PAK_'], 'Bangladesh': ['Bangladesh', 'BAN_'], 'UAE': ['UAE', 'Dubai', 'Sharjah']
-        }
-        keys = country_map.get(country_name, [country_name])
-        pat = '|'.join(keys)
-        v_mask = self.match_df['venue'].str.contains(pat, case=False, na=False)
-        m_mask = (((self.match_df['team_bat_1'] == home_team) & (self.match_df['team_bat_2'] == opp_team)) | ((self.match_df['team_bat_1'] == opp_team) & (self.match_df['team_bat_2'] == home_team))) & (self.match_df['start_date'] >= cutoff)
-        df = self.match_df[v_mask & m_mask].copy()
-        if df.empty: print(f"❌ No matches found."); return
-        df = self._apply_smart_filters(df)
-        return self._build_and_display_report(df, home_team, opp_team, f"HOST COUNTRY REPORT ({country_name})", False)
+        self.renderer.text(f"\n🗺️ COUNTRY CHECK: {home_team} vs {opp_team} in {country_name.upper()}")
+        report = self._compute(self.country_h2h_report, home_team, opp_team, country_name, years_back)
+        if report is None: self.renderer.text("❌ No matches found."); return
+        self.renderer.team_report(report)
+        return report.rows()
 
     def analyze_home_dominance(self, home_team, years_back=10, recorder=None):
-        print(f"\n🦁 HOME DOMINANCE: {home_team}"); cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        c_codes = {'India':'IND_','England':'ENG_','Australia':'AUS_','South Africa':'SA_','New Zealand':'NZ_','Sri Lanka':'SL_','West Indies':'WI_','Pakistan':'PAK_','Bangladesh':'BAN_'}
-        if home_team not in c_codes: print("❌ Unknown code."); return
-        matches = self.match_df[(self.match_df['venue'].str.startswith(c_codes[home_team])) & ((self.match_df['team_bat_1'] == home_team) | (self.match_df['team_bat_2'] == home_team)) & (self.match_df['start_date'] >= cutoff)].copy()
-        if matches.empty: print("❌ No matches found."); return
+        self.renderer.text(f"\n🦁 HOME DOMINANCE: {home_team}"); cutoff = window_cutoff(years_back)
+        if home_team not in COUNTRY_CONTINENT: self.renderer.text("❌ Unknown code."); return
+        matches = self.query(MatchFilter(team=home_team, host_country=home_team, since=cutoff))
+        if matches.empty: self.renderer.text("❌ No matches found."); return
         return self._generate_matrix_report(matches, home_team, "DOMINANCE MATRIX")
 
     def analyze_away_performance(self, team_name, years_back=5, recorder=None):
-        print(f"\n✈️ AWAY PERFORMANCE: {team_name}"); cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        c_codes = {'India':'IND_','England':'ENG_','Australia':'AUS_','South Africa':'SA_','New Zealand':'NZ_','Sri Lanka':'SL_','West Indies':'WI_','Pakistan':'PAK_','Bangladesh':'BAN_'}
-        if team_name not in c_codes: print("❌ Unknown code."); return
-        matches = self.match_df[((self.match_df['team_bat_1'] == team_name) | (self.match_df['team_bat_2'] == team_name)) & (~self.match_df['venue'].astype(str).str.startswith(c_codes[team_name])) & (self.match_df['start_date'] >= cutoff)].copy()
-        if matches.empty: print("❌ No matches found."); return
-        return self._generate_matrix_report(matches, team_name, "AWAY PERFORMANCE MATRIX", is_away=True)
+        self.renderer.text(f"\n✈️ AWAY PERFORMANCE: {team_name}"); cutoff = window_cutoff(years_back)
+        if team_name not in COUNTRY_CONTINENT: self.renderer.text("❌ Unknown code."); return
+        matches = self.query(MatchFilter(team=team_name, away_from=team_name, since=cutoff))
+        if matches.empty: self.renderer.text("❌ No matches found."); return
+        return self._generate_matrix_report(matches, team_name, "AWAY PERFORMANCE MATRIX")
 
     def analyze_global_performance(self, team_name, years_back=5):
-        print(f"\n🌍 GLOBAL PERFORMANCE: {team_name} vs Top 10"); cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        matches = self.match_df[((self.match_df['team_bat_1'] == team_name) | (self.match_df['team_bat_2'] == team_name)) & (self.match_df['start_date'] >= cutoff)].copy()
-        if matches.empty: print("❌ No matches found."); return
+        self.renderer.text(f"\n🌍 GLOBAL PERFORMANCE: {team_name} vs Top 10"); cutoff = window_cutoff(years_back)
+        matches = self.query(MatchFilter(team=team_name, since=cutoff))
+        if matches.empty: self.renderer.text("❌ No matches found."); return
         return self._generate_matrix_report(matches, team_name, "GLOBAL PERFORMANCE MATRIX")
 
     def analyze_continent_performance(self, team_name, continent, opp_team='All', years_back=5):
         reg = "Global" if continent == 'All' else continent
-        print(f"\n🌏 REGION REPORT: {team_name} in {reg}"); cutoff = pd.Timestamp.now() - pd.DateOffset(years=years_back)
-        mask = ((self.match_df['team_bat_1'] == team_name) | (self.match_df['team_bat_2'] == team_name)) & (self.match_df['start_date'] >= cutoff)
-        if continent != 'All':
-            c_map = {'Asia':['IND_','PAK_','SL_','BAN_','AFG_','UAE_'], 'Europe':['ENG_','IRE_','SCO_','NED_'], 'Oceania':['AUS_','NZ_'], 'Africa':['SA_','ZIM_'], 'Americas':['WI_','USA_']}
-            if continent in c_map: mask = mask & (self.match_df['venue'].astype(str).str.startswith(tuple(c_map[continent])))
-            else: print("❌ Unknown Continent"); return
-        if opp_team != 'All': mask = mask & ((self.match_df['team_bat_1'] == opp_team) | (self.match_df['team_bat_2'] == opp_team))
-        matches = self.match_df[mask].copy()
-        if matches.empty: print("❌ No matches found."); return
-        if opp_team != 'All': self._build_and_display_report(self._apply_smart_filters(matches), team_name, opp_team, f"REGION REPORT ({reg})", False)
+        self.renderer.text(f"\n🌏 REGION REPORT: {team_name} in {reg}"); cutoff = window_cutoff(years_back)
+        if continent != 'All' and continent not in CONTINENTS: self.renderer.text("❌ Unknown Continent"); return
+        matches = self.query(MatchFilter(team=team_name, opponent=None if opp_team == 'All' else opp_team,
+                                         continent=None if continent == 'All' else continent, since=cutoff))
+        if matches.empty: self.renderer.text("❌ No matches found."); return
+        if opp_team != 'All': self._build_and_display_report(matches, team_name, opp_team, f"REGION REPORT ({reg})", False)
         else: return self._generate_matrix_report(matches, team_name, f"PERFORMANCE MATRIX: {reg.upper()}")
 
     def analyze_team_form(self, team_name, opp_team='All', continent='All', limit=5, recorder=None):
         title = f"📉 FORM: {team_name}"
         if opp_team != 'All': title += f" vs {opp_team}"
         if continent != 'All': title += f" in {continent}"
-        print(title)
+        self.renderer.text(title)
         
-        mask = (self.match_df['team_bat_1'] == team_name) | (self.match_df['team_bat_2'] == team_name)
-        if opp_team != 'All': mask = mask & ((self.match_df['team_bat_1'] == opp_team) | (self.match_df['team_bat_2'] == opp_team))
-        if continent != 'All':
-            c_map = {'Asia':['IND_','PAK_','SL_','BAN_','AFG_','UAE_'], 'Europe':['ENG_','IRE_','SCO_','NED_'], 'Oceania':['AUS_','NZ_'], 'Africa':['SA_','ZIM_'], 'Americas':['WI_','USA_']}
-            if continent in c_map: mask = mask & (self.match_df['venue'].astype(str).str.startswith(tuple(c_map[continent])))
-            
-        df = self.match_df[mask].copy()
-        if df.empty: print("❌ No matches found."); return
+        in_continent = continent if continent in CONTINENTS else None # Unknown continent -> all matches
+        rows = self._team_rows(team_name, opp_team=opp_team, continent=in_continent)
+
+        if rows.empty: self.renderer.text("❌ No matches found."); return
         
-        df = self._apply_smart_filters(df)
-        recent = df.sort_values('start_date', ascending=False).head(limit)
+        recent = rows.sort_values('start_date', ascending=False).head(limit)
         
         data = []
-        form_str = [] # To store W/L/T string for AI
+        labels = {RESULT_WIN: "✅ WIN", RESULT_TIE: "🤝 TIE", RESULT_NO_RESULT: "🌧️ NR"}
         
-        for _, row in recent.iterrows():
-            bat1 = (row['team_bat_1'] == team_name)
-            opp = row['team_bat_2'] if bat1 else row['team_bat_1']
-            w = str(row['winner'])
-            
-            # Determine Result for UI and AI
-            if w == team_name: 
-                res = "✅ WIN"
-                form_str.append("W")
-            elif w.lower() == 'tie': 
-                res = "🤝 TIE"
-                form_str.append("T")
-            elif w.lower() in ['nan','no result','none']: 
-                res = "🌧️ NR"
-                form_str.append("NR")
-            else: 
-                res = "❌ LOSS"
-                form_str.append("L")
-            
-            s_my = row['score_inn1'] if bat1 else row['score_inn2']
-            s_opp = row['score_inn2'] if bat1 else row['score_inn1']
-            l_my = "(1st)" if bat1 else "(2nd)"
-            l_opp = "(2nd)" if bat1 else "(1st)"
-            
+        for row in recent.itertuples(index=False):
+            l_my = "(1st)" if row.bat_order == 1 else "(2nd)"
+            l_opp = "(2nd)" if row.bat_order == 1 else "(1st)"
             data.append({
-                "Date": row['start_date'].strftime('%Y-%m-%d'), "Opponent": opp, "Venue": str(row['venue']).split('_')[-1].title(),
-                "Result": res, f"{team_name}": f"{int(s_my) if pd.notna(s_my) else '-'} {l_my}", "Opp Score": f"{int(s_opp) if pd.notna(s_opp) else '-'} {l_opp}"
+                "Date": row.start_date.strftime('%Y-%m-%d'), "Opponent": row.opponent, "Venue": str(row.venue).split('_')[-1].title(),
+                "Result": labels.get(row.result, "❌ LOSS"), f"{team_name}": f"{int(row.score) if pd.notna(row.score) else '-'} {l_my}", "Opp Score": f"{int(row.opp_score) if pd.notna(row.opp_score) else '-'} {l_opp}"
             })
             
         def col(v):
@@ -828,7 +725,7 @@ class TeamEngine:
             elif 'NR' in v: c = 'gray'
             return f'color: {c}; font-weight: bold'
         
-        display(pd.DataFrame(data).style.map(col, subset=['Result']).hide(axis='index'))
-        self._display_audit(recent, team_name)
+        self.renderer.table(pd.DataFrame(data).style.map(col, subset=['Result']).hide(axis='index'))
+        self._display_audit(self._matches(recent))
 
         
\ No newline at end of file
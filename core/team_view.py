@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from core.venue_registry import VENUE_REGISTRY
+from core.match_status import WINNER_TIE, WINNER_NO_RESULT
+
+# Result Codes (int8), from the team's point of view
+RESULT_WIN = 0
+RESULT_LOSS = 1
+RESULT_TIE = 2
+RESULT_NO_RESULT = 3
+RESULT_FORM = {RESULT_WIN: 'W', RESULT_LOSS: 'L', RESULT_TIE: 'T', RESULT_NO_RESULT: 'NR'}
+
+def add_venue_geography(match_df):
+    """
+    Stores 'host_country' and 'continent' on match_df as categoricals (VenueRegistry).
+    Resolved once per unique venue -> reports filter on the columns, no string scans.
+    """
+    venues = match_df['venue'].astype(str)
+    uniq = venues.unique()
+    match_df['host_country'] = venues.map({v: VENUE_REGISTRY.host_country(v) for v in uniq}).astype('category')
+    match_df['continent'] = venues.map({v: VENUE_REGISTRY.continent(v) for v in uniq}).astype('category')
+    return match_df
+
+def build_team_view(match_df):
+    """
+    🔁 Team-Perspective View (Built ONCE at load, after venues are standardised).
+    One row per (match, team) -> every match appears twice, once for each side.
+    - row          : position of the match in match_df (match_df.iloc[row] -> full match record)
+    - opponent, team_code / opp_code, bat_order (1 = set the target, 2 = chased)
+    - score / opp_score, wickets / opp_wickets
+    - result       : RESULT_* code (anything that is not a win, tie or no result is a loss)
+    - host_country / continent : from match_df (see add_venue_geography)
+    - status_code  : copied from match_df (see core.match_status)
+    Indexed by team (sorted) and kept in match_df order inside each team -> a team is one slice.
+    """
+    if 'host_country' not in match_df.columns: add_venue_geography(match_df)
+    n = len(match_df)
+    venue = match_df['venue'].to_numpy()
+    winner = match_df['winner_code'].to_numpy()
+
+    def side(team, opp, code, opp_code, order, inn, opp_inn):
+        code = match_df[code].to_numpy()
+        result = np.where(winner == code, RESULT_WIN,
+                 np.where(winner == WINNER_TIE, RESULT_TIE,
+                 np.where(winner == WINNER_NO_RESULT, RESULT_NO_RESULT, RESULT_LOSS)))
+        return pd.DataFrame({
+            'team': match_df[team].astype(str).to_numpy(),
+            'row': np.arange(n),
+            'match_id': match_df['match_id'].to_numpy(),
+            'start_date': match_df['start_date'].to_numpy(),
+            'venue': venue,
+            'host_country': match_df['host_country'].to_numpy(),
+            'continent': match_df['continent'].to_numpy(),
+            'opponent': match_df[opp].to_numpy(),
+            'team_code': code,
+            'opp_code': match_df[opp_code].to_numpy(),
+            'bat_order': np.full(n, order, dtype=np.int8),
+            'score': match_df[f'score_inn{inn}'].to_numpy(),
+            'opp_score': match_df[f'score_inn{opp_inn}'].to_numpy(),
+            'wickets': match_df[f'wickets_inn{inn}'].to_numpy(),
+            'opp_wickets': match_df[f'wickets_inn{opp_inn}'].to_numpy(),
+            'result': result.astype(np.int8),
+            'status_code': match_df['status_code'].to_numpy(),
+        })
+
+    view = pd.concat([
+        side('team_bat_1', 'team_bat_2', 'bat1_code', 'bat2_code', 1, 1, 2),
+        side('team_bat_2', 'team_bat_1', 'bat2_code', 'bat1_code', 2, 2, 1),
+    ], ignore_index=True)
+    for col in ['host_country', 'continent']: view[col] = view[col].astype(match_df[col].dtype)
+    return view.sort_values(['team', 'row'], kind='mergesort').set_index('team')
+
+def team_rows(view, team):
+    """All rows of one team (empty frame if the team never played)."""
+    idx = view.index
+    return view.iloc[idx.searchsorted(team, side='left'):idx.searchsorted(team, side='right')]
@@ -0,0 +1,85 @@
+import re
+from functools import lru_cache
+from venues import VENUE_MAP, get_host_country, get_continent
+from core.venue_resolver import VenueResolver
+
+class VenueRegistry:
+    """
+    🗺️ The Venue Registry (v1.0 - Compiled once from venues.py).
+    Every engine resolves venues through here, so the answer is the same everywhere.
+    - alias -> MASTER_ID, MASTER_ID -> [aliases] (VENUE_MAP order), normalised alias keys
+    - host country / continent per venue (cached)
+    - precompiled alias matchers (regex per MASTER_ID) for text columns holding raw names
+    - lookup caches are LRU-bounded (CACHE_SIZE): free-text inputs cannot grow them forever
+    """
+    CACHE_SIZE = 4096
+
+    def __init__(self, venue_map):
+        self.venue_map = venue_map
+        self.digest = VenueResolver._map_digest(venue_map) # Changes whenever venues.py does
+        self.alias_to_id = dict(venue_map)
+        self.aliases_of = {}
+        for alias, master in venue_map.items(): self.aliases_of.setdefault(master, []).append(alias)
+        self.masters = set(self.aliases_of)
+        self.clean_keys = {VenueResolver.clean(k): k for k in venue_map.keys()}
+        self._lower_aliases = [(k.lower(), v) for k, v in venue_map.items()]
+        # Bounded memos (None results are cached too)
+        self._contained = lru_cache(maxsize=self.CACHE_SIZE)(self._resolve_contained)
+        self._searches = lru_cache(maxsize=self.CACHE_SIZE)(self._search)
+        self._patterns = lru_cache(maxsize=self.CACHE_SIZE)(self._alias_pattern)
+        self._hosts = lru_cache(maxsize=self.CACHE_SIZE)(get_host_country)
+
+    # =================================================================================
+    # 🔍 LOOKUPS
+    # =================================================================================
+
+    def master_id(self, venue_identifier):
+        """MASTER_ID for an ID or an exact alias (None if neither)."""
+        if venue_identifier in self.masters: return venue_identifier
+        return self.alias_to_id.get(venue_identifier)
+
+    def aliases(self, venue_identifier):
+        """All raw names of a venue (ID or alias in). Unknown venues -> [venue_identifier]."""
+        master = self.alias_to_id.get(venue_identifier, venue_identifier)
+        return list(self.aliases_of.get(master, [venue_identifier]))
+
+    def resolve_contained(self, name):
+        """
+        Free-text stadium name -> MASTER_ID: IDs pass through, otherwise the first alias
+        (VENUE_MAP order) contained in the name. Falls back to the name itself.
+        """
+        if not isinstance(name, str): return name # NaN / None venues (raw CSVs) pass through
+        return self._contained(name)
+
+    def _resolve_contained(self, name):
+        if name in self.masters: return name
+        low = name.lower()
+        for alias, master in self._lower_aliases:
+            if alias in low: return master
+        return name
+
+    def search(self, needle):
+        """MASTER_IDs having an alias that contains needle (case-insensitive)."""
+        return self._searches(str(needle).lower())
+
+    def _search(self, needle):
+        return frozenset(m for a, m in self._lower_aliases if needle in a)
+
+    def alias_pattern(self, venue_identifier):
+        """Compiled case-insensitive regex matching any alias of the venue."""
+        return self._patterns(self.alias_to_id.get(venue_identifier, venue_identifier))
+
+    def _alias_pattern(self, master):
+        return re.compile('|'.join(re.escape(a) for a in self.aliases(master)), re.IGNORECASE)
+
+    def host_country(self, venue):
+        return self._hosts(str(venue))
+
+    def continent(self, venue):
+        return get_continent(self.host_country(venue))
+
+    def resolver(self, cache_path=None):
+        """Raw-name resolver (Exact -> Cleaned -> Substring -> Fuzzy) over this registry's map."""
+        return VenueResolver(self.venue_map, cache_path=cache_path)
+
+VENUE_REGISTRY = VenueRegistry(VENUE_MAP)
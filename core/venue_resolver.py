@@ -0,0 +1,118 @@
+import difflib
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+class VenueResolver:
+    """
+    🧭 The Venue Resolver (v1.0 - Cached Smart Matching).
+    Raw CSV venue name -> MASTER_ID (Exact -> Cleaned -> Substring -> Fuzzy), same rules as before.
+    - Resolutions persist to a JSON file keyed by raw name + a digest of the venue map,
+      so a warm load only resolves venues it has never seen. Editing venues.py invalidates it.
+    - Fuzzy step scores the map keys sharing a character trigram with the raw name first and
+      falls back to the full map when none of them passes the cutoff. Not strictly identical to
+      get_close_matches over the whole map: a key with no shared trigram can still score
+      >= cutoff (e.g. "ab.cd" vs "ab,cd") and would lose to a lower-scoring pool match.
+    """
+    VERSION = 1
+    FUZZY_CUTOFF = 0.80
+
+    def __init__(self, venue_map, cache_path=None):
+        self.venue_map = venue_map
+        self.cache_path = cache_path
+        self.digest = self._map_digest(venue_map)
+
+        # 1. CLEANED KEYS (Same precedence as before: first key wins per cleaned form)
+        self.clean_keys = {self.clean(k): k for k in venue_map.keys()}
+        self._substring_keys = [(c, k) for c, k in self.clean_keys.items() if len(c) > 5]
+
+        # 2. TRIGRAM INDEX over the raw map keys (difflib is case-sensitive -> so is the index)
+        self._keys = list(venue_map.keys())
+        self._grams = defaultdict(set)
+        for i, k in enumerate(self._keys):
+            for g in self._trigrams(k): self._grams[g].add(i)
+        self._short = {i for i, k in enumerate(self._keys) if len(k) < 3} # No trigrams -> always scored
+
+        self.resolved = self._load()
+        self._dirty = False
+
+    @staticmethod
+    def clean(s):
+        return re.sub(r'[^\w\s]', '', str(s)).lower().strip()
+
+    @staticmethod
+    def _trigrams(s):
+        return {s[i:i + 3] for i in range(len(s) - 2)}
+
+    @classmethod
+    def _map_digest(cls, venue_map):
+        payload = json.dumps([cls.VERSION, sorted(venue_map.items())], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    # =================================================================================
+    # 💾 PERSISTENT CACHE
+    # =================================================================================
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path): return {}
+        try:
+            with open(self.cache_path, encoding='utf-8') as f: data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('digest') != self.digest: return {} # venues.py changed -> start over
+        return dict(data.get('resolved', {}))
+
+    def save(self):
+        if not self.cache_path or not self._dirty: return
+        tmp = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'digest': self.digest, 'resolved': self.resolved}, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+        except OSError:
+            print(f"⚠️ Could not save venue cache to {self.cache_path}")
+
+    # =================================================================================
+    # 🔍 RESOLUTION
+    # =================================================================================
+
+    def _fuzzy(self, raw):
+        if len(raw) < 3: pool = self._keys # No trigram to go on -> score everything
+        else:
+            candidates = set(self._short)
+            for g in self._trigrams(raw): candidates |= self._grams.get(g, set())
+            pool = [self._keys[i] for i in candidates]
+        matches = difflib.get_close_matches(raw, pool, n=1, cutoff=self.FUZZY_CUTOFF)
+        if not matches and len(pool) < len(self._keys): # Nothing in the trigram pool -> full scan
+            matches = difflib.get_close_matches(raw, self._keys, n=1, cutoff=self.FUZZY_CUTOFF)
+        return matches[0] if matches else None
+
+    def _match(self, raw):
+        if raw in self.venue_map: return self.venue_map[raw]
+
+        clean_raw = self.clean(raw)
+        if clean_raw in self.clean_keys: return self.venue_map[self.clean_keys[clean_raw]]
+
+        for c_key, original_key in self._substring_keys:
+            if c_key in clean_raw: return self.venue_map[original_key]
+
+        key = self._fuzzy(raw)
+        return self.venue_map[key] if key is not None else raw
+
+    def resolve(self, raw):
+        """MASTER_ID for one raw venue name (the name itself if nothing matches)."""
+        hit = self.resolved.get(raw)
+        if hit is not None: return hit
+        master = self._match(raw)
+        self.resolved[raw] = master
+        self._dirty = True
+        return master
+
+    def resolve_all(self, raws):
+        """{raw: MASTER_ID} for every string in raws; new resolutions are written to disk."""
+        corrections = {raw: self.resolve(raw) for raw in raws if isinstance(raw, str)}
+        self.save()
+        return corrections
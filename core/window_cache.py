@@ -0,0 +1,57 @@
+import pandas as pd
+from collections import OrderedDict
+
+def window_cutoff(years):
+    """
+    Normalized cutoff for a 'Last N Years' window.
+    Rounded UP to the day: for date-only 'start_date' values this is exactly
+    equivalent to `start_date >= now - N years`, but stable for the whole day (cache key).
+    years=None means All Time.
+    """
+    if years is None: return pd.Timestamp.min
+    return (pd.Timestamp.now() - pd.DateOffset(years=years)).ceil('D')
+
+class WindowCache:
+    """
+    🧊 The Cold Store (v1.0 - Shared Window Cache).
+    One instance is shared by PlayerEngine and PredictorEngine.
+    - Keyed by the normalized cutoff DAY (see window_cutoff).
+    - Holds the zero-copy window view plus any window-level precomputations.
+    - LRU-bounded (max_windows). Cleared on reload_database.
+    """
+    def __init__(self, ball_index, max_windows=8):
+        self.ball_index = ball_index
+        self.max_windows = max_windows
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cutoff_for(years):
+        return window_cutoff(years)
+
+    def _entry(self, cutoff_date):
+        key = pd.Timestamp(cutoff_date)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = {'view': self.ball_index.window(key)}
+            self._entries[key] = entry
+            if len(self._entries) > self.max_windows: self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def window(self, cutoff_date):
+        """Deliveries on/after cutoff_date (cached view)."""
+        return self._entry(cutoff_date)['view']
+
+    def get(self, cutoff_date, name, builder):
+        """Window-level precomputation: builder(window_view) runs once per (cutoff day, name)."""
+        entry = self._entry(cutoff_date)
+        if name not in entry: entry[name] = builder(entry['view'])
+        return entry[name]
+
+    def clear(self):
+        self._entries.clear()
@@ -1,14 +1,30 @@
 import pandas as pd
 import numpy as np
-import difflib
-import re
 import os
+import hashlib
 import logging  # <--- NEW IMPORT
 
-from venues import VENUE_MAP
 from core.team_engine import TeamEngine
 from core.player_engine import PlayerEngine
 from core.predictor import PredictorEngine
+from core.deliveries import add_delivery_columns
+from core.match_status import add_match_status
+from core.team_view import add_venue_geography, build_team_view
+from core.ball_index import BallIndex
+from core.window_cache import WindowCache
+from core.scorecard import Scorecard
+from core.style_index import StyleIndex
+from core.player_directory import PlayerDirectory
+from core.venue_registry import VENUE_REGISTRY
+from core.result_cache import ResultCache
+from core.result_store import ResultStore
+from core.render import HtmlRenderer
+from core.phase_store import PHASE_FILE
+import config.teams as teams_config
+import config.settings as settings_config
+
+# Files whose contents feed the reports (on-disk result cache is keyed by their state)
+SOURCE_FILES = ['data/processed_player_stats.csv', 'data/player_metadata.csv', 'data/MATCH_SQUADS.csv', PHASE_FILE]
 
 # ==============================================================================
 # 🛡️ JUPYTER-PROOF LOGGER SETUP
@@ -29,9 +45,23 @@ class CricketAnalyzer:
     This class manages Data Loading and delegates analysis to specialized Core Engines.
     It maintains the exact public API of the old Monolith for interface compatibility.
     Now supports Hot Reloading (v3.0).
+    Report results are memoised per data version (v3.1, see core/result_cache.py),
+    optionally persisted to SQLite (disk_cache=True -> '<csv>_results.sqlite', or a path).
+    Compute API (v3.2): *_report / score_prediction / squad_comparison / player_profile return
+    result records (core/results.py) without rendering; the analyze_* calls render them through
+    the active renderer (HtmlRenderer by default, see set_renderer). Reports built on a record
+    cache the record and render it on every call; the rest replay their recorded output.
+    Inline reports (matrix, bias, form, phases) draw through the renderer's text / table / html.
     """
-    def __init__(self, filepath):
+    def __init__(self, filepath, cache_size=128, disk_cache=None, disk_cache_mb=256, renderer=None):
         self.filepath = filepath # Store for reloading
+        self.renderer = renderer if renderer is not None else HtmlRenderer()
+        store = None
+        if disk_cache:
+            store_path = disk_cache if isinstance(disk_cache, str) else self.filepath.replace('.csv', '_results.sqlite')
+            store = ResultStore(store_path, max_mb=disk_cache_mb)
+        self.result_cache = ResultCache(maxsize=cache_size, store=store) # cache_size=0 -> always recompute
+        self.result_cache.variant = type(self.renderer).__name__
         print(f"⚙️ Initializing Smart Engine (v2.1 - Robust)...")
         self.load_data() # <--- CALLS THE NEW LOADER
 
@@ -100,16 +130,68 @@ class CricketAnalyzer:
         self._create_match_summary()
         self._fix_ambiguous_venues()
         self._smart_standardize_venues()
+        add_venue_geography(self.match_df) # Host Country + Continent (venues.py registry)
         
         print(f"✅ Engine Ready! Condensed into {len(self.match_df)} unique matches.")
 
+        # 4. Tag Deliveries with the Standardized Venue (Same names as match_df)
+        self._tag_delivery_venues()
+
+        # 5. Build Match-Slice Index (Positional, over the sorted raw_df)
+        self.ball_index = BallIndex(self.raw_df)
+        self.window_cache = WindowCache(self.ball_index)
+
+        # 6. Build Per-Innings Player Scorecards (Batting & Bowling, once per load)
+        self.scorecard = Scorecard(self.raw_df)
+
+        # 7. Tag Deliveries with Bowler Style (config/teams.py) + Batter x Style Aggregate
+        self.style_index = StyleIndex(self.raw_df)
+
+        # 8. Player Directory (Search / Type-ahead / Active lists)
+        self.player_directory = PlayerDirectory(self.player_df, self.meta_df, self.scorecard)
+
+        # 9. Build Team-Perspective View (One row per match x team, indexed by team)
+        self.team_view = build_team_view(self.match_df)
+
         # =========================================================================
         # 🤖 INITIALIZE SUB-ENGINES
         # =========================================================================
-        self.team_engine = TeamEngine(self.match_df)
-        self.team_engine = TeamEngine(self.match_df)
-        self.player_engine = PlayerEngine(self.raw_df, self.player_df, self.meta_df, self.squads_df)
-        self.predictor_engine = PredictorEngine(self.raw_df, self.player_df)
+        self.team_engine = TeamEngine(self.match_df, team_view=self.team_view, renderer=self.renderer, memo=self._memo_record)
+        self.player_engine = PlayerEngine(self.raw_df, self.player_df, self.meta_df, self.squads_df, ball_index=self.ball_index, window_cache=self.window_cache, scorecard=self.scorecard, style_index=self.style_index, directory=self.player_directory, renderer=self.renderer, memo=self._memo_record)
+        self.predictor_engine = PredictorEngine(self.raw_df, self.player_df, ball_index=self.ball_index, window_cache=self.window_cache, scorecard=self.scorecard, renderer=self.renderer, memo=self._memo_record)
+
+        # 10. New Data Version (Memoised reports of the previous load are never served again)
+        self._live_stamp = self._source_stamp()
+        self.result_cache.new_version(self._data_digest())
+
+    def _source_stamp(self):
+        """
+        Fingerprint of the inputs that change WITHOUT a reload: phase CSV (re-read by PhaseStore.load)
+        and the config values (StyleIndex re-tags on a BOWLER_STYLES edit, roles / model constants are
+        read per call). Checked on every memoised call: a change starts a new data version (memory + disk keys).
+        """
+        phase = None
+        if os.path.exists(PHASE_FILE):
+            st = os.stat(PHASE_FILE)
+            phase = (st.st_size, st.st_mtime_ns)
+        return (phase, self._config_digest())
+
+    @staticmethod
+    def _config_digest():
+        """Digest of every UPPER_CASE value in config/teams.py + config/settings.py (BOWLER_STYLES, PLAYER_ROLES, weights...)."""
+        values = [(mod.__name__, k, v) for mod in (teams_config, settings_config) for k, v in sorted(vars(mod).items()) if k.isupper()]
+        return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+    def _data_digest(self):
+        """Fingerprint of the inputs (size + mtime of every source file, venue map, config values) for the on-disk cache."""
+        parts = [VENUE_REGISTRY.digest, self._config_digest()]
+        for path in [self.filepath] + SOURCE_FILES:
+            if os.path.exists(path):
+                st = os.stat(path)
+                parts.append(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}")
+            else:
+                parts.append(f"{path}:missing")
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
 
     def reload_database(self):
         """Public method to trigger the reload safely."""
@@ -119,6 +201,8 @@ class CricketAnalyzer:
         if os.path.exists(CACHE_PATH):
             os.remove(CACHE_PATH)
             print("🗑️ Cache cleared.")
+        # Evict shared window views (they point into the old raw_df)
+        if hasattr(self, 'window_cache'): self.window_cache.clear()
         self.load_data()
         print("✅ DATABASE RELOAD COMPLETE.\n")
 
@@ -131,17 +215,11 @@ class CricketAnalyzer:
         for col in ['wides', 'noballs', 'wide', 'no_ball']:
             if col in self.raw_df.columns: self.raw_df[col] = self.raw_df[col].fillna(0)
 
-        w_col = 'wides' if 'wides' in self.raw_df.columns else 'wide'
-        n_col = 'noballs' if 'noballs' in self.raw_df.columns else 'no_ball'
-        
-        # Legal Ball Logic
-        if w_col in self.raw_df.columns and n_col in self.raw_df.columns:
-            self.raw_df['is_legal_ball'] = ((self.raw_df[w_col] == 0) & (self.raw_df[n_col] == 0)).astype(int)
-        else:
-            self.raw_df['is_legal_ball'] = 1 
+        # Derived Delivery Columns (Legal ball, bowler wicket, bowler runs, over, phase)
+        add_delivery_columns(self.raw_df)
 
         # Group by Innings
-        innings_stats = self.raw_df.groupby(['match_id', 'innings']).agg({
+        innings_stats = self.raw_df.groupby(['match_id', 'innings'], sort=False).agg({ # pivot sorts
             'runs_off_bat': 'sum', 'extras': 'sum',
             'is_legal_ball': 'sum', wicket_col: agg_func_wicket 
         }).reset_index()
@@ -150,15 +228,20 @@ class CricketAnalyzer:
         innings_stats.rename(columns={wicket_col: 'wickets', 'is_legal_ball': 'legal_balls'}, inplace=True)
         innings_stats['total_score'] = innings_stats['runs_off_bat'] + innings_stats['extras']
         
-        def format_score(row):
-            return f"{int(row['total_score'])}/{int(row['wickets'])} ({row['legal_balls'] // 6}.{row['legal_balls'] % 6})"
-
-        innings_stats['score_display'] = innings_stats.apply(format_score, axis=1)
-
-        scores = innings_stats.pivot(index='match_id', columns='innings', values='total_score').add_prefix('score_inn').reset_index()
-        balls = innings_stats.pivot(index='match_id', columns='innings', values='legal_balls').add_prefix('balls_inn').reset_index()
-        wickets = innings_stats.pivot(index='match_id', columns='innings', values='wickets').add_prefix('wickets_inn').reset_index()
-        display_s = innings_stats.pivot(index='match_id', columns='innings', values='score_display').add_prefix('display_inn').reset_index()
+        # Vectorised "250/7 (50.0)" display string
+        lb = innings_stats['legal_balls'].astype(np.int64)
+        innings_stats['score_display'] = (
+            innings_stats['total_score'].astype(np.int64).astype(str) + '/' + innings_stats['wickets'].astype(np.int64).astype(str)
+            + ' (' + (lb // 6).astype(str) + '.' + (lb % 6).astype(str) + ')'
+        )
+
+        # ONE pivot over every per-innings value -> score_inn1, score_inn2, balls_inn1, ...
+        prefixes = {'total_score': 'score_inn', 'legal_balls': 'balls_inn', 'wickets': 'wickets_inn', 'score_display': 'display_inn'}
+        per_innings = innings_stats.pivot(index='match_id', columns='innings', values=list(prefixes))
+        per_innings.columns = [f"{prefixes[v]}{i}" for v, i in per_innings.columns]
+        # Mixed values pivot as object -> numbers back to float64 (abandoned innings leave gaps)
+        numeric = [c for c in per_innings.columns if not c.startswith('display_inn')]
+        per_innings[numeric] = per_innings[numeric].astype(np.float64)
         
         # 🚨 ROBUST COLUMN SELECTION
         # Only select columns that definitely exist
@@ -174,116 +257,170 @@ class CricketAnalyzer:
             
         meta.rename(columns={'batting_team': 'team_bat_1', 'bowling_team': 'team_bat_2'}, inplace=True)
         
-        self.match_df = pd.merge(meta, scores, on='match_id', how='left')
-        self.match_df = pd.merge(self.match_df, balls, on='match_id', how='left')
-        self.match_df = pd.merge(self.match_df, wickets, on='match_id', how='left')
-        self.match_df = pd.merge(self.match_df, display_s, on='match_id', how='left')
+        self.match_df = pd.merge(meta, per_innings.reset_index(), on='match_id', how='left')
         
         self.match_df.fillna(0, inplace=True)
         self.match_df['is_defended'] = self.match_df['winner'] == self.match_df['team_bat_1']
         self.match_df['is_chased'] = self.match_df['winner'] == self.match_df['team_bat_2']
 
+        # Precomputed Status / Winner Codes (No Result, Short Innings, D/L)
+        add_match_status(self.match_df)
+
     def _fix_ambiguous_venues(self):
         print("   🔧 Auto-Fixing Ambiguous Venues...")
-        def fix(row):
-            if row['venue'] == 'The Oval':
-                month = row['start_date'].month
-                if 'West Indies' in [row['team_bat_1'], row['team_bat_2']] and month < 6: return 'Kensington Oval, Barbados'
-                elif 'New Zealand' in [row['team_bat_1'], row['team_bat_2']] and month in [11, 12, 1, 2, 3]: return 'University Oval, Dunedin'
-                return 'The Oval, London'
-            return row['venue']
-        self.match_df['venue'] = self.match_df.apply(fix, axis=1)
+        df = self.match_df
+        month = df['start_date'].dt.month
+        plays = lambda team: (df['team_bat_1'] == team) | (df['team_bat_2'] == team)
+        is_oval = df['venue'] == 'The Oval'
+        df['venue'] = np.select(
+            [is_oval & plays('West Indies') & (month < 6),
+             is_oval & plays('New Zealand') & month.isin([11, 12, 1, 2, 3]),
+             is_oval],
+            ['Kensington Oval, Barbados', 'University Oval, Dunedin', 'The Oval, London'],
+            default=df['venue'].to_numpy()
+        )
 
     def _smart_standardize_venues(self):
         print("   🧠 Applying Smart Venue Matching (Exact -> Substring -> Fuzzy)...")
-        unique_raw = self.match_df['venue'].unique()
-        corrections = {}
-        
-        clean_keys = {self._clean_string(k): k for k in VENUE_MAP.keys()}
-        
-        for raw in unique_raw:
-            if not isinstance(raw, str): continue
-            
-            if raw in VENUE_MAP:
-                corrections[raw] = VENUE_MAP[raw]; continue
-            
-            clean_raw = self._clean_string(raw)
-            
-            if clean_raw in clean_keys:
-                corrections[raw] = VENUE_MAP[clean_keys[clean_raw]]; continue
-            
-            found_substring = False
-            for c_key, original_key in clean_keys.items():
-                if len(c_key) > 5 and c_key in clean_raw:
-                    corrections[raw] = VENUE_MAP[original_key]
-                    found_substring = True
-                    break
-            
-            if found_substring: continue
-
-            matches = difflib.get_close_matches(raw, VENUE_MAP.keys(), n=1, cutoff=0.80)
-            if matches: corrections[raw] = VENUE_MAP[matches[0]]
-            else: corrections[raw] = raw 
-            
+        # Resolutions persist next to the pickle cache (invalidated when venues.py changes)
+        resolver = VENUE_REGISTRY.resolver(cache_path=self.filepath.replace('.csv', '_venues.json'))
+        corrections = resolver.resolve_all(self.match_df['venue'].unique())
         self.match_df['venue'] = self.match_df['venue'].map(corrections).fillna(self.match_df['venue'])
 
-    def _clean_string(self, s):
-        return re.sub(r'[^\w\s]', '', str(s)).lower().strip()
+    def _tag_delivery_venues(self):
+        """Copies the cleaned match_df venue onto every delivery as a categorical 'venue_id'."""
+        print("   🏷️ Tagging Deliveries with Venue IDs...")
+        venue_by_match = self.match_df.set_index('match_id')['venue']
+        self.raw_df['venue_id'] = pd.Categorical(self.raw_df['match_id'].map(venue_by_match))
 
     # =================================================================================
     # 3. DELEGATED METHODS (The Interface connects to these)
     # =================================================================================
 
+    def _check_sources(self):
+        stamp = self._source_stamp()
+        if stamp != self._live_stamp: # Phase CSV rewritten -> PhaseStore re-reads it, cached reports are stale
+            self._live_stamp = stamp
+            self.result_cache.new_version(self._data_digest())
+
+    def _memo(self, fn, *args, **kwargs):
+        """Memoised engine call (same inputs + same day + same data -> cached result, output replayed)."""
+        self._check_sources()
+        return self.result_cache.call(fn, args, kwargs)
+
+    def _memo_record(self, fn, *args, **kwargs):
+        """Memoised compute call: only the result record is cached, the caller renders it (nothing recorded)."""
+        self._check_sources()
+        return self.result_cache.call(fn, args, kwargs, record=False)
+
+    def cache_stats(self):
+        return self.result_cache.stats()
+
+    def clear_cache(self, disk=False):
+        self.result_cache.clear()
+        if disk and self.result_cache.store is not None: self.result_cache.store.clear()
+
+    def set_renderer(self, renderer):
+        """Swap the output of every analyze_* report (e.g. NullRenderer for batch runs). Cached output is kept per renderer."""
+        self.renderer = renderer
+        self.player_engine.predictor.renderer = renderer
+        for eng in (self.team_engine, self.player_engine, self.predictor_engine): eng.renderer = renderer
+        self.result_cache.variant = type(renderer).__name__
+
+    # --- COMPUTE API (Result records, nothing rendered) ---
+
+    def fortress_report(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.fortress_report, *args, **kwargs)
+
+    def global_h2h_report(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.global_h2h_report, *args, **kwargs)
+
+    def country_h2h_report(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.country_h2h_report, *args, **kwargs)
+
+    def team_reports(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.team_reports, *args, **kwargs)
+
+    def score_prediction(self, *args, **kwargs):
+        return self._memo_record(self.predictor_engine.score_prediction, *args, **kwargs)
+
+    def squad_comparison(self, *args, **kwargs):
+        return self._memo_record(self.player_engine.squad_comparison, *args, **kwargs)
+
+    def player_profile(self, *args, **kwargs):
+        return self._memo_record(self.player_engine.player_profile, *args, **kwargs)
+
+    def query_matches(self, spec):
+        """match_df records of a MatchFilter (core/match_index.py). Not memoised: a query is a few bitmap ANDs."""
+        return self.team_engine.query(spec)
+
+    # --- REPORTS (Rendered through the active renderer) ---
+
     def analyze_home_fortress(self, *args, **kwargs):
-        return self.team_engine.analyze_home_fortress(*args, **kwargs)
+        return self.team_engine.analyze_home_fortress(*args, **kwargs) # Renders the memoised record
 
     def analyze_venue_matchup(self, stadium_name, home_team, opp_team, years_back=5, recorder=None):
         return self.team_engine.analyze_home_fortress(stadium_name, home_team, opp_team, years_back, recorder)
 
     def analyze_venue_phases(self, *args, **kwargs):
-        return self.team_engine.analyze_venue_phases(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_venue_phases, *args, **kwargs)
 
     def analyze_venue_bias(self, *args, **kwargs):
-        return self.team_engine.analyze_venue_bias(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_venue_bias, *args, **kwargs)
+
+    def venue_bias_table(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.venue_bias_table, *args, **kwargs)
+
+    def venue_phase_seasons(self, *args, **kwargs):
+        return self._memo_record(self.team_engine.venue_phase_seasons, *args, **kwargs)
 
     def analyze_global_h2h(self, *args, **kwargs):
-        return self.team_engine.analyze_global_h2h(*args, **kwargs)
+        return self.team_engine.analyze_global_h2h(*args, **kwargs) # Renders the memoised record
 
     def analyze_country_h2h(self, *args, **kwargs):
-        return self.team_engine.analyze_country_h2h(*args, **kwargs)
+        return self.team_engine.analyze_country_h2h(*args, **kwargs) # Renders the memoised record
 
     def analyze_home_dominance(self, *args, **kwargs):
-        return self.team_engine.analyze_home_dominance(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_home_dominance, *args, **kwargs)
 
     def analyze_away_performance(self, *args, **kwargs):
-        return self.team_engine.analyze_away_performance(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_away_performance, *args, **kwargs)
 
     def analyze_global_performance(self, *args, **kwargs):
-        return self.team_engine.analyze_global_performance(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_global_performance, *args, **kwargs)
 
     def analyze_continent_performance(self, *args, **kwargs):
-        return self.team_engine.analyze_continent_performance(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_continent_performance, *args, **kwargs)
 
     def analyze_team_form(self, *args, **kwargs):
-        return self.team_engine.analyze_team_form(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_team_form, *args, **kwargs)
     
     def check_recent_form(self, *args, **kwargs):
-        return self.team_engine.analyze_team_form(*args, **kwargs)
+        return self._memo(self.team_engine.analyze_team_form, *args, **kwargs)
+
+    def suggest_players(self, *args, **kwargs):
+        return self.player_engine.suggest_players(*args, **kwargs)
 
     def get_active_squad(self, *args, **kwargs):
         return self.player_engine.get_active_squad(*args, **kwargs)
 
     def compare_squads(self, *args, **kwargs):
-        return self.player_engine.compare_squads(*args, **kwargs)
+        return self.player_engine.compare_squads(*args, **kwargs) # Renders the memoised record
+
+    def squad_metrics(self, *args, **kwargs):
+        return self._memo_record(self.player_engine.squad_metrics, *args, **kwargs)
+
+    def head_to_head_matrix(self, *args, **kwargs):
+        return self._memo_record(self.player_engine.head_to_head_matrix, *args, **kwargs)
 
     def analyze_player_profile(self, *args, **kwargs):
-        return self.player_engine.analyze_player_profile(*args, **kwargs)
+        return self.player_engine.analyze_player_profile(*args, **kwargs) # Renders the memoised record
 
     def predict_score(self, *args, **kwargs):
-        return self.predictor_engine.predict_score(*args, **kwargs)
+        return self.predictor_engine.predict_score(*args, **kwargs) # Renders the memoised record
     
     def get_last_match_xi(self, team_name):
-        return self.player_engine.get_last_match_xi(team_name)
+        return self._memo_record(self.player_engine.get_last_match_xi, team_name)
     
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ class TraderCockpit:
     - UX Fixes: Soft Slate Output, Slimmer Buttons.
     - Logic: 100% Manual Mode preserved (All functions intact).
     """
+    TYPEAHEAD_LIMIT = 50 # Player suggestions shown while typing
 
     def __init__(self, bot_instance):
         # 🧠 UNDERSTANDING & CONTEXT:
@@ -22,10 +23,8 @@ class TraderCockpit:
         
         self.continents = ['All', 'Asia', 'Europe', 'Oceania', 'Africa', 'Americas']
 
-        if not self.bot.player_df.empty:
-            self.all_players = sorted(self.bot.player_df['player'].dropna().unique().tolist())
-        else:
-            self.all_players = []
+        # Player Directory (built once at load) -> names + server-side type-ahead
+        self.all_players = list(self.bot.player_engine.all_players)
             
         # 2. DEFINE THEMES (Added for Switcher)
         self.themes = {
@@ -212,7 +211,7 @@ class TraderCockpit:
         # 👇 1. SINGLE PLAYER WIDGETS
         self.player_select = widgets.Combobox(
             placeholder='Search Player (e.g. V Kohli)...',
-            options=self.all_players,
+            options=self.bot.suggest_players('', self.TYPEAHEAD_LIMIT),
             description='👤 Player:',
             ensure_option=False,
             layout=widgets.Layout(width='65%')
@@ -276,6 +275,7 @@ class TraderCockpit:
         self.home_select.observe(self.update_home_list, names='value')
         self.away_select.observe(self.update_away_list, names='value')
         
+        self.player_select.observe(self.update_player_suggestions, names='value')
         self.btn_player.on_click(self.run_player_analysis)
         
         self.btn_home_add.on_click(self.add_home_player)
@@ -447,6 +447,10 @@ class TraderCockpit:
         new_names = [p for p in current_names if p not in selected_names]
         self.away_squad_box.options = self._format_squad_list(new_names)
 
+    def update_player_suggestions(self, change):
+        # Type-ahead: prefix matches on name / surname, most recently active first
+        self.player_select.options = self.bot.suggest_players(change['new'] or '', self.TYPEAHEAD_LIMIT)
+
     def clear_home_squad(self, b): self.home_squad_box.options = []
     def clear_away_squad(self, b): self.away_squad_box.options = []
 
@@ -471,6 +475,8 @@ class TraderCockpit:
             self.bot.reload_database()
             self.all_venues = sorted([str(v) for v in self.bot.match_df['venue'].unique() if str(v) != 'nan'])
             self.venue_select.options = self.all_venues
+            self.all_players = list(self.bot.player_engine.all_players)
+            self.player_select.options = self.bot.suggest_players(self.player_select.value or '', self.TYPEAHEAD_LIMIT)
             print("✅ Dashboard Updated with New Data!")
             self.btn_refresh.description = "🔄 Reload Database"
 
@@ -8,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 
 from engine import CricketAnalyzer
 from utils.test_recorder import SnapshotRecorder
+from core.report_batch import Scenario, COUNTRY_H2H
 
 # CONFIGURATION
 TEAMS = [
@@ -21,7 +22,7 @@ EXPECTED_FILE = os.path.join(FIXTURES_DIR, "analyze_country_h2h_expected_results
 LATEST_FILE = os.path.join(FIXTURES_DIR, "analyze_country_h2h_latest_test_run_results.json")
 FINAL_REPORT_FILE = os.path.join(FIXTURES_DIR, "analyze_country_h2h_test_report.json")
 
-def generate_data():
+def generate_data(workers=None):
     print(f"🚀 Starting Country H2H Benchmark Generation...")
     
     print("⚙️ Loading Engine...")
@@ -41,37 +42,39 @@ def generate_data():
 
     # STRATEGY: Host Nation vs The World
     # For every Host Country (Home Team), check performance vs every Visitor
-    for host_country in TEAMS:
-        print(f"\n🗺️  Analyzing Host Country: {host_country.upper()}")
+    # (Home Team is the Host; all scenarios in ONE grouped pass, core/report_batch.py)
+    plan = [(host_country, opp_team) for host_country in TEAMS for opp_team in TEAMS if opp_team != host_country]
+    try:
+        reports = engine.team_reports([Scenario(COUNTRY_H2H, host, opp, country=host, years_back=10) for host, opp in plan], workers=workers, audit=False)
+    except Exception as e:
+        print(f"❌ Batch failed: {e}")
+        reports = [e] * len(plan)
+
+    last_host = None
+    for (host_country, opp_team), report in zip(plan, reports):
+        if host_country != last_host:
+            print(f"\n🗺️  Analyzing Host Country: {host_country.upper()}")
+            last_host = host_country
+        home_team = host_country
+
+        # Key Format: "Host -> Home vs Opponent"
+        scenario_key = f"{host_country}: {home_team} vs {opp_team}"
+        print(f"   ⚔️  vs {opp_team}...")
         
-        home_team = host_country # In this context, Home Team is the Host
-        opponents = [t for t in TEAMS if t != home_team]
+        if isinstance(report, Exception):
+            output_data[scenario_key] = {"error": str(report)}
+            continue
+
+        result = report.rows() if report is not None else "No data available"
         
-        for opp_team in opponents:
-            # Key Format: "Host -> Home vs Opponent"
-            scenario_key = f"{host_country}: {home_team} vs {opp_team}"
-            print(f"   ⚔️  vs {opp_team}...")
-            
-            try:
-                # Core Function Call
-                # analyze_country_h2h(home_team, opp_team, country_name, years_back=10)
-                result = engine.analyze_country_h2h(home_team, opp_team, country_name=host_country, years_back=10)
-                
-                if result is None:
-                    result = "No data available"
-                
-                output_data[scenario_key] = {
-                    "home_team": home_team,
-                    "opp_team": opp_team,
-                    "host_country": host_country,
-                    "years_back": 10,
-                    "expected_output": recorder._serialize(result)
-                }
-                total_tests += 1
-                
-            except Exception as e:
-                print(f"     ❌ Error: {e}")
-                output_data[scenario_key] = {"error": str(e)}
+        output_data[scenario_key] = {
+            "home_team": home_team,
+            "opp_team": opp_team,
+            "host_country": host_country,
+            "years_back": 10,
+            "expected_output": recorder._serialize(result)
+        }
+        total_tests += 1
 
     # Save Latest
     with open(LATEST_FILE, 'w') as f:
@@ -130,9 +133,10 @@ def merge_results():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--merge", action="store_true", help="Update expected results with latest run")
+    parser.add_argument("--workers", type=int, default=None, help="Spread the scenarios over N processes")
     args = parser.parse_args()
     
-    generate_data()
+    generate_data(workers=args.workers)
     
     if args.merge:
         merge_results()
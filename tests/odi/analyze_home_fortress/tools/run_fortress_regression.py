@@ -12,6 +12,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 from engine import CricketAnalyzer
 from venues import VENUE_MAP
 from utils.test_recorder import SnapshotRecorder
+from core.report_batch import Scenario, FORTRESS
 
 # CONFIGURATION
 TEAMS = [
@@ -50,7 +51,7 @@ def get_unique_venues_for_team(team_name):
     
     return list(unique_venues.values())
 
-def generate_data():
+def generate_data(workers=None):
     print(f"🚀 Starting Fortress Benchmark Generation...")
     
     print("⚙️ Loading Engine...")
@@ -68,37 +69,38 @@ def generate_data():
     
     total_tests = 0
 
-    for home_team in TEAMS:
-        print(f"\n🏠 Analyzing Fortress: {home_team.upper()}")
-        venues = get_unique_venues_for_team(home_team)
+    # Every (home team, venue) scenario in ONE grouped pass (core/report_batch.py)
+    plan = [(home_team, stadium) for home_team in TEAMS for stadium in get_unique_venues_for_team(home_team)]
+    try:
+        reports = engine.team_reports([Scenario(FORTRESS, home_team, 'All', venue=stadium, years_back=10) for home_team, stadium in plan], workers=workers, audit=False)
+    except Exception as e:
+        print(f"❌ Batch failed: {e}")
+        reports = [e] * len(plan)
+
+    last_team = None
+    for (home_team, stadium), report in zip(plan, reports):
+        if home_team != last_team:
+            print(f"\n🏠 Analyzing Fortress: {home_team.upper()}")
+            last_team = home_team
+
+        # We group by Venue
+        venue_key = f"{home_team} at {stadium}"
+        output_data[venue_key] = {}
+        print(f"   🏟️  {stadium}...")
         
-        if not venues:
+        # Test Case: "All" Opponents (Global Fortress View)
+        if isinstance(report, Exception):
+            output_data[venue_key]["vs All"] = {"error": str(report)}
             continue
 
-        for stadium in venues:
-            # We group by Venue
-            venue_key = f"{home_team} at {stadium}"
-            output_data[venue_key] = {}
-            print(f"   🏟️  {stadium}...")
-            
-            # Test Case: "All" Opponents (Global Fortress View)
-            try:
-                # Core Function Call
-                result = engine.analyze_home_fortress(stadium, home_team, opp_team='All', years_back=10)
-                
-                if result is None:
-                    result = "No data available"
-                
-                output_data[venue_key]["vs All"] = {
-                    "opponent": "All",
-                    "years_back": 10,
-                    "expected_output": recorder._serialize(result)
-                }
-                total_tests += 1
-                
-            except Exception as e:
-                print(f"     ❌ Error: {e}")
-                output_data[venue_key]["vs All"] = {"error": str(e)}
+        result = report.rows() if report is not None else "No data available"
+        
+        output_data[venue_key]["vs All"] = {
+            "opponent": "All",
+            "years_back": 10,
+            "expected_output": recorder._serialize(result)
+        }
+        total_tests += 1
 
     # Save Latest
     with open(LATEST_FILE, 'w') as f:
@@ -166,9 +168,10 @@ def merge_results():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--merge", action="store_true", help="Update expected results with latest run")
+    parser.add_argument("--workers", type=int, default=None, help="Spread the scenarios over N processes")
     args = parser.parse_args()
     
-    generate_data()
+    generate_data(workers=args.workers)
     
     if args.merge:
         merge_results()
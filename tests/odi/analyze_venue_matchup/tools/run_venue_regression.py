@@ -14,6 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.
 from engine import CricketAnalyzer
 from venues import VENUE_MAP
 from utils.test_recorder import SnapshotRecorder
+from core.report_batch import Scenario, FORTRESS
 
 # CONFIGURATION
 TEAMS = [
@@ -47,37 +48,34 @@ def get_unique_venues_for_team(team_name):
             unique_venues[master_id] = raw_name 
     return list(unique_venues.values())
 
-def generate_latest_results(engine, recorder):
-    """Generates the LATEST results."""
+def generate_latest_results(engine, recorder, workers=None):
+    """Generates the LATEST results (every venue x opponent scenario in ONE grouped pass)."""
     print("🚀 Generating Latest Test Run Results...")
     results = {"Teams considered": TEAMS}
     
-    for home_team in TEAMS:
-        venues = get_unique_venues_for_team(home_team)
-        if not venues: continue
+    plan = [(home_team, stadium, away_team) for home_team in TEAMS for stadium in get_unique_venues_for_team(home_team)
+            for away_team in TEAMS if away_team != home_team]
+    try:
+        reports = engine.team_reports([Scenario(FORTRESS, home, away, venue=stadium, years_back=5) for home, stadium, away in plan], workers=workers, audit=False)
+    except Exception as e:
+        reports = [e] * len(plan)
 
-        for stadium in venues:
-            section_key = f"{home_team} vs all remaining teams results at {stadium}"
+    for (home_team, stadium, away_team), report in zip(plan, reports):
+        section_key = f"{home_team} vs all remaining teams results at {stadium}"
+        if section_key not in results:
             results[section_key] = {}
             print(f"   Analysing: {section_key}...")
-            
-            for away_team in TEAMS:
-                if home_team == away_team: continue
-                matchup_key = f"{home_team} vs {away_team}"
-                
-                try:
-                    res = engine.analyze_venue_matchup(stadium, home_team, away_team)
-                    if res is None: res = "No data available"
-                    
-                    results[section_key][matchup_key] = {
-                        "home_team": home_team, "opp_team": away_team, "years_back": 5,
-                        "expected_output": recorder._serialize(res)
-                    }
-                except Exception as e:
-                    results[section_key][matchup_key] = {
-                        "home_team": home_team, "opp_team": away_team, "years_back": 5,
-                        "expected_output": f"Error: {str(e)}"
-                    }
+        matchup_key = f"{home_team} vs {away_team}"
+        
+        if isinstance(report, Exception):
+            res = f"Error: {str(report)}"
+        else:
+            res = recorder._serialize(report.rows() if report is not None else "No data available")
+        
+        results[section_key][matchup_key] = {
+            "home_team": home_team, "opp_team": away_team, "years_back": 5,
+            "expected_output": res
+        }
     
     with open(LATEST_FILE, 'w') as f:
         json.dump(results, f, indent=4)
@@ -160,6 +158,7 @@ def merge_results():
 def main():
     parser = argparse.ArgumentParser(description="Run Venue Regression Tests")
     parser.add_argument("--merge", action="store_true", help="Merge latest results into expected results (Update Snapshots)")
+    parser.add_argument("--workers", type=int, default=None, help="Spread the scenarios over N processes")
     args = parser.parse_args()
 
     if args.merge:
@@ -178,7 +177,7 @@ def main():
                 print("⚠️ No expected results found. First run will be baseline.")
             
             # 2. Run & Save Latest
-            latest_data = generate_latest_results(engine, recorder)
+            latest_data = generate_latest_results(engine, recorder, workers=args.workers)
             
             # 3. Compare
             compare_results(expected_data, latest_data)
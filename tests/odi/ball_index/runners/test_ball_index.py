@@ -0,0 +1,43 @@
+import datetime
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.window_cache import window_cutoff
+from tests.tools.synthetic_data import SyntheticEngineTestCase
+
+class TestBallIndexWindows(SyntheticEngineTestCase):
+    """BallIndex.window / WindowCache.window (core/ball_index.py) == raw_df[start_date >= cutoff] on the synthetic dataset."""
+
+    def cutoffs(self):
+        dates = self.engine.raw_df['start_date'].drop_duplicates()
+        mid = dates.iloc[len(dates) // 2]
+        return [
+            pd.Timestamp.min,                  # All Time (window_cutoff(None)): ns floor, not a wrapped us value
+            window_cutoff(None), window_cutoff(3), window_cutoff(10),
+            dates.iloc[0], mid, mid + pd.Timedelta(days=1), mid + pd.Timedelta(hours=12), dates.iloc[-1],
+            datetime.date(mid.year, 1, 1), pd.Timestamp('2100-01-01'),
+        ]
+
+    def test_window_matches_mask(self):
+        raw = self.engine.raw_df
+        for cutoff in self.cutoffs():
+            with self.subTest(cutoff=cutoff):
+                expected = np.flatnonzero((raw['start_date'] >= pd.Timestamp(cutoff)).to_numpy())
+                got = self.engine.ball_index.window(cutoff)
+                np.testing.assert_array_equal(raw.index.get_indexer(got.index), expected)
+
+    def test_all_time_is_every_dated_ball(self):
+        raw = self.engine.raw_df
+        self.assertEqual(self.engine.ball_index.window_start(pd.Timestamp.min), 0)
+        self.assertEqual(len(self.engine.ball_index.window(window_cutoff(None))), raw['start_date'].notna().sum())
+        self.assertEqual(len(self.engine.window_cache.window(window_cutoff(None))), raw['start_date'].notna().sum())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, squad_of
+
+BOWLER_WICKETS = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+def reference_matchups(raw_df, batter, bowlers):
+    """The per-batter scan head_to_head_matrix replaced (the old _display_batter_vs_bowlers): {bowler: (Runs, Balls, Outs, SR, Avg)}."""
+    batter_df = raw_df[(raw_df['striker'] == batter) & (raw_df['bowler'].isin(bowlers))]
+    stats = batter_df.groupby('bowler').agg({
+        'runs_off_bat': 'sum', 'match_id': 'count',
+        'wicket_type': lambda x: x.isin(BOWLER_WICKETS).sum(),
+    })
+    rows = {}
+    for b, (r, bl, o) in stats.iterrows():
+        rows[b] = (r, bl, o, round(r / bl * 100, 1) if bl > 0 else 0, round(r / o, 1) if o > 0 else r)
+    return rows
+
+class TestHeadToHead(SyntheticEngineTestCase):
+    """head_to_head_matrix (core/player_engine.py) == the per-batter raw_df scans, on full 50-over synthetic innings."""
+    DATA_KWARGS = {'n_matches': 24, 'balls_per_innings': 300} # Long enough for 3+ dismissals (bunnies)
+
+    def check(self, batters, bowlers):
+        matrix = self.engine.player_engine.head_to_head_matrix(batters, bowlers)
+        self.assertEqual(list(matrix.columns), ['batter', 'bowler', 'Runs', 'Balls', 'Outs', 'SR', 'Avg'])
+        got = {(r.batter, r.bowler): (r.Runs, r.Balls, r.Outs, r.SR, r.Avg) for r in matrix.itertuples()}
+        expected = {(bat, bowl): v for bat in dict.fromkeys(batters) for bowl, v in reference_matchups(self.engine.raw_df, bat, bowlers).items()}
+        self.assertEqual(got, expected)
+        return matrix
+
+    def test_squads_match_reference(self):
+        for team in TEAMS:
+            for opp in TEAMS:
+                if opp == team: continue
+                with self.subTest(team=team, opp=opp):
+                    matrix = self.check(squad_of(team), squad_of(opp))
+                    self.assertFalse(matrix.empty)
+        # Both Avg branches (with / without a dismissal) and bunnies are reached
+        matrix = self.engine.player_engine.head_to_head_matrix([p for t in TEAMS for p in squad_of(t)], [p for t in TEAMS for p in squad_of(t)])
+        self.assertTrue((matrix['Outs'] == 0).any() and (matrix['Outs'] >= 3).any())
+
+    def test_edge_inputs(self):
+        self.check(['Ind Bat0', 'Ind Bat0', 'Nobody'], ['Aus Bowl0', 'Aus Bowl0', 'Ind Bowl1', 'Nobody'])
+        self.check(['Ind Bat0'], ['Ind Bat1']) # Never met
+        self.assertTrue(self.engine.player_engine.head_to_head_matrix([], ['Aus Bowl0']).empty)
+        self.assertTrue(self.engine.player_engine.head_to_head_matrix(['Ind Bat0'], []).empty)
+
+    def test_batter_matchup_rows(self):
+        pe = self.engine.player_engine
+        bowlers = squad_of('Australia')
+        matrix = pe.head_to_head_matrix(squad_of('India'), bowlers)
+        for batter in squad_of('India'):
+            expected = reference_matchups(self.engine.raw_df, batter, bowlers)
+            with self.subTest(batter=batter):
+                data = pe._batter_matchup(batter, bowlers, matrix)
+                if not expected:
+                    self.assertIsNone(data)
+                    continue
+                # Same rows whether the matrix is shared or built on demand, most balls first
+                pd.testing.assert_frame_equal(data.reset_index(drop=True), pe._batter_matchup(batter, bowlers).reset_index(drop=True))
+                self.assertEqual(data['Balls'].tolist(), sorted(data['Balls'], reverse=True))
+                got = {r.RawName: (r.Runs, r.Balls, r.Outs, r.SR, r.Avg) for r in data.itertuples()}
+                self.assertEqual(got, expected)
+                self.assertEqual(data['Bowler'].str.contains('Bunny').tolist(), (data['Outs'] >= 3).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.match_index import MatchFilter, MatchIndex
+from core.team_view import add_venue_geography, build_team_view
+from tests.tools.synthetic_data import synthetic_engine
+
+def mask_positions(match_df, team_view, spec):
+    """The boolean-mask filters MatchIndex replaced (team_view.loc[team], == / isin / str.contains, start_date >= cutoff)."""
+    if spec.team is not None:
+        df = team_view
+        mask = np.asarray(team_view.index == spec.team)
+    else:
+        df = match_df
+        mask = np.ones(len(match_df), dtype=bool)
+    if spec.opponent is not None: mask &= (df['opponent'] == spec.opponent).to_numpy()
+    for dim in ('venue', 'host_country', 'continent'):
+        value = getattr(spec, dim)
+        if value is None: continue
+        values = list(value) if isinstance(value, tuple) else [value]
+        mask &= df[dim].astype(object).isin(values).to_numpy()
+    if spec.season is not None:
+        seasons = list(spec.season) if isinstance(spec.season, tuple) else [spec.season]
+        mask &= pd.to_datetime(df['start_date']).dt.year.isin(seasons).to_numpy()
+    if spec.away_from is not None: mask &= (df['host_country'].astype(object) != spec.away_from).to_numpy()
+    if spec.venue_text is not None: mask &= df['venue'].astype(str).str.contains(spec.venue_text, case=False, regex=False).to_numpy()
+    if spec.since is not None: mask &= (pd.to_datetime(df['start_date']) >= pd.Timestamp(spec.since)).to_numpy()
+    return np.flatnonzero(mask)
+
+class TestMatchIndex(unittest.TestCase):
+    """MatchIndex.select(MatchFilter(...)) == the old pandas masks, on the synthetic dataset."""
+    @classmethod
+    def setUpClass(cls):
+        with synthetic_engine() as engine: match_df = engine.match_df
+
+        # Undated matches and a venue outside the registry (raw CSVs have both)
+        match_df = match_df.drop(columns=['host_country', 'continent'])
+        match_df.loc[[3, 17], 'start_date'] = pd.NaT
+        match_df.loc[[5, 29], 'venue'] = 'Unlisted Oval'
+        cls.match_df = add_venue_geography(match_df)
+        cls.team_view = build_team_view(cls.match_df)
+        cls.index = MatchIndex(cls.match_df, cls.team_view)
+
+        dates = cls.match_df['start_date'].dropna().sort_values()
+        cls.first_day, cls.last_day = dates.iloc[0], dates.iloc[-1]
+        cls.mid_day = dates.iloc[len(dates) // 2]
+
+    def check(self, spec):
+        with self.subTest(spec=spec):
+            expected = mask_positions(self.match_df, self.team_view, spec)
+            got = self.index.select(spec)
+            np.testing.assert_array_equal(got, expected)
+            rows = self.index.match_positions(spec)
+            np.testing.assert_array_equal(rows, self.team_view['row'].to_numpy()[expected] if spec.team is not None else expected)
+
+    def test_team_and_opponent(self):
+        for team, opp in itertools.product(['India', 'Australia', 'Pakistan', 'Nowhere XI'], [None, 'England', 'India', 'Nowhere XI']):
+            self.check(MatchFilter(team=team, opponent=opp))
+
+    def test_venue_geography(self):
+        venues = [None, 'IND_KOLKATA', 'AUS_SYDNEY', 'Unlisted Oval', 'NOT_A_VENUE', ('IND_KOLKATA', 'UAE_SHARJAH')]
+        for team, venue in itertools.product([None, 'India', 'England'], venues):
+            self.check(MatchFilter(team=team, venue=venue))
+        for team, country in itertools.product([None, 'India', 'Australia'], ['India', 'Australia', 'UAE', ('India', 'UAE'), 'Atlantis']):
+            self.check(MatchFilter(team=team, host_country=country))
+            self.check(MatchFilter(team=team, away_from=country if isinstance(country, str) else None))
+        for team, continent in itertools.product([None, 'Pakistan', 'England'], ['Asia', 'Oceania', 'Europe', ('Asia', 'Europe'), 'Antarctica']):
+            self.check(MatchFilter(team=team, continent=continent))
+
+    def test_venue_text(self):
+        for team, text in itertools.product([None, 'India', 'Australia'], ['sydney', 'LORD', 'ind_', 'oval', 'no such ground']):
+            self.check(MatchFilter(team=team, venue_text=text))
+
+    def test_seasons(self):
+        for team, season in itertools.product([None, 'England'], [2017, 2020, (2018, 2024), 1999]):
+            self.check(MatchFilter(team=team, season=season))
+
+    def test_date_edges(self):
+        day = pd.Timedelta(days=1)
+        cutoffs = [
+            self.first_day, self.first_day + day,  # Cutoff day itself is in, the next day drops it
+            self.mid_day, self.mid_day + day, self.mid_day - day,
+            self.mid_day + pd.Timedelta(hours=12), # Same day, later time -> that match is out
+            self.last_day, self.last_day + day,
+            pd.Timestamp(self.mid_day.year, 1, 1), pd.Timestamp(self.mid_day.year, 12, 31),
+            pd.Timestamp('1990-01-01'), pd.Timestamp('2100-01-01'),
+            pd.Timestamp.min,                      # No window, undated matches still left out
+        ]
+        for team, since in itertools.product([None, 'India', 'Australia'], cutoffs):
+            self.check(MatchFilter(team=team, since=since))
+        self.check(MatchFilter(since=self.mid_day.date())) # datetime.date cutoffs behave like Timestamps
+
+    def test_combined(self):
+        for team, opp, since in itertools.product(['India', 'England'], [None, 'Australia', 'Pakistan'], [None, self.mid_day, self.mid_day + pd.Timedelta(days=1)]):
+            self.check(MatchFilter(team=team, opponent=opp, continent='Asia', since=since))
+            self.check(MatchFilter(team=team, opponent=opp, away_from=team, venue_text='a', since=since))
+            self.check(MatchFilter(team=team, opponent=opp, venue=('AUS_MELBOURNE', 'ENG_LONDON_LORDS', 'Unlisted Oval'), since=since))
+
+    def test_opponent_needs_a_team(self):
+        with self.assertRaises(ValueError): self.index.select(MatchFilter(opponent='India'))
+        with self.assertRaises(ValueError): self.index.team_rows(MatchFilter(venue='IND_KOLKATA'))
+
+if __name__ == '__main__':
+    unittest.main()
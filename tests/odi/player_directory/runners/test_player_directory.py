@@ -0,0 +1,77 @@
+import itertools
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.player_directory import PlayerDirectory, normalize_name
+from tests.tools.synthetic_data import TEAMS, squad_of, synthetic_engine
+
+# Stats-file names: synthetic players (interleaved, one twice) + names that never played in the synthetic data
+EXTRA = ["Virát Kohli", "V Kohli", "O'Brien K", "de Villiers AB", "AB de Villiers", "M S Dhoni", "Ab", "xy"]
+
+def reference_find(ordered, text):
+    """The scan find() replaced: exact name, else the first name (stats order) containing text, case-insensitive."""
+    if text in ordered: return text
+    q = str(text).lower()
+    return next((p for p in ordered if q in str(p).lower()), None)
+
+def reference_suggest(names, last_seen, text, limit):
+    """Names with a normalised full-name / word prefix match, most recently active first (never seen last, by name)."""
+    q = normalize_name(text)
+    hits = [n for n in names if normalize_name(n).startswith(q) or any(w.startswith(q) for w in normalize_name(n).split())]
+    never = pd.Timestamp.min
+    return sorted(hits, key=lambda n: (n not in last_seen, -(last_seen.get(n, never).value), n))[:limit]
+
+class TestPlayerDirectory(unittest.TestCase):
+    """PlayerDirectory (core/player_directory.py) find / suggest == plain scans over the names, on the synthetic Scorecard."""
+    @classmethod
+    def setUpClass(cls):
+        with synthetic_engine() as engine: scorecard = engine.scorecard
+        synthetic = [p for pair in itertools.zip_longest(*(squad_of(t) for t in TEAMS)) for p in pair]
+        names = synthetic[:10] + EXTRA[:4] + synthetic[10:] + ['Ind Bat0'] + EXTRA[4:]
+        cls.ordered = list(dict.fromkeys(names))
+        cls.directory = PlayerDirectory(pd.DataFrame({'player': names}), None, scorecard)
+        apps = pd.concat([scorecard.batting[['player', 'start_date']], scorecard.bowling[['player', 'start_date']]])
+        cls.last_seen = apps.groupby('player')['start_date'].max().to_dict()
+
+    def test_find_matches_scan(self):
+        queries = [p for p in self.ordered] + [p.lower() for p in self.ordered] + [
+            'bat', 'BAT1', 'ind b', 'aus bowl', 'bowl2', 'twelfth', 'kohli', 'Kohli', 'virát', 'villiers', "o'b", 'dhoni',
+            'a', 'ab', 'x', ' ', '', 'zzz', 'nobody', 'bat9', 'ind bat0 ', 'dia bat', 's b', 12,
+        ]
+        for q in queries:
+            with self.subTest(q=q):
+                self.assertEqual(self.directory.find(q), reference_find(self.ordered, q))
+                self.assertEqual(self.directory.find(q), reference_find(self.ordered, q)) # Memoised answer
+
+    def test_find_cache_is_bounded(self):
+        info = self.directory._found.cache_info()
+        self.assertEqual(info.maxsize, PlayerDirectory.FIND_CACHE)
+        for i in range(PlayerDirectory.FIND_CACHE + 50): self.directory.find(f"no such player {i}")
+        self.assertEqual(self.directory._found.cache_info().currsize, PlayerDirectory.FIND_CACHE)
+
+    def test_suggest_order(self):
+        names = sorted(self.ordered)
+        for text, limit in itertools.product(['ind', 'Bat', 'bat0', 'bowl', 'ab', 'de', 'v', 'kohli', 'virat', 'o brien', 'obr', 'zz', 'twelfth'], [3, 20]):
+            with self.subTest(text=text, limit=limit):
+                self.assertEqual(self.directory.suggest(text, limit), reference_suggest(names, self.last_seen, text, limit))
+        # Empty text -> most recently active overall
+        recent = self.directory.recent(5)
+        self.assertEqual(recent, sorted(self.last_seen, key=lambda p: (-self.last_seen[p].value, p))[:5])
+        self.assertEqual(self.directory.suggest('', 5), recent)
+        self.assertEqual(self.directory.suggest('  ', 5), recent)
+
+    def test_never_seen_players_rank_last(self):
+        got = self.directory.suggest('a', 50) # Active 'Aus ...' players first, then the never-seen ones by name
+        seen = [p for p in got if p in self.last_seen]
+        self.assertTrue(seen and len(seen) < len(got))
+        self.assertEqual(got[:len(seen)], seen)
+        self.assertEqual(got[len(seen):], ['AB de Villiers', 'Ab', 'Aus Twelfth', 'de Villiers AB']) # Word prefix 'AB' counts
+
+if __name__ == '__main__':
+    unittest.main()
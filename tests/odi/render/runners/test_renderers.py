@@ -0,0 +1,91 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+import core.render as render
+from core.render import HtmlRenderer, NullRenderer
+from tests.tools.synthetic_data import SyntheticEngineTestCase, quiet
+
+# Every report entry point of the facade (synthetic dataset arguments)
+REPORTS = [
+    ('analyze_home_fortress', ('IND_MUMBAI_WANKHEDE', 'India')),
+    ('analyze_home_fortress', ('Unknown Park', 'India')),
+    ('analyze_venue_matchup', ('AUS_SYDNEY', 'Australia', 'India', 10)),
+    ('analyze_global_h2h', ('India', 'Australia', 10)),
+    ('analyze_country_h2h', ('England', 'Pakistan', 'UAE', 10)),
+    ('analyze_venue_phases', ('IND_KOLKATA', 'India', 'England')),
+    ('analyze_venue_bias', ('Eden Gardens',)),
+    ('analyze_venue_bias', ('Unknown Park',)),
+    ('analyze_home_dominance', ('India',)),
+    ('analyze_away_performance', ('Pakistan', 10)),
+    ('analyze_global_performance', ('England', 10)),
+    ('analyze_continent_performance', ('Australia', 'Asia')),
+    ('analyze_continent_performance', ('Australia', 'Asia', 'India')),
+    ('analyze_team_form', ('India',)),
+    ('analyze_player_profile', ('Nobody',)),
+]
+
+class TestRenderers(SyntheticEngineTestCase):
+    """NullRenderer draws nothing for any analyze_* report; HtmlRenderer draws every one of them."""
+    ENGINE_KWARGS = {'cache_size': 0}
+
+    def run_report(self, renderer, name, args):
+        """(printed text, displayed objects) of one report call under renderer."""
+        self.engine.set_renderer(renderer)
+        shown = []
+        with mock.patch.object(render, 'display', side_effect=lambda *objs, **kw: shown.extend(objs)):
+            _, text = quiet(getattr(self.engine, name), *args)
+        return text, shown
+
+    def test_null_renderer_is_silent(self):
+        for name, args in REPORTS:
+            with self.subTest(report=name, args=args):
+                text, shown = self.run_report(NullRenderer(), name, args)
+                self.assertEqual(text, '')
+                self.assertEqual(shown, [])
+
+    def test_html_renderer_draws(self):
+        for name, args in REPORTS:
+            with self.subTest(report=name, args=args):
+                text, shown = self.run_report(HtmlRenderer(), name, args)
+                self.assertTrue(text or shown)
+
+    def test_uses_ipython_display(self):
+        """Without ipywidgets only the widgets are mocked: display / HTML stay IPython's whenever it imports."""
+        try:
+            import IPython.display as ipd
+        except ImportError:
+            self.skipTest("IPython not installed")
+        self.assertIs(render.display, ipd.display)
+        self.assertIs(render.HTML, ipd.HTML)
+
+    def test_html_renderer_output_reaches_ipython(self):
+        """Nothing patched: the H2H card, styled matrix and audit tables reach IPython's display (terminal: their repr)."""
+        try:
+            import IPython.display # noqa: F401
+        except ImportError:
+            self.skipTest("IPython not installed")
+        self.engine.set_renderer(HtmlRenderer())
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.engine.analyze_global_h2h('India', 'Australia', 10)
+            self.engine.analyze_home_dominance('India')
+        text = out.getvalue()
+        self.assertIn('IPython.core.display.HTML object', text) # H2H card
+        self.assertIn('Styler object', text)                    # Dominance matrix
+        self.assertIn('start_date', text)                       # Audit DataFrames
+
+    def test_null_renderer_keeps_return_values(self):
+        self.engine.set_renderer(HtmlRenderer())
+        drawn, _ = quiet(self.engine.analyze_home_dominance, 'India')
+        self.engine.set_renderer(NullRenderer())
+        self.assertEqual(self.engine.analyze_home_dominance('India'), drawn)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+import core.report_batch as report_batch
+from core.report_batch import COUNTRY_H2H, FORTRESS, GLOBAL_H2H, Scenario
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, quiet
+
+class TestReportBatch(SyntheticEngineTestCase):
+    """team_reports (core/report_batch.py) == the single fortress / global / country report calls."""
+    ENGINE_KWARGS = {'cache_size': 0}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        scenarios = []
+        for home in TEAMS:
+            for opp in ['All'] + [t for t in TEAMS if t != home]:
+                for years in (3, 10):
+                    for venue in ('IND_MUMBAI_WANKHEDE', 'Eden Gardens', 'AUS_SYDNEY', "Lord's", 'Unknown Park'):
+                        scenarios.append(Scenario(FORTRESS, home, opp, venue=venue, years_back=years))
+                    if opp != 'All': scenarios.append(Scenario(GLOBAL_H2H, home, opp, years_back=years))
+                    for country in ('India', 'Australia', 'UAE', 'Sydney', 'Nowhere'):
+                        scenarios.append(Scenario(COUNTRY_H2H, home, opp, country=country, years_back=years))
+        cls.scenarios = scenarios
+        cls.expected = [cls.single(s) for s in scenarios]
+
+    @classmethod
+    def single(cls, s):
+        eng = cls.engine.team_engine
+        if s.kind == FORTRESS: return eng.fortress_report(s.venue, s.home_team, s.opp_team, s.years_back)
+        if s.kind == GLOBAL_H2H: return eng.global_h2h_report(s.home_team, s.opp_team, s.years_back)
+        return eng.country_h2h_report(s.home_team, s.opp_team, s.country, s.years_back)
+
+    def assert_matches_single(self, reports, audit=True):
+        self.assertEqual(len(reports), len(self.scenarios))
+        found = 0
+        for s, got, expected in zip(self.scenarios, reports, self.expected):
+            with self.subTest(scenario=s):
+                if expected is None:
+                    self.assertIsNone(got)
+                    continue
+                found += 1
+                self.assertEqual(got.title, expected.title)
+                self.assertEqual(got.rows(), expected.rows())
+                if audit: self.assertTrue(got.audit.equals(expected.audit))
+                else: self.assertIsNone(got.audit)
+        self.assertGreater(found, len(self.scenarios) // 4) # The fixture has data for most scenarios
+
+    def test_serial_batch(self):
+        self.assert_matches_single(self.engine.team_reports(self.scenarios, workers=1))
+
+    def test_pool_batch(self):
+        self.assert_matches_single(quiet(self.engine.team_reports, self.scenarios, workers=2)[0])
+
+    def test_without_audit(self):
+        self.assert_matches_single(self.engine.team_reports(self.scenarios, audit=False), audit=False)
+
+    def test_no_fork_runs_in_process(self):
+        with mock.patch.object(report_batch.multiprocessing, 'get_all_start_methods', return_value=['spawn']), \
+             mock.patch.object(report_batch, 'ProcessPoolExecutor', side_effect=AssertionError("pool must not start")):
+            reports, _ = quiet(self.engine.team_reports, self.scenarios, workers=2)
+        self.assert_matches_single(reports)
+
+    def test_broken_pool_runs_in_process(self):
+        with mock.patch.object(report_batch, 'ProcessPoolExecutor', side_effect=OSError("no more processes")):
+            reports, _ = quiet(self.engine.team_reports, self.scenarios, workers=2)
+        self.assert_matches_single(reports)
+
+    def test_missing_venue_matches_nothing(self):
+        self.assertIsNone(self.engine.team_engine.fortress_report(None, 'India'))
+        self.assertEqual(self.engine.team_reports([Scenario(FORTRESS, 'India', venue=None)]), [None])
+
+    def test_venue_lookups_are_bounded(self):
+        eng = self.engine.team_engine
+        self.assertEqual(eng._resolve_venue('IND_KOLKATA'), 'IND_KOLKATA') # Stored name: no memo entry
+        self.assertEqual(eng._resolve_venue('Eden Gardens'), 'IND_KOLKATA')
+        self.assertEqual(eng._resolve_venue('sydney'), 'AUS_SYDNEY')
+        self.assertIsNone(eng._resolve_venue('Unknown Park'))
+        for i in range(type(eng).VENUE_CACHE + 10): eng._resolve_venue(f"Ground {i}")
+        self.assertEqual(eng._venue_lookups.cache_info().currsize, type(eng).VENUE_CACHE)
+        self.assertEqual(eng._resolve_venue('Eden Gardens'), 'IND_KOLKATA') # Evicted entries resolve again
+
+    def test_empty_and_unknown(self):
+        self.assertEqual(self.engine.team_reports([], workers=2), [])
+        with self.assertRaises(ValueError): self.engine.team_reports([Scenario('region', 'India')])
+
+if __name__ == '__main__':
+    unittest.main()
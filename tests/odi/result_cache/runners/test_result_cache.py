@@ -0,0 +1,134 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+import config.settings as settings_config
+from core.render import HtmlRenderer, NullRenderer
+from core.result_cache import ResultCache
+from tests.tools.synthetic_data import SyntheticEngineTestCase, quiet
+
+class TestResultCache(SyntheticEngineTestCase):
+    """Memoised reports (core/result_cache.py) on the synthetic dataset (tests/tools/synthetic_data.py)."""
+    def setUp(self):
+        self.engine.clear_cache()
+        self.engine.set_renderer(HtmlRenderer())
+
+    def counts(self):
+        stats = self.engine.cache_stats()
+        return stats['hits'], stats['misses']
+
+    def test_hit_returns_equal_deep_copy(self):
+        first = self.engine.fortress_report('IND_MUMBAI_WANKHEDE', 'India', 'All', 10)
+        hits, misses = self.counts()
+        second = self.engine.fortress_report('IND_MUMBAI_WANKHEDE', 'India', 'All', 10)
+        self.assertEqual(self.counts(), (hits + 1, misses))
+        self.assertIsNot(first, second)
+        self.assertEqual(first.rows(), second.rows())
+        self.assertTrue(first.audit.equals(second.audit))
+
+        # Mutating a served result never reaches the cached entry
+        second.home_stats['avg_1st'] = 'EDITED'
+        second.audit.drop(second.audit.index, inplace=True)
+        third = self.engine.fortress_report('IND_MUMBAI_WANKHEDE', 'India', 'All', 10)
+        self.assertEqual(third.rows(), first.rows())
+        self.assertTrue(third.audit.equals(first.audit))
+
+    def test_equivalent_arguments_share_an_entry(self):
+        self.engine.global_h2h_report('India', 'Australia', 10)
+        hits, misses = self.counts()
+        self.engine.global_h2h_report('India', opp_team='Australia', years_back=10)
+        self.assertEqual(self.counts(), (hits + 1, misses))
+
+    def test_reload_invalidates(self):
+        before = self.engine.global_h2h_report('India', 'England', 10)
+        version = self.engine.cache_stats()['data_version']
+        quiet(self.engine.reload_database)
+        self.assertEqual(self.engine.cache_stats()['data_version'], version + 1)
+        hits, misses = self.counts()
+        after = self.engine.global_h2h_report('India', 'England', 10)
+        self.assertEqual(self.counts(), (hits, misses + 1))
+        self.assertEqual(before.rows(), after.rows())
+
+    def test_new_digest_invalidates(self):
+        self.engine.global_h2h_report('England', 'Pakistan', 10)
+        self.engine.result_cache.new_version('another-digest')
+        hits, misses = self.counts()
+        self.engine.global_h2h_report('England', 'Pakistan', 10)
+        self.assertEqual(self.counts(), (hits, misses + 1))
+
+    def test_config_change_invalidates(self):
+        self.engine.global_h2h_report('Australia', 'England', 10)
+        version = self.engine.cache_stats()['data_version']
+        settings_config.RESULT_CACHE_TEST_VALUE = 1 # Any UPPER_CASE setting is part of the digest
+        try:
+            hits, misses = self.counts()
+            self.engine.global_h2h_report('Australia', 'England', 10)
+            self.assertEqual(self.counts(), (hits, misses + 1))
+            self.assertEqual(self.engine.cache_stats()['data_version'], version + 1)
+        finally:
+            del settings_config.RESULT_CACHE_TEST_VALUE
+
+    def test_variant_separates_renderers(self):
+        args = ('India',)
+        _, shown = quiet(self.engine.analyze_home_dominance, *args)
+        hits, misses = self.counts()
+        _, replayed = quiet(self.engine.analyze_home_dominance, *args)
+        self.assertEqual(self.counts(), (hits + 1, misses))
+        self.assertEqual(replayed, shown)
+
+        # Recorded output belongs to the renderer that produced it
+        self.engine.set_renderer(NullRenderer())
+        quiet(self.engine.analyze_home_dominance, *args)
+        self.assertEqual(self.counts(), (hits + 1, misses + 1))
+        self.engine.set_renderer(HtmlRenderer())
+        quiet(self.engine.analyze_home_dominance, *args)
+        self.assertEqual(self.counts(), (hits + 2, misses + 1))
+
+    def test_records_are_shared_across_renderers(self):
+        self.engine.fortress_report('AUS_MELBOURNE', 'Australia', 'All', 10)
+        self.engine.set_renderer(NullRenderer())
+        hits, misses = self.counts()
+        _, shown = quiet(self.engine.analyze_home_fortress, 'AUS_MELBOURNE', 'Australia', 'All', 10)
+        self.assertEqual(self.counts(), (hits + 1, misses)) # Same record, rendered by the new renderer
+        self.assertNotIn('<', shown)
+
+    def test_data_calls_are_not_recorded(self):
+        """Pure data calls never take the output-recording path and are shared across renderers."""
+        calls = [
+            ('squad_metrics', ({'India': ['Ind Bat0', 'Ind Bat1'], 'England': ['Eng Bat0']},)),
+            ('head_to_head_matrix', (['Ind Bat0', 'Ind Bat1'], ['Aus Bowl0', 'Eng Bowl1'])),
+            ('get_last_match_xi', ('India',)),
+            ('venue_bias_table', (10,)),
+        ]
+        with mock.patch.object(ResultCache, '_record', side_effect=AssertionError("recorded a data call")):
+            for name, args in calls:
+                with self.subTest(call=name):
+                    first, printed = quiet(getattr(self.engine, name), *args)
+                    self.assertEqual(printed, '')
+                    self.engine.set_renderer(NullRenderer())
+                    hits, misses = self.counts()
+                    second = getattr(self.engine, name)(*args)
+                    self.assertEqual(self.counts(), (hits + 1, misses))
+                    if isinstance(first, pd.DataFrame): self.assertTrue(first.equals(second))
+                    else: self.assertEqual(first, second)
+                    self.engine.set_renderer(HtmlRenderer())
+
+    def test_disabled_cache_always_recomputes(self):
+        cache = self.engine.result_cache
+        maxsize, cache.maxsize = cache.maxsize, 0
+        try:
+            skipped = cache.skipped
+            self.engine.global_h2h_report('India', 'Pakistan', 10)
+            self.engine.global_h2h_report('India', 'Pakistan', 10)
+            self.assertEqual(cache.skipped, skipped + 2)
+        finally:
+            cache.maxsize = maxsize
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.result_store import ResultStore
+
+class TestResultStore(unittest.TestCase):
+    """On-disk report cache (core/result_store.py): schema reset, LRU eviction, corrupt rows, concurrent writers."""
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix='odi_result_store_')
+        self.path = os.path.join(self.dir, 'FINAL_ODI_MASTER_results.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    @staticmethod
+    def entry(n, size=1000):
+        return ({'report': n, 'pad': 'x' * size}, [('out', f"report {n}\n")])
+
+    def put(self, store, name, value):
+        key = store.key(name, (), '2025-01-01', 'digest')
+        self.assertTrue(store.put(key, name, 'digest', value))
+        return key
+
+    def test_round_trip(self):
+        store = ResultStore(self.path)
+        key = self.put(store, 'fortress_report', self.entry(1))
+        self.assertEqual(ResultStore(self.path).get(key), self.entry(1)) # Survives a new instance (restart)
+        self.assertIsNone(store.get(store.key('fortress_report', (), '2025-01-02', 'digest')))
+
+    def test_schema_mismatch_resets_the_file(self):
+        store = ResultStore(self.path)
+        key = self.put(store, 'fortress_report', self.entry(1))
+
+        class NextSchema(ResultStore):
+            SCHEMA = ResultStore.SCHEMA + 1
+
+        upgraded = NextSchema(self.path)
+        self.assertEqual(upgraded.stats()['rows'], 0)
+        self.assertNotEqual(upgraded.key('fortress_report', (), '2025-01-01', 'digest'), key)
+        self.assertIsNone(upgraded.get(key))
+
+        # Same schema again -> rows are kept
+        key = self.put(upgraded, 'fortress_report', self.entry(2))
+        self.assertEqual(NextSchema(self.path).get(key), self.entry(2))
+
+    def test_lru_eviction_by_accessed(self):
+        probe = ResultStore(self.path)
+        self.put(probe, 'probe', self.entry(0))
+        row_size = probe.stats()['bytes']
+        probe.clear()
+
+        store = ResultStore(self.path, max_mb=(3 * row_size + row_size // 2) / (1024 * 1024)) # Room for 3 rows
+        keys = {}
+        for name in ('a', 'b', 'c'):
+            keys[name] = self.put(store, name, self.entry(0))
+            time.sleep(0.01)
+        self.assertIsNotNone(store.get(keys['a'])) # 'a' is now the most recently used
+        time.sleep(0.01)
+        keys['d'] = self.put(store, 'd', self.entry(0))
+
+        self.assertEqual(store.stats()['rows'], 3)
+        self.assertIsNone(store.get(keys['b'])) # Least recently accessed -> evicted first
+        for name in ('a', 'c', 'd'): self.assertIsNotNone(store.get(keys[name]), name)
+
+    def test_oversized_value_is_not_stored(self):
+        store = ResultStore(self.path, max_mb=0.001)
+        key = store.key('big', (), '2025-01-01', 'digest')
+        self.assertFalse(store.put(key, 'big', 'digest', self.entry(1, size=10_000)))
+        self.assertEqual(store.stats()['rows'], 0)
+
+    def test_corrupt_blob_is_a_miss_and_dropped(self):
+        store = ResultStore(self.path)
+        key = self.put(store, 'fortress_report', self.entry(1))
+        with sqlite3.connect(self.path) as con:
+            con.execute("UPDATE results SET payload = ? WHERE key = ?", (sqlite3.Binary(b'\x80\x05not a pickle'), key))
+        con.close()
+        self.assertIsNone(store.get(key))
+        self.assertEqual(store.stats()['rows'], 0)
+
+    def test_unreadable_file_disables_the_store(self):
+        with open(self.path, 'wb') as f: f.write(b'this is not a database' * 100)
+        store = ResultStore(self.path)
+        self.assertFalse(store.enabled)
+        self.assertIsNone(store.get('anything'))
+        self.assertFalse(store.put('anything', 'm', 'digest', self.entry(1)))
+
+    def test_concurrent_writers(self):
+        ResultStore(self.path) # Create the file once (as the app does at start-up)
+        errors, written = [], {}
+
+        def writer(tag):
+            store = ResultStore(self.path) # Own instance -> own connections (another session / process)
+            try:
+                for i in range(40):
+                    key = store.key(tag, (i,), '2025-01-01', 'digest')
+                    if not store.put(key, tag, 'digest', self.entry(i, size=200)): errors.append((tag, i))
+                    written[key] = self.entry(i, size=200)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(tag,)) for tag in ('w1', 'w2')]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        self.assertEqual(errors, [])
+        store = ResultStore(self.path)
+        self.assertEqual(store.stats()['rows'], 80)
+        for key, value in written.items(): self.assertEqual(store.get(key), value)
+
+if __name__ == '__main__':
+    unittest.main()
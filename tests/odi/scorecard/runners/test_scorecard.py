@@ -0,0 +1,100 @@
+import itertools
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.window_cache import window_cutoff
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, squad_of
+
+BOWLER_WICKETS = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+PLAYERS = [p for t in TEAMS for p in squad_of(t)] + ['Nobody']
+
+def reference_innings(raw_df, player, role, cutoff_date=None):
+    """One player's innings (oldest -> newest) from a raw_df mask + groupby per match (the loops the Scorecard replaced)."""
+    balls = raw_df[(raw_df['striker' if role == 'batting' else 'bowler'] == player) & raw_df['start_date'].notna()]
+    if cutoff_date is not None: balls = balls[balls['start_date'] >= pd.Timestamp(cutoff_date)]
+    balls = balls.assign(
+        venue_code=balls['venue_id'].cat.codes, is_wkt=balls['wicket_type'].notna(),
+        bowler_wkt=balls['wicket_type'].isin(BOWLER_WICKETS),
+        legal=(balls['wides'].fillna(0) == 0) & (balls['noballs'].fillna(0) == 0),
+        conceded=balls['runs_off_bat'] + balls['wides'].fillna(0) + balls['noballs'].fillna(0),
+    )
+    g = balls.groupby('match_id', sort=False) # raw_df is in date order -> first appearance = date order
+    out = pd.DataFrame({
+        'player': player, 'start_date': g['start_date'].first(), 'venue_code': g['venue_code'].first(),
+        'batting_team': g['batting_team'].first(), 'bowling_team': g['bowling_team'].first(), 'balls': g.size(),
+    })
+    if role == 'batting':
+        out['runs'] = g['runs_off_bat'].sum(); out['outs'] = g['is_wkt'].sum(); out['bowler_outs'] = g['bowler_wkt'].sum()
+        out['not_out'] = out['outs'] == 0
+    else:
+        out['legal_balls'] = g['legal'].sum(); out['runs_conceded'] = g['conceded'].sum(); out['wickets'] = g['bowler_wkt'].sum()
+    out = out.reset_index()
+    out['match_id'] = out['match_id'].astype(str) # Scorecard keys are str (as squads_df)
+    return out
+
+class TestScorecard(SyntheticEngineTestCase):
+    """Scorecard (core/scorecard.py) innings / figures == raw_df masks + per-match groupby, on the synthetic dataset."""
+
+    def assert_same(self, got, expected):
+        got = got[list(expected.columns)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+    def test_innings_match_reference(self):
+        sc = self.engine.scorecard
+        dates = self.engine.raw_df['start_date']
+        cutoffs = [None, window_cutoff(None), window_cutoff(3), dates.iloc[len(dates) // 2], pd.Timestamp('2100-01-01')]
+        for player, cutoff in itertools.product(PLAYERS, cutoffs):
+            with self.subTest(player=player, cutoff=cutoff):
+                self.assert_same(sc.batting_innings(player, cutoff), reference_innings(self.engine.raw_df, player, 'batting', cutoff))
+                self.assert_same(sc.bowling_innings(player, cutoff), reference_innings(self.engine.raw_df, player, 'bowling', cutoff))
+
+    def test_many_players_is_per_player_in_order(self):
+        sc = self.engine.scorecard
+        players = ['Aus Bat2', 'Ind Bowl0', 'Nobody', 'Aus Bat2', 'Eng Bat0']
+        for cutoff in (None, window_cutoff(5)):
+            with self.subTest(cutoff=cutoff):
+                expected = pd.concat([reference_innings(self.engine.raw_df, p, 'batting', cutoff) for p in dict.fromkeys(players)], ignore_index=True)
+                self.assert_same(sc.batting_innings(players, cutoff), expected)
+        self.assertTrue(sc.batting_innings([]).empty)
+
+    def test_cards_and_venues(self):
+        sc = self.engine.scorecard
+        codes = self.engine.ball_index.venue_codes_for('AUS')
+        self.assertGreater(len(codes), 1)
+        for player in PLAYERS:
+            for role, card in (('batting', sc.batting_card), ('bowling', sc.bowling_card)):
+                expected = reference_innings(self.engine.raw_df, player, role)
+                with self.subTest(player=player, role=role):
+                    for _, row in expected.iterrows():
+                        got = card(row['match_id'], player)
+                        self.assertEqual(got[expected.columns.drop('match_id')].tolist(), row.drop('match_id').tolist())
+                    innings = sc.batting_innings(player) if role == 'batting' else sc.bowling_innings(player)
+                    self.assert_same(sc.at_venue(innings, codes), expected[expected['venue_code'].isin(codes)].reset_index(drop=True))
+        self.assertIsNone(sc.batting_card('no-such-match', 'Ind Bat0'))
+        self.assertIsNone(sc.bowling_card(self.engine.raw_df['match_id'].iloc[0], 'Nobody'))
+
+    def test_outs_include_non_bowler_wickets(self):
+        # Not out = no wicket of ANY kind on the striker's balls; bowler_outs only count the bowler's
+        bat = self.engine.scorecard.batting
+        self.assertTrue((bat['outs'] > bat['bowler_outs']).any())
+        self.assertTrue(bat['not_out'].any() and not bat['not_out'].all())
+
+    def test_best_figures(self):
+        sc = self.engine.scorecard
+        for player in PLAYERS:
+            figures = sc.bowling_innings(player)
+            with self.subTest(player=player):
+                if figures.empty or figures['wickets'].max() == 0:
+                    self.assertIsNone(sc.best_figures(figures))
+                    continue
+                best = min(zip(figures['wickets'], figures['runs_conceded']), key=lambda wr: (-wr[0], wr[1]))
+                self.assertEqual(sc.best_figures(figures), f"{int(best[0])}/{int(best[1])}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.window_cache import window_cutoff
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, squad_of
+
+BOWLER_WICKETS = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+def reference_metrics(raw_df, players, years):
+    """The per-player loop squad_metrics replaced (the old _calculate_squad_metrics) for one squad."""
+    window_df = raw_df[raw_df['start_date'] >= window_cutoff(years)]
+    df = window_df[window_df['striker'].isin(players) | window_df['bowler'].isin(players)]
+    tr, c, f, tw, fw, caps = 0, 0, 0, 0, 0, 0
+    for p in players:
+        pb = df[df['striker'] == p]; pw = df[df['bowler'] == p]
+        caps += len(set(pb['match_id'].unique()) | set(pw['match_id'].unique()))
+        if not pb.empty:
+            s = pb.groupby('match_id')['runs_off_bat'].sum()
+            tr += s.sum(); c += (s >= 100).sum(); f += ((s >= 50) & (s < 100)).sum()
+        if not pw.empty:
+            valid = pw[pw['wicket_type'].isin(BOWLER_WICKETS)]
+            tw += len(valid)
+            if not valid.empty: fw += (valid.groupby('match_id').count()['wicket_type'] >= 5).sum()
+    return {'Caps (Combined)': caps, 'Total Runs': tr, '100s': c, '50s': f, 'Total Wickets': tw, '5-Wkt Hauls': fw}
+
+class TestSquadMetrics(SyntheticEngineTestCase):
+    """squad_metrics (core/player_engine.py) == the per-player raw_df loop, on full 50-over synthetic innings."""
+    DATA_KWARGS = {'n_matches': 24, 'balls_per_innings': 300} # Long enough for 50s, 100s and 5-wicket hauls
+
+    def check(self, squads, years):
+        got = self.engine.player_engine.squad_metrics(squads, years)
+        self.assertEqual(list(got.index), list(squads))
+        for team, players in squads.items():
+            with self.subTest(team=team, years=years):
+                self.assertEqual(got.loc[team].to_dict(), reference_metrics(self.engine.raw_df, players, years))
+        return got
+
+    def test_squads_match_reference(self):
+        squads = {t: squad_of(t) for t in TEAMS}
+        for years in (None, 3, 6):
+            got = self.check(squads, years)
+        # All Time reaches every column
+        self.assertTrue((got.sum() > 0).all(), got.sum())
+
+    def test_mixed_and_unknown_players(self):
+        squads = {'Mixed': ['Ind Bat0', 'Aus Bowl1', 'Nobody', 'Ind Bat0'], 'Empty': [], 'Bench': ['Eng Twelfth']}
+        for years in (None, 3):
+            self.check(squads, years)
+
+    def test_single_squad_matches_batch(self):
+        batch = self.engine.player_engine.squad_metrics({t: squad_of(t) for t in TEAMS}, 10)
+        for team in TEAMS:
+            single = self.engine.player_engine._calculate_squad_metrics(team, squad_of(team), 10)
+            self.assertEqual(single, batch.loc[team].to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
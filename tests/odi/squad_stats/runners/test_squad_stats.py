@@ -0,0 +1,164 @@
+import itertools
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.window_cache import window_cutoff
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, squad_of
+
+BOWLER_WICKETS = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+def reference_stats(raw_df, squads_df, player, opp, venue_codes, years):
+    """The per-player raw_df masks squad_stats replaced (the old _get_stats, venue pattern -> venue codes)."""
+    cutoff_date = window_cutoff(years)
+    at_venue = raw_df['venue_id'].cat.codes.isin(venue_codes)
+    all_activity = raw_df[((raw_df['striker'] == player) | (raw_df['bowler'] == player)) & (raw_df['start_date'] >= cutoff_date)]
+
+    if not squads_df.empty:
+        # Official squad lists (captures DNB)
+        selected = squads_df[squads_df['player'] == player].copy()
+        selected['date'] = pd.to_datetime(selected['date'])
+        matches_played = selected[selected['date'] >= cutoff_date].sort_values(['date', 'match_id'], ascending=[False, False])
+    else:
+        matches_played = all_activity.drop_duplicates('match_id').sort_values(['start_date', 'match_id'], ascending=[False, False])
+    if matches_played.empty:
+        return {
+            'Player': player, 'Inns': 0, 'Bat Form': "-", 'Bat Avg': "-", 'vs Opp': "-",
+            'Ven Inns': "-", 'Ven Runs': "-", 'Ven Avg': "-", 'Ven HS': "-",
+            'Bowl Form': "-", 'Bowl Econ': "-", 'Ven Econ': "-", 'Ven Wkts': "-", 'Ven Matches': "-"
+        }
+    last_5_ids = matches_played['match_id'].head(5).tolist()
+
+    # Batting form (not out = no wicket of any kind on the player's balls)
+    form_bat = []
+    for m_id in last_5_ids:
+        m_bat = raw_df[(raw_df['match_id'] == m_id) & (raw_df['striker'] == player)]
+        if m_bat.empty: form_bat.append("DNB")
+        else: form_bat.append(f"{int(m_bat['runs_off_bat'].sum())}" + ("" if m_bat['wicket_type'].notna().any() else "*"))
+
+    # Career / vs opponent (outs = every wicket on the player's balls, run outs of the non-striker included)
+    bat_window = raw_df[(raw_df['striker'] == player) & (raw_df['start_date'] >= cutoff_date)]
+    total_runs = bat_window['runs_off_bat'].sum(); total_outs = bat_window['wicket_type'].count()
+    avg = round(total_runs / total_outs, 1) if total_outs > 0 else total_runs
+    opp_df = bat_window[bat_window['bowling_team'] == opp]
+    opp_runs = opp_df['runs_off_bat'].sum(); opp_outs = opp_df['wicket_type'].count()
+    opp_avg = round(opp_runs / opp_outs, 1) if opp_outs > 0 else (opp_runs if not opp_df.empty else "-")
+
+    # Venue batting
+    v_inns = v_runs = v_avg = v_hs = "-"
+    ven_df = bat_window[at_venue.loc[bat_window.index]]
+    if not ven_df.empty:
+        scores = ven_df.groupby('match_id')['runs_off_bat'].sum()
+        v_outs = ven_df['wicket_type'].count()
+        v_inns, v_runs, v_hs = len(scores), int(scores.sum()), int(scores.max())
+        v_avg = round(scores.sum() / v_outs, 1) if v_outs > 0 else scores.sum()
+    elif at_venue.loc[all_activity.index].any():
+        v_runs = "DNB"
+
+    def bowling(df):
+        """(bowler wickets, runs conceded, legal balls) of deliveries."""
+        legal = ((df['wides'].fillna(0) == 0) & (df['noballs'].fillna(0) == 0)).sum()
+        runs = df['runs_off_bat'].sum() + df['wides'].sum() + df['noballs'].sum()
+        return df['wicket_type'].isin(BOWLER_WICKETS).sum(), runs, legal
+
+    # Bowling form
+    form_bowl = []
+    for m_id in last_5_ids:
+        m_bowl = all_activity[(all_activity['match_id'] == m_id) & (all_activity['bowler'] == player)]
+        if m_bowl.empty:
+            form_bowl.append("-")
+            continue
+        wkts, runs, legal = bowling(m_bowl)
+        overs = f"{legal // 6}.{legal % 6}" if legal % 6 else f"{legal // 6}"
+        form_bowl.append(f"{wkts}/{int(runs)} ({overs})")
+
+    # Bowling career / venue
+    bowl_window = raw_df[(raw_df['bowler'] == player) & (raw_df['start_date'] >= cutoff_date)]
+    econ = "-"
+    if not bowl_window.empty:
+        _, runs, legal = bowling(bowl_window)
+        if legal > 0: econ = round((runs / legal) * 6, 2)
+    v_wkts = v_econ = v_matches = "-"
+    ven_bowl = bowl_window[at_venue.loc[bowl_window.index]]
+    if not ven_bowl.empty:
+        v_matches = ven_bowl['match_id'].nunique()
+        v_wkts, runs, legal = bowling(ven_bowl)
+        if legal > 0: v_econ = round((runs / legal) * 6, 2)
+
+    return {
+        'Player': player, 'Inns': bat_window['match_id'].nunique(), 'Bat Form': ", ".join(form_bat), 'Bat Avg': avg,
+        'vs Opp': opp_avg, 'Ven Inns': v_inns, 'Ven Runs': v_runs, 'Ven Avg': v_avg, 'Ven HS': v_hs,
+        'Bowl Form': ", ".join(form_bowl), 'Bowl Econ': econ, 'Ven Econ': v_econ, 'Ven Wkts': v_wkts, 'Ven Matches': v_matches
+    }
+
+class TestSquadStats(SyntheticEngineTestCase):
+    """squad_stats / _get_stats (core/player_engine.py) == the per-player raw_df masks, usage-based DNB (no squad file)."""
+    VENUES = ['IND_MUMBAI_WANKHEDE', 'Sydney', 'AUS', 'Unknown Park']
+
+    def setUp(self):
+        self.pe = self.engine.player_engine
+
+    def check(self, squads, venue, years):
+        codes = self.engine.ball_index.venue_codes_for(venue)
+        got = self.pe.squad_stats(squads, codes, years)
+        self.assertEqual(list(got), list(squads))
+        for team, (players, opp) in squads.items():
+            self.assertEqual(len(got[team]), len(players))
+            for player, row in zip(players, got[team]):
+                with self.subTest(player=player, opp=opp, venue=venue, years=years):
+                    self.assertEqual(row, reference_stats(self.engine.raw_df, self.pe.squads_df, player, opp, codes, years))
+        return got
+
+    def test_squads_match_reference(self):
+        rows = []
+        for (team_a, team_b), venue, years in itertools.product([('India', 'Australia'), ('England', 'Pakistan')], self.VENUES, [None, 3]):
+            got = self.check({team_a: (squad_of(team_a), team_b), team_b: (squad_of(team_b), team_a)}, venue, years)
+            rows += [r for team_rows in got.values() for r in team_rows]
+
+        # The fixture reaches every branch: not outs, DNB, bowling figures, venue DNB, empty windows
+        forms = " ".join(r['Bat Form'] for r in rows)
+        self.assertIn("*", forms); self.assertIn("DNB", forms)
+        self.assertTrue(any("(" in r['Bowl Form'] for r in rows))
+        self.assertTrue(any(r['Ven Runs'] == "DNB" for r in rows))
+        self.assertTrue(any(r['Inns'] == 0 for r in rows))
+
+    def test_mixed_and_unknown_players(self):
+        # Same player twice, cross-team squads, unknown names
+        squads = {'Mixed': (['Ind Bat0', 'Aus Bowl1', 'Nobody', 'Ind Bat0', 'Eng Twelfth'], 'England'), 'Empty': ([], 'India')}
+        for venue, years in itertools.product(self.VENUES, [None, 10]):
+            self.check(squads, venue, years)
+
+    def test_single_player_matches_batch(self):
+        codes = self.engine.ball_index.venue_codes_for('AUS')
+        batch = self.pe.squad_stats({t: (squad_of(t), 'India') for t in TEAMS}, codes, 10)
+        for team in TEAMS:
+            for player, row in zip(squad_of(team), batch[team]):
+                self.assertEqual(self.pe._get_stats(player, 'India', codes, 10), row)
+
+    def test_outs_count_every_wicket_on_the_strikers_ball(self):
+        # Run outs (either end) on the striker's ball count as the striker's outs, not the bowler's
+        raw = self.engine.raw_df
+        run_outs = raw[raw['wicket_type'] == 'run out']
+        self.assertTrue((run_outs['player_dismissed'] != run_outs['striker']).any())
+        card = self.engine.scorecard.batting
+        self.assertTrue((card['outs'] > card['bowler_outs']).any())
+        np.testing.assert_array_equal(card['not_out'].to_numpy(), (card['outs'] == 0).to_numpy())
+
+class TestSquadStatsWithSquads(TestSquadStats):
+    """Same checks with MATCH_SQUADS.csv: the squad lists pick the last 5 matches (12th men -> DNB / -)."""
+    DATA_KWARGS = {'squads': True}
+
+    def test_squad_file_loaded(self):
+        self.assertFalse(self.pe.squads_df.empty)
+        row = self.pe.squad_stats({'India': (['Ind Twelfth'], 'England')}, np.array([], dtype=np.int64), None)['India'][0]
+        self.assertEqual(row['Bat Form'], ", ".join(["DNB"] * 5))
+        self.assertEqual(row['Bowl Form'], ", ".join(["-"] * 5))
+
+if __name__ == '__main__':
+    unittest.main()
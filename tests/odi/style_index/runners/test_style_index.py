@@ -0,0 +1,92 @@
+import itertools
+import os
+import sys
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+import config.teams as teams_config
+from core.window_cache import window_cutoff
+from tests.tools.synthetic_data import TEAMS, SyntheticEngineTestCase, squad_of
+
+BOWLER_WICKETS = ['bowled', 'caught', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+# Synthetic bowlers: Bowl0 pace, Bowl1 spin, Bowl2 missing from the map (Pakistan's Bowl1 is a part-timer)
+STYLES = {f"{t[:3]} Bowl{i}": style for t in TEAMS for i, style in enumerate(['⚡ Pace', '🌀 Spin'])}
+STYLES['Pak Bowl1'] = '🚫 Part-Timer'
+
+def reference_vs_style(raw_df, batter, style, bowler_styles, cutoff_date):
+    """(runs, balls, outs) of a batter vs every bowler of a style (the old analyze_squad_types proxy-bowler scan)."""
+    window_df = raw_df[raw_df['start_date'] >= pd.Timestamp(cutoff_date)]
+    proxy_bowlers = [b for b, s in bowler_styles.items() if s == style]
+    style_df = window_df[(window_df['striker'] == batter) & (window_df['bowler'].isin(proxy_bowlers))]
+    return style_df['runs_off_bat'].sum(), style_df['match_id'].count(), style_df['wicket_type'].isin(BOWLER_WICKETS).sum()
+
+class TestStyleIndex(SyntheticEngineTestCase):
+    """StyleIndex (core/style_index.py) / squad_threats == per-batter proxy-bowler masks over raw_df."""
+    DATA_KWARGS = {'n_matches': 24, 'balls_per_innings': 300}
+
+    def setUp(self):
+        patcher = mock.patch.object(teams_config, 'BOWLER_STYLES', dict(STYLES))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = self.engine.style_index
+
+    def test_batters_vs_styles(self):
+        batters = [p for t in TEAMS for p in squad_of(t)] + ['Nobody']
+        for cutoff in (None, window_cutoff(None), window_cutoff(3), pd.Timestamp('2100-01-01')):
+            table = self.index.batters_vs_styles(batters, cutoff)
+            for batter, style in itertools.product(batters, sorted(set(STYLES.values()))):
+                with self.subTest(batter=batter, style=style, cutoff=cutoff):
+                    runs, balls, outs = reference_vs_style(self.engine.raw_df, batter, style, STYLES, cutoff or pd.Timestamp.min)
+                    if balls == 0:
+                        self.assertNotIn((batter, style), table.index)
+                    else:
+                        self.assertEqual(table.loc[(batter, style)].tolist(), [runs, balls, outs])
+
+    def test_season_table(self):
+        raw = self.engine.raw_df
+        known = raw[raw['bowler'].isin(list(STYLES))]
+        expected = known.assign(
+            style=known['bowler'].map(STYLES), outs=known['wicket_type'].isin(BOWLER_WICKETS).astype(int),
+        ).groupby(['striker', 'style', 'season']).agg(runs=('runs_off_bat', 'sum'), balls=('runs_off_bat', 'size'), outs=('outs', 'sum'))
+        got = self.index.season_table().set_index(['batter', 'style', 'season'])[['runs', 'balls', 'outs']]
+        expected.index.names = got.index.names
+        pd.testing.assert_frame_equal(got.sort_index(), expected.sort_index(), check_dtype=False)
+
+    def test_squad_threats(self):
+        pe = self.engine.player_engine
+        for team, opp in [('India', 'Australia'), ('England', 'Pakistan')]:
+            for years in (None, 3):
+                with self.subTest(team=team, opp=opp, years=years):
+                    threat = pe.squad_threats(team, squad_of(team), squad_of(opp), years)
+                    opp_styles = {STYLES[b] for b in squad_of(opp) if b in STYLES} - {'🚫 Part-Timer'}
+                    self.assertEqual(set(threat.styles), opp_styles)
+                    window = self.engine.raw_df[self.engine.raw_df['start_date'] >= window_cutoff(years)]
+                    delivered = {b: int((window['bowler'] == b).sum()) for b in squad_of(opp) if b not in STYLES}
+                    self.assertEqual(threat.missing, [f"{b} ({n} balls)" for b, n in delivered.items() if n > 6])
+                    for batter, faced in threat.cells:
+                        expected = {}
+                        for style in threat.styles:
+                            runs, balls, outs = reference_vs_style(self.engine.raw_df, batter, style, STYLES, window_cutoff(years))
+                            if balls: expected[style] = (round(runs / outs, 1) if outs > 0 else runs, int((runs / balls) * 100))
+                        self.assertEqual(faced, expected)
+
+    def test_styles_change_rebuilds_only_on_digest_change(self):
+        self.index.refresh()                    # Rebuilt for STYLES (engine loaded with config/teams.py)
+        self.assertFalse(self.index.refresh())  # Same styles -> nothing rebuilt
+        teams_config.BOWLER_STYLES['Ind Bowl2'] = '🌀 Spin'
+        self.assertEqual(self.index.style_of('Ind Bowl2'), '🌀 Spin') # Query refreshes the dimension
+        codes = self.engine.raw_df.loc[self.engine.raw_df['bowler'] == 'Ind Bowl2', 'bowler_style']
+        self.assertTrue((codes == self.index.styles.index('🌀 Spin')).all())
+        table = self.index.batters_vs_styles(['Aus Bat0'])
+        runs, balls, outs = reference_vs_style(self.engine.raw_df, 'Aus Bat0', '🌀 Spin', teams_config.BOWLER_STYLES, pd.Timestamp.min)
+        self.assertEqual(table.loc[('Aus Bat0', '🌀 Spin')].tolist(), [runs, balls, outs])
+        self.assertFalse(self.index.refresh())
+
+if __name__ == '__main__':
+    unittest.main()
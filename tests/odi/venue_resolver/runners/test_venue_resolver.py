@@ -0,0 +1,100 @@
+import difflib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from core.venue_resolver import VenueResolver
+from tests.tools.synthetic_data import VENUES
+from venues import VENUE_MAP
+
+def close_match(raw, keys):
+    """The plain fuzzy step _fuzzy replaced: get_close_matches over every map key."""
+    matches = difflib.get_close_matches(raw, keys, n=1, cutoff=VenueResolver.FUZZY_CUTOFF)
+    return matches[0] if matches else None
+
+def probes(keys):
+    """Near-miss spellings of map keys (dropped / swapped / replaced characters, case, suffixes) + noise."""
+    out = []
+    for i, k in enumerate(keys):
+        mid = len(k) // 2
+        out += [k[:mid] + k[mid + 1:], k[:mid] + k[mid + 1:mid + 2] + k[mid:mid + 1] + k[mid + 2:], k[:mid] + 'x' + k[mid + 1:]]
+        if i % 3 == 0: out += [k.upper(), k.lower(), k + ' Ground', k[:max(3, len(k) - 4)]]
+    return out + ['', 'a', 'zz', 'xyz', 'Unknown Park', 'Nowhere Cricket Club', '1234567890']
+
+class TestVenueResolver(unittest.TestCase):
+    """VenueResolver (core/venue_resolver.py): JSON cache round trip / invalidation and fuzzy parity with difflib."""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='odi_venue_resolver_')
+        self.path = os.path.join(self.tmp, 'venue_cache.json')
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.raws = VENUES + ['Wankhede Stadium', 'Eden Gardens, Kolkata', 'Unknown Park', 'Sydney Cricket Grnd', 3.5]
+
+    def test_cold_and_warm_loads_agree(self):
+        cold = VenueResolver(VENUE_MAP, self.path)
+        self.assertEqual(cold.resolved, {})
+        first = cold.resolve_all(self.raws)
+        self.assertEqual(set(first), {r for r in self.raws if isinstance(r, str)})
+        with open(self.path, encoding='utf-8') as f: data = json.load(f)
+        self.assertEqual(data, {'digest': cold.digest, 'resolved': first})
+
+        # Warm load: everything comes from the file, nothing is matched or rewritten
+        warm = VenueResolver(VENUE_MAP, self.path)
+        self.assertEqual(warm.resolved, first)
+        stamp = os.stat(self.path).st_mtime_ns
+        with mock.patch.object(VenueResolver, '_match', side_effect=AssertionError("re-resolved a cached venue")):
+            self.assertEqual(warm.resolve_all(self.raws), first)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, stamp)
+
+        # A new name is the only one resolved, then persisted next to the old ones
+        with mock.patch.object(VenueResolver, '_match', wraps=warm._match) as match:
+            warm.resolve_all(self.raws + ['Lords London'])
+        self.assertEqual([c.args[0] for c in match.call_args_list], ['Lords London'])
+        self.assertEqual(VenueResolver(VENUE_MAP, self.path).resolved, warm.resolved)
+        self.assertEqual(VenueResolver(VENUE_MAP).resolve_all(self.raws + ['Lords London']), warm.resolved)
+
+    def test_map_change_invalidates(self):
+        VenueResolver(VENUE_MAP, self.path).resolve_all(self.raws)
+        edited = dict(VENUE_MAP, **{'Unknown Park': 'XX_UNKNOWN_PARK'})
+        fresh = VenueResolver(edited, self.path)
+        self.assertNotEqual(fresh.digest, VenueResolver(VENUE_MAP).digest)
+        self.assertEqual(fresh.resolved, {})
+        self.assertEqual(fresh.resolve_all(self.raws)['Unknown Park'], 'XX_UNKNOWN_PARK')
+        # Same content in another order -> same digest (the file stays valid)
+        self.assertEqual(VenueResolver(dict(reversed(list(edited.items()))), self.path).resolved, fresh.resolved)
+
+    def test_unreadable_cache_starts_over(self):
+        for content in ('not json', '{"digest": 1}', ''):
+            with open(self.path, 'w', encoding='utf-8') as f: f.write(content)
+            with self.subTest(content=content):
+                self.assertEqual(VenueResolver(VENUE_MAP, self.path).resolved, {})
+
+    def test_fuzzy_matches_get_close_matches(self):
+        resolver = VenueResolver(VENUE_MAP)
+        keys = list(VENUE_MAP)
+        found = 0
+        for raw in probes(keys):
+            with self.subTest(raw=raw):
+                expected = close_match(raw, keys)
+                self.assertEqual(resolver._fuzzy(raw), expected)
+                found += expected is not None
+        self.assertGreater(found, len(keys)) # Most near-misses do resolve
+
+    def test_fuzzy_divergence(self):
+        # No shared trigram, still >= cutoff: found by the full-scan fallback when the pool is empty...
+        resolver = VenueResolver({'ab,cd': 'X', "Lord's": 'Y'})
+        self.assertGreaterEqual(difflib.SequenceMatcher(None, 'ab.cd', 'ab,cd').ratio(), VenueResolver.FUZZY_CUTOFF)
+        self.assertEqual(resolver._fuzzy('ab.cd'), 'ab,cd')
+        # ...but a lower-scoring key from the trigram pool wins over it (documented divergence)
+        venue_map = {'ab.cd.ef.gh.ij': 'FAR', 'abcdefghQR': 'NEAR'} # 0.83 (no shared trigram) vs 0.80 (shares 'abc')
+        self.assertEqual(close_match('abcdefghij', list(venue_map)), 'ab.cd.ef.gh.ij')
+        self.assertEqual(VenueResolver(venue_map)._fuzzy('abcdefghij'), 'abcdefghQR')
+
+if __name__ == '__main__':
+    unittest.main()
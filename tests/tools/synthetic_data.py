@@ -0,0 +1,121 @@
+"""
+Small deterministic ball-by-ball dataset for unit tests that must not depend on the real
+data/FINAL_ODI_MASTER.csv (cache, index, batch and player-stats tests).
+
+    class TestSomething(SyntheticEngineTestCase):   # cls.engine, built once per class
+        DATA_KWARGS = {'squads': True}               # write_synthetic_data options
+        ENGINE_KWARGS = {'cache_size': 0}            # CricketAnalyzer options
+
+    with synthetic_engine() as engine:              # One-off engine (temp dir removed on exit)
+        ...
+"""
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+SYNTHETIC_CSV = 'data/FINAL_ODI_MASTER.csv'
+
+TEAMS = ['India', 'Australia', 'England', 'Pakistan']
+VENUES = [ # Raw CSV names (resolved through venues.py at load)
+    'Wankhede Stadium, Mumbai', 'Eden Gardens', 'Melbourne Cricket Ground',
+    'Sydney Cricket Ground', "Lord's, London", 'Sharjah Cricket Stadium',
+]
+BALLS_PER_INNINGS = 30
+WICKET_TYPES = ['bowled', 'caught', 'run out'] # Run outs are not the bowler's and may dismiss the non-striker
+SQUADS_CSV = 'data/MATCH_SQUADS.csv'
+
+def squad_of(team):
+    """Match XI of a team: 4 batters, 3 bowlers and a 12th man who never bats or bowls."""
+    return [f"{team[:3]} Bat{i}" for i in range(4)] + [f"{team[:3]} Bowl{i}" for i in range(3)] + [f"{team[:3]} Twelfth"]
+
+def build_synthetic_frame(n_matches=48, seed=11, balls_per_innings=BALLS_PER_INNINGS):
+    """Raw delivery rows (CSV columns) for n_matches two-innings matches, 2017-2025 (300 balls = full 50 overs)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2017-01-15') + pd.to_timedelta(np.sort(rng.choice(3200, n_matches, replace=False)), unit='D')
+    rows = []
+    for i, date in enumerate(dates):
+        team_1, team_2 = rng.choice(TEAMS, 2, replace=False)
+        venue = VENUES[i % len(VENUES)]
+        totals = {}
+        for innings, (bat, bowl) in enumerate([(team_1, team_2), (team_2, team_1)], 1):
+            totals[bat] = 0
+            for b in range(balls_per_innings):
+                runs = int(rng.choice([0, 1, 2, 4, 6], p=[.4, .35, .1, .1, .05]))
+                wide = int(rng.random() < 0.04)
+                out = not wide and rng.random() < 0.05
+                how = str(rng.choice(WICKET_TYPES)) if out else np.nan
+                striker, non_striker = f"{bat[:3]} Bat{b % 4}", f"{bat[:3]} Bat{(b + 1) % 4}"
+                dismissed = (non_striker if rng.random() < 0.5 else striker) if how == 'run out' else striker
+                totals[bat] += runs + wide
+                rows.append({
+                    'match_id': 900000 + i, 'start_date': date.strftime('%Y-%m-%d'), 'venue': venue,
+                    'batting_team': bat, 'bowling_team': bowl, 'innings': innings,
+                    'ball': round(b // 6 + (b % 6 + 1) / 10, 1),
+                    'striker': striker, 'non_striker': non_striker,
+                    'bowler': f"{bowl[:3]} Bowl{b // 6 % 3}",
+                    'runs_off_bat': runs, 'extras': wide, 'wides': wide or np.nan, 'noballs': np.nan,
+                    'wicket_type': how, 'player_dismissed': dismissed if out else np.nan,
+                    'winner': None,
+                })
+        a, b = totals[team_1], totals[team_2]
+        winner = team_1 if a > b else team_2 if b > a else 'No Result'
+        for r in rows[-2 * balls_per_innings:]: r['winner'] = winner
+    return pd.DataFrame(rows)
+
+def build_squads_frame(frame):
+    """MATCH_SQUADS.csv rows (match_id, player, date, team) for the matches of a synthetic frame."""
+    teams = frame.drop_duplicates(['match_id', 'batting_team'])
+    rows = [{'match_id': m, 'player': p, 'date': d, 'team': t}
+            for m, d, t in zip(teams['match_id'], teams['start_date'], teams['batting_team']) for p in squad_of(t)]
+    return pd.DataFrame(rows)
+
+def write_synthetic_data(root, squads=False, **kwargs):
+    """Writes root/data/FINAL_ODI_MASTER.csv (+ MATCH_SQUADS.csv if squads; no player / phase files) and returns root."""
+    os.makedirs(os.path.join(root, 'data'), exist_ok=True)
+    frame = build_synthetic_frame(**kwargs)
+    frame.to_csv(os.path.join(root, SYNTHETIC_CSV), index=False)
+    if squads: build_squads_frame(frame).to_csv(os.path.join(root, SQUADS_CSV), index=False)
+    return root
+
+def quiet(fn, *args, **kwargs):
+    """(result, printed text) of one call, with stdout captured."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out): result = fn(*args, **kwargs)
+    return result, out.getvalue()
+
+@contextlib.contextmanager
+def synthetic_engine(data=None, **engine_kwargs):
+    """A quietly built CricketAnalyzer on the synthetic dataset (data: write_synthetic_data kwargs). The working
+    directory stays in the temp root while the block runs (the engine reads 'data/...' relative paths)."""
+    from engine import CricketAnalyzer # Callers put the project root on sys.path first
+    cwd = os.getcwd()
+    root = write_synthetic_data(tempfile.mkdtemp(prefix='odi_synthetic_'), **(data or {}))
+    try:
+        os.chdir(root)
+        engine, _ = quiet(CricketAnalyzer, SYNTHETIC_CSV, **engine_kwargs)
+        yield engine
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+class SyntheticEngineTestCase(unittest.TestCase):
+    """cls.engine: one synthetic engine per test class, on DATA_KWARGS data, built with ENGINE_KWARGS."""
+    DATA_KWARGS = {}
+    ENGINE_KWARGS = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._engine_ctx = synthetic_engine(cls.DATA_KWARGS, **cls.ENGINE_KWARGS)
+        cls.engine = cls._engine_ctx.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._engine_ctx.__exit__(None, None, None)
+        super().tearDownClass()
@@ -0,0 +1,63 @@
+"""
+Benchmark: Match Summary Construction
+Times _create_match_summary + _fix_ambiguous_venues on the full ODI set and on a
+synthetic N x copy of it (match_ids offset per copy).
+
+Usage (from the project root):
+    python tools/benchmark_match_summary.py [csv_path] [--scale 10] [--repeat 3]
+"""
+import sys
+import os
+import io
+import time
+import argparse
+import contextlib
+
+import pandas as pd
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # Project root
+from engine import CricketAnalyzer
+
+def scaled(raw_df, scale):
+    """raw_df repeated `scale` times, each copy with its own match_ids."""
+    copies = []
+    for k in range(scale):
+        c = raw_df.copy()
+        if pd.api.types.is_numeric_dtype(c['match_id']): c['match_id'] = c['match_id'] + k * 10_000_000
+        else: c['match_id'] = c['match_id'].astype(str) + f"_{k}"
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+def time_summary(bot, raw_df, repeat):
+    """Best-of-N seconds for the summary pipeline on raw_df."""
+    best = float('inf')
+    for _ in range(repeat):
+        bot.raw_df = raw_df.copy()
+        t = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot._create_match_summary()
+            bot._fix_ambiguous_venues()
+        best = min(best, time.perf_counter() - t)
+    return best, len(bot.match_df)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv', nargs='?', default='data/FINAL_ODI_MASTER.csv')
+    parser.add_argument('--scale', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"📂 Loading {args.csv} ...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot = CricketAnalyzer(args.csv)
+    base = bot.raw_df
+
+    print(f"{'Dataset':<12} | {'Balls':>10} | {'Matches':>8} | {'Best (s)':>9}")
+    print("-" * 50)
+    for label, df in [("Full ODI", base), (f"Synthetic {args.scale}x", scaled(base, args.scale))]:
+        secs, matches = time_summary(bot, df, args.repeat)
+        print(f"{label:<12} | {len(df):>10,} | {matches:>8,} | {secs:>9.3f}")
+
+if __name__ == '__main__':
+    main()
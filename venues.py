@@ -305,6 +305,53 @@ VENUE_MAP = {
     
 }
 
+# =================================================================================
+# 🌍 HOST COUNTRY & CONTINENT
+# =================================================================================
+# MASTER_ID prefix -> Host Country (e.g. 'IND_KOLKATA' -> 'India')
+HOST_COUNTRIES = {
+    'IND': 'India', 'AUS': 'Australia', 'ENG': 'England', 'PAK': 'Pakistan', 'NZ': 'New Zealand',
+    'SA': 'South Africa', 'SL': 'Sri Lanka', 'BAN': 'Bangladesh', 'WI': 'West Indies', 'IRE': 'Ireland',
+    'ZIM': 'Zimbabwe', 'UAE': 'UAE', 'AFG': 'Afghanistan', 'SCO': 'Scotland', 'NED': 'Netherlands', 'USA': 'USA',
+}
+
+# Raw venue names that are NOT in VENUE_MAP (Associates etc.) -> Host Country, by keyword
+HOST_KEYWORDS = {
+    'Dubai': 'UAE', 'Sharjah': 'UAE', 'Abu Dhabi': 'UAE', 'ICC Academy': 'UAE',
+    'Amstelveen': 'Netherlands', 'Rotterdam': 'Netherlands', 'Utrecht': 'Netherlands', 'The Hague': 'Netherlands', 'Schootsveld': 'Netherlands',
+    'Dundee': 'Scotland', 'Aberdeen': 'Scotland', 'Mannofield': 'Scotland', 'Glasgow': 'Scotland', 'Edinburgh': 'Scotland', 'Raeburn Place': 'Scotland', 'Cambusdoon': 'Scotland',
+    'Pearland': 'USA', 'Dallas': 'USA', 'Grand Prairie': 'USA', 'Lauderhill': 'USA', 'Central Broward': 'USA',
+    'Benoni': 'South Africa', 'Affies Park': 'Namibia', 'Windhoek': 'Namibia', 'Hararians': 'Zimbabwe',
+    'Kirtipur': 'Nepal', 'Tribhuvan': 'Nepal', 'Mulpani': 'Nepal', 'Al Amerat': 'Oman',
+    'Kinrara': 'Malaysia', 'Port Moresby': 'Papua New Guinea', 'King City': 'Canada',
+}
+
+CONTINENTS = {
+    'Asia': ['India', 'Pakistan', 'Sri Lanka', 'Bangladesh', 'Afghanistan', 'UAE', 'Nepal', 'Oman', 'Malaysia'],
+    'Europe': ['England', 'Ireland', 'Scotland', 'Netherlands'],
+    'Oceania': ['Australia', 'New Zealand', 'Papua New Guinea'],
+    'Africa': ['South Africa', 'Zimbabwe', 'Namibia'],
+    'Americas': ['West Indies', 'USA', 'Canada'],
+}
+COUNTRY_CONTINENT = {c: cont for cont, countries in CONTINENTS.items() for c in countries}
+
+def get_host_country(venue):
+    """
+    Host Country of a venue: MASTER_ID prefix first ('SA_DURBAN' -> 'South Africa'),
+    then keywords for raw names that never made it into VENUE_MAP. 'Unknown' otherwise.
+    """
+    venue = str(venue)
+    if '_' in venue:
+        country = HOST_COUNTRIES.get(venue.split('_', 1)[0])
+        if country: return country
+    low = venue.lower()
+    for key, country in HOST_KEYWORDS.items():
+        if key.lower() in low: return country
+    return 'Unknown'
+
+def get_continent(country):
+    return COUNTRY_CONTINENT.get(country, 'Unknown')
+
 def get_venue_aliases(venue_identifier):
     """
     Takes a Venue ID (e.g. 'IND_MUMBAI_WANKHEDE') OR a Raw Name (e.g. 'Wankhede Stadium')
@@ -312,19 +359,6 @@ def get_venue_aliases(venue_identifier):
     
     This is the key to aggregation!
     """
-    # 1. Normalize: Find the Master ID
-    # If input is already an ID (like 'IND_MUMBAI_WANKHEDE'), it won't be in keys, so we default to it.
-    # If input is 'Wankhede Stadium', we find 'IND_MUMBAI_WANKHEDE'.
-    master_id = VENUE_MAP.get(venue_identifier, venue_identifier)
-    
-    # 2. Reverse Lookup: Find ALL keys that point to this Master ID
-    # This finds ['Wankhede Stadium', 'Wankhede Stadium, Mumbai']
-    aliases = [name for name, m_id in VENUE_MAP.items() if m_id == master_id]
-    
-    # 3. Fallback
-    if not aliases:
-        # If no alias found (maybe a new stadium not in map yet), return the input itself 
-        # so the code doesn't crash.
-        return [venue_identifier]
-        
-    return aliases
\ No newline at end of file
+    # Compiled reverse index (core/venue_registry.py) -> no scan of VENUE_MAP per call
+    from core.venue_registry import VENUE_REGISTRY
+    return VENUE_REGISTRY.aliases(venue_identifier)